@@ -107,6 +107,15 @@ def main():
         elif first_arg.startswith('+'):
             namespaced(['+', first_arg[1:]] + sys.argv[2:])
         else:
+            if '--startup-profile' in sys.argv:
+                from kitty.startup_profile import start
+                start()
+            if '--single-instance' in sys.argv or '-1' in sys.argv:
+                # Send the command line to a running instance without
+                # importing kitty.main
+                from kitty.instance import forward_to_instance
+                if forward_to_instance(sys.argv[1:]):
+                    return
             from kitty.main import main
             main()
     else:
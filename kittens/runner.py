@@ -51,8 +51,14 @@ def create_kitten_handler(kitten, orig_args):
 
 
 def set_debug(kitten):
-    from kittens.tui.loop import debug
     import builtins
+
+    def debug(*a, **kw):
+        # kittens.tui.loop imports asyncio, which is slow to import, so
+        # it is only imported when debug() is actually used
+        from kittens.tui.loop import debug
+        debug(*a, **kw)
+
     builtins.debug = debug
 
 
@@ -2,10 +2,11 @@
 # vim:fileencoding=utf-8
 # License: GPL v3 Copyright: 2016, Kovid Goyal <kovid at kovidgoyal.net>
 
+from array import array
 from itertools import chain
 
 from .fast_data_types import (
-    BORDERS_PROGRAM, add_borders_rect, compile_program, init_borders_program
+    BORDERS_PROGRAM, compile_program, init_borders_program, set_borders_rects
 )
 from .utils import load_shaders
 
@@ -20,23 +21,23 @@ class BorderColor(IntFlag):
     default_bg, active, inactive, window_bg, bell = ((1 << i) for i in range(5))
 
 
-def vertical_edge(os_window_id, tab_id, color, width, top, bottom, left):
-    add_borders_rect(os_window_id, tab_id, left, top, left + width, bottom, color)
+def vertical_edge(rects, color, width, top, bottom, left):
+    rects.extend((left, top, left + width, bottom, color))
 
 
-def horizontal_edge(os_window_id, tab_id, color, height, left, right, top):
-    add_borders_rect(os_window_id, tab_id, left, top, right, top + height, color)
+def horizontal_edge(rects, color, height, left, right, top):
+    rects.extend((left, top, right, top + height, color))
 
 
-def draw_edges(os_window_id, tab_id, colors, width, geometry, base_width=0):
+def draw_edges(rects, colors, width, geometry, base_width=0):
     left = geometry.left - (width + base_width)
     top = geometry.top - (width + base_width)
     right = geometry.right + (width + base_width)
     bottom = geometry.bottom + (width + base_width)
-    horizontal_edge(os_window_id, tab_id, colors[1], width, left, right, top)
-    horizontal_edge(os_window_id, tab_id, colors[3], width, left, right, geometry.bottom + base_width)
-    vertical_edge(os_window_id, tab_id, colors[0], width, top, bottom, left)
-    vertical_edge(os_window_id, tab_id, colors[2], width, top, bottom, geometry.right + base_width)
+    horizontal_edge(rects, colors[1], width, left, right, top)
+    horizontal_edge(rects, colors[3], width, left, right, geometry.bottom + base_width)
+    vertical_edge(rects, colors[0], width, top, bottom, left)
+    vertical_edge(rects, colors[2], width, top, bottom, geometry.right + base_width)
 
 
 def load_borders_program():
@@ -52,6 +53,7 @@ class Borders:
         self.tab_id = tab_id
         self.border_width = border_width
         self.padding_width = padding_width
+        self.last_rects = None
 
     def __call__(
         self,
@@ -61,12 +63,30 @@ class Borders:
         extra_blank_rects,
         draw_window_borders=True
     ):
-        add_borders_rect(self.os_window_id, self.tab_id, 0, 0, 0, 0, BorderColor.default_bg)
+        rects = self.rects(windows, active_window, current_layout, extra_blank_rects, draw_window_borders)
+        # Send all the rects for the tab to the renderer in a single call and
+        # only when they have changed, the renderer then uploads only the rects
+        # that differ from the ones it already has
+        if rects != self.last_rects:
+            set_borders_rects(self.os_window_id, self.tab_id, rects)
+            self.last_rects = rects
+
+    def rects(
+        self,
+        windows,
+        active_window,
+        current_layout,
+        extra_blank_rects,
+        draw_window_borders=True
+    ):
+        # Each rect is five unsigned ints: left, top, right, bottom, color
+        rects = array('I')
         for br in chain(current_layout.blank_rects, extra_blank_rects):
-            add_borders_rect(self.os_window_id, self.tab_id, *br, BorderColor.default_bg)
+            rects.extend(br)
+            rects.append(BorderColor.default_bg)
         bw, pw = self.border_width, self.padding_width
         if bw + pw <= 0:
-            return
+            return rects
         draw_borders = bw > 0 and draw_window_borders and len(windows) > 1
         if draw_borders:
             border_data = current_layout.resolve_borders(windows, active_window)
@@ -82,10 +102,9 @@ class Borders:
                 else:
                     color = BorderColor.bell if w.needs_attention else BorderColor.inactive
                 colors = tuple(color if needed else window_bg for needed in next(border_data))
-                draw_edges(
-                    self.os_window_id, self.tab_id, colors, bw, g, base_width=pw)
+                draw_edges(rects, colors, bw, g, base_width=pw)
             if pw > 0:
                 # Draw the background rectangles over the padding region
                 colors = (window_bg, window_bg, window_bg, window_bg)
-                draw_edges(
-                    self.os_window_id, self.tab_id, colors, pw, g)
+                draw_edges(rects, colors, pw, g)
+        return rects
@@ -5,12 +5,14 @@
 import atexit
 import json
 import os
-import re
+from collections import deque
+from contextlib import contextmanager
 from functools import partial
 from gettext import gettext as _
+from types import GeneratorType
 from weakref import WeakValueDictionary
 
-from .cli import create_opts, parse_args
+from .cli import opts_for_instance, parse_args
 from .conf.utils import to_cmdline
 from .config import initial_window_size_func, prepare_config_file_for_editing
 from .config_data import MINIMUM_FONT_SIZE
@@ -21,15 +23,17 @@ from .fast_data_types import (
     ChildMonitor, background_opacity_of, change_background_opacity,
     change_os_window_state, create_os_window, current_os_window,
     destroy_global_data, get_clipboard_string, glfw_post_empty_event,
-    global_font_size, mark_os_window_for_close, os_window_font_size,
-    patch_global_colors, set_clipboard_string, set_in_sequence_mode,
+    global_font_size, mark_os_window_for_close, mark_pending_title_updates,
+    os_window_font_size, patch_global_colors, set_clipboard_string, set_in_sequence_mode,
     toggle_fullscreen
 )
 from .keys import get_shortcut, shortcut_matches
 from .layout import set_draw_minimal_borders
+from .match import match_tabs, match_windows
 from .remote_control import handle_cmd
 from .rgb import Color, color_from_int
 from .session import create_session
+from .startup_profile import phase_done, report as report_startup_profile
 from .tabs import SpecialWindow, SpecialWindowInstance, TabManager
 from .utils import (
     get_editor, get_primary_selection, is_path_in_temp_dir, log_error,
@@ -38,6 +42,9 @@ from .utils import (
 )
 
 
+pipe_prefix = '\x1bP@kitty-pipe'
+
+
 def listen_on(spec):
     import socket
     family, address, socket_path = parse_address_spec(spec)
@@ -105,6 +112,8 @@ class Boss:
     def __init__(self, os_window_id, opts, args, cached_values, new_os_window_trigger):
         set_draw_minimal_borders(opts)
         self.window_id_map = WeakValueDictionary()
+        self.window_pid_map = WeakValueDictionary()
+        self.tab_id_map = WeakValueDictionary()
         self.startup_colors = {k: opts[k] for k in opts if isinstance(opts[k], Color)}
         self.pending_sequences = None
         self.cached_values = cached_values
@@ -112,6 +121,9 @@ class Boss:
         self.os_window_death_actions = {}
         self.cursor_blinking = True
         self.shutting_down = False
+        self.pending_border_relayouts = self.pending_tab_bar_updates = None
+        self.pending_title_updates = {}
+        self.response_streams = {}
         talk_fd = getattr(single_instance, 'socket', None)
         talk_fd = -1 if talk_fd is None else talk_fd.fileno()
         listen_fd = -1
@@ -173,65 +185,60 @@ class Boss:
             yield from tab
 
     def match_windows(self, match):
-        try:
-            field, exp = match.split(':', 1)
-        except ValueError:
-            return
-        if field == 'num':
-            tab = self.active_tab
-            if tab is not None:
-                try:
-                    w = tab.get_nth_window(int(exp))
-                except Exception:
-                    return
-                if w is not None:
-                    yield w
-            return
-        if field == 'env':
-            kp, vp = exp.partition('=')[::2]
-            if vp:
-                pat = tuple(map(re.compile, (kp, vp)))
-            else:
-                pat = re.compile(kp), None
-        else:
-            pat = re.compile(exp)
-        for window in self.all_windows:
-            if window.matches(field, pat):
-                yield window
+        return match_windows(self, match)
 
     def tab_for_window(self, window):
-        for tab in self.all_tabs:
-            for w in tab:
-                if w.id == window.id:
-                    return tab
+        tab = self.tab_id_map.get(window.tab_id)
+        if tab is not None and window.id in self.window_id_map:
+            return tab
 
     def match_tabs(self, match):
-        try:
-            field, exp = match.split(':', 1)
-        except ValueError:
-            return
-        pat = re.compile(exp)
-        found = False
-        if field in ('title', 'id'):
-            for tab in self.all_tabs:
-                if tab.matches(field, pat):
-                    yield tab
-                    found = True
-        if not found:
-            tabs = {self.tab_for_window(w) for w in self.match_windows(match)}
-            for tab in tabs:
-                if tab:
-                    yield tab
+        return match_tabs(self, match)
 
     def set_active_window(self, window):
-        for os_window_id, tm in self.os_window_map.items():
-            for tab in tm:
-                for w in tab:
-                    if w.id == window.id:
-                        if tab is not self.active_tab:
-                            tm.set_active_tab(tab)
-                        tab.set_active_window(w)
-                        return os_window_id
+        tab = self.tab_for_window(window)
+        if tab is not None:
+            tm = self.os_window_map.get(tab.os_window_id)
+            if tm is not None:
+                if tab is not self.active_tab:
+                    tm.set_active_tab(tab)
+                tab.set_active_window(window)
+                return tab.os_window_id
+
+    @contextmanager
+    def deferred_relayouts(self):
+        # Defer border relayouts and tab bar redraws until the end of the
+        # block, so that a sequence of operations causes them only once
+        if self.pending_border_relayouts is not None:
+            yield
+            return
+        self.pending_border_relayouts, self.pending_tab_bar_updates = set(), set()
+        try:
+            yield
+        finally:
+            tabs, tab_managers = self.pending_border_relayouts, self.pending_tab_bar_updates
+            self.pending_border_relayouts = self.pending_tab_bar_updates = None
+            for tab in tabs:
+                if self.tab_id_map.get(tab.id) is tab:
+                    tab.relayout_borders()
+            for tm in tab_managers:
+                if self.os_window_map.get(tm.os_window_id) is tm:
+                    tm.mark_tab_bar_dirty()
+
+    def queue_title_update(self, window):
+        # The title is applied later by apply_pending_title_updates(), which
+        # is called from the render loop, so that a program changing its
+        # title many times between frames causes only a single update
+        if not self.pending_title_updates:
+            mark_pending_title_updates()
+        self.pending_title_updates[window.id] = window
+
+    def apply_pending_title_updates(self):
+        windows, self.pending_title_updates = self.pending_title_updates, {}
+        with self.deferred_relayouts():
+            for window_id, window in windows.items():
+                if self.window_id_map.get(window_id) is window:
+                    window.title_updated()
 
     def _new_os_window(self, args, cwd_from=None):
         if isinstance(args, SpecialWindowInstance):
@@ -259,12 +266,15 @@ class Boss:
     def add_child(self, window):
         self.child_monitor.add_child(window.id, window.child.pid, window.child.child_fd, window.screen)
         self.window_id_map[window.id] = window
+        self.window_pid_map[window.child.pid] = window
 
-    def _handle_remote_command(self, cmd, window=None):
+    def _handle_remote_command(self, cmd, window=None, allow_streaming=False):
         response = None
         if self.opts.allow_remote_control or getattr(window, 'allow_remote_control', False):
             try:
                 response = handle_cmd(self, window, cmd)
+                if response is not None and not allow_streaming and isinstance(response.get('data'), GeneratorType):
+                    response['data'] = ''.join(response['data'])
             except Exception as err:
                 import traceback
                 response = {'ok': False, 'error': str(err)}
@@ -274,9 +284,57 @@ class Boss:
             response = {'ok': False, 'error': 'Remote control is disabled. Add allow_remote_control yes to your kitty.conf'}
         return response
 
-    def peer_message_received(self, msg):
+    def _stream_response(self, peer_fd):
+        # Return the next chunk of the oldest streamed response for the peer,
+        # asking to be notified when it has been written, see peer_output_drained()
+        streams = self.response_streams.get(peer_fd)
+        if not streams:
+            return
+        request_id, chunks = streams[0]
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            response = {'ok': True}
+        except Exception as err:
+            import traceback
+            response = {'ok': False, 'error': str(err), 'tb': traceback.format_exc()}
+        else:
+            response = {'ok': True, 'data': chunk, 'stream': True}
+        response['id'] = request_id
+        if not response.get('stream'):
+            streams.popleft()
+            if not streams:
+                del self.response_streams[peer_fd]
+        return (pipe_prefix + json.dumps(response) + '\x1b\\').encode('utf-8'), peer_fd in self.response_streams
+
+    def peer_output_drained(self, peer_fd):
+        return self._stream_response(peer_fd)
+
+    def peer_hung_up(self, peer_fd):
+        self.response_streams.pop(peer_fd, None)
+
+    def peer_message_received(self, msg, peer_fd=None):
         msg = msg.decode('utf-8')
         cmd_prefix = '\x1bP@kitty-cmd'
+        if msg.startswith(pipe_prefix):
+            # A single request on a persistent connection, the response must
+            # carry the id of the request as responses can arrive out of order
+            cmd = json.loads(msg[len(pipe_prefix):-2])
+            response = self._handle_remote_command(cmd, allow_streaming=peer_fd is not None)
+            if response is None:
+                if cmd.get('no_response'):
+                    return
+                response = {'ok': True}
+            if isinstance(response.get('data'), GeneratorType):
+                # Send the response in chunks, each subsequent chunk is only
+                # generated once the previous one has been written to the peer
+                streams = self.response_streams.setdefault(peer_fd, deque())
+                streams.append((cmd.get('id'), response['data']))
+                if len(streams) == 1:
+                    return self._stream_response(peer_fd)
+                return
+            response['id'] = cmd.get('id')
+            return (pipe_prefix + json.dumps(response) + '\x1b\\').encode('utf-8')
         if msg.startswith(cmd_prefix):
             cmd = msg[len(cmd_prefix):-2]
             response = self._handle_remote_command(cmd)
@@ -289,7 +347,7 @@ class Boss:
                 startup_id = msg.get('startup_id')
                 args, rest = parse_args(msg['args'][1:])
                 args.args = rest
-                opts = create_opts(args)
+                opts = opts_for_instance(args)
                 if not os.path.isabs(args.directory):
                     args.directory = os.path.join(msg['cwd'], args.directory)
                 session = create_session(opts, args, respect_cwd=True)
@@ -320,10 +378,8 @@ class Boss:
         tm = self.os_window_map.get(os_window_id)
         if tm is None:
             return
-        for tab in tm:
-            if window in tab:
-                break
-        else:
+        tab = self.tab_id_map.get(window.tab_id)
+        if tab is None or window not in tab:
             return
         tab.remove_window(window)
         if len(tab) == 0:
@@ -353,6 +409,10 @@ class Boss:
             self.child_monitor.start()
             self.io_thread_started = True
 
+    def on_first_frame_rendered(self):
+        phase_done('first frame')
+        report_startup_profile()
+
     def activate_tab_at(self, os_window_id, x):
         tm = self.os_window_map.get(os_window_id)
         if tm is not None:
@@ -730,11 +790,9 @@ class Boss:
     def do_set_tab_title(self, title, tab_id):
         tm = self.active_tab_manager
         if tm is not None and title:
-            tab_id = int(tab_id)
-            for tab in tm.tabs:
-                if tab.id == tab_id:
-                    tab.set_title(title)
-                    break
+            tab = tm.tab_for_id(int(tab_id))
+            if tab is not None:
+                tab.set_title(title)
 
     def kitty_shell(self, window_type):
         cmd = ['@', kitty_exe(), '@']
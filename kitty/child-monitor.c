@@ -17,6 +17,10 @@
 #include <sys/wait.h>
 #include <signal.h>
 #include <sys/socket.h>
+#include <limits.h>
+#ifdef __APPLE__
+#include <libproc.h>
+#endif
 extern PyTypeObject Screen_Type;
 
 #define EXTRA_FDS 2
@@ -27,10 +31,20 @@ extern PyTypeObject Screen_Type;
 
 static void (*parse_func)(Screen*, PyObject*, double);
 
+typedef enum {
+    // A complete message from a peer that sends one message per connection
+    PEER_MESSAGE,
+    // A single frame from a persistent peer, the hangup of a persistent peer,
+    // and the completion of a write to a persistent peer that asked to be
+    // notified when its output was drained
+    PEER_FRAME, PEER_HANGUP, PEER_DRAINED
+} PeerMessageType;
+
 typedef struct {
     char *data;
     size_t sz;
     int fd;
+    PeerMessageType type;
 } Message;
 
 typedef struct {
@@ -53,6 +67,11 @@ typedef struct {
     int fd;
     unsigned long id;
     pid_t pid;
+    // The foreground process group in the terminal of the child and the
+    // working directory of its leader, maintained by the I/O thread
+    bool check_foreground;
+    pid_t foreground_pgid;
+    char *foreground_cwd;
 } Child;
 
 static const Child EMPTY_CHILD = {0};
@@ -82,7 +101,7 @@ static int signal_fds[2], wakeup_fds[2];
 // Main thread functions {{{
 
 #define FREE_CHILD(x) \
-    Py_CLEAR((x).screen); x = EMPTY_CHILD;
+    Py_CLEAR((x).screen); free((x).foreground_cwd); x = EMPTY_CHILD;
 
 #define XREF_CHILD(x, OP) OP(x.screen);
 #define INCREF_CHILD(x) XREF_CHILD(x, Py_INCREF)
@@ -201,6 +220,7 @@ wakeup_io_loop(bool in_signal_handler) {
 static void* io_loop(void *data);
 static void* talk_loop(void *data);
 static void send_response(int fd, const char *msg, size_t msg_sz);
+static void send_persistent_response(int fd, const char *msg, size_t msg_sz, bool close_connection, bool notify_when_drained);
 static void wakeup_talk_loop(bool);
 static bool talk_thread_started = false;
 
@@ -345,6 +365,18 @@ do_parse(ChildMonitor *self, Screen *screen, double now) {
     screen_mutex(unlock, read);
 }
 
+static inline void
+send_python_response_to_persistent_peer(int peer_fd, PyObject *resp) {
+    // resp can be None for no response, bytes or (bytes, notify_when_drained)
+    if (!resp) { PyErr_Print(); return; }
+    if (PyBytes_Check(resp)) send_persistent_response(peer_fd, PyBytes_AS_STRING(resp), PyBytes_GET_SIZE(resp), false, false);
+    else if (PyTuple_Check(resp) && PyTuple_GET_SIZE(resp) == 2 && PyBytes_Check(PyTuple_GET_ITEM(resp, 0))) {
+        PyObject *data = PyTuple_GET_ITEM(resp, 0);
+        send_persistent_response(peer_fd, PyBytes_AS_STRING(data), PyBytes_GET_SIZE(data), false, PyObject_IsTrue(PyTuple_GET_ITEM(resp, 1)) == 1);
+    }
+    Py_DECREF(resp);
+}
+
 static void
 parse_input(ChildMonitor *self) {
     // Parse all available input that was read in the I/O thread.
@@ -364,7 +396,7 @@ parse_input(ChildMonitor *self) {
         if (msg) {
             for (size_t i = 0; i < self->messages_count; i++) {
                 Message *m = self->messages + i;
-                PyTuple_SET_ITEM(msg, i, Py_BuildValue("y#i", m->data, (int)m->sz, m->fd));
+                PyTuple_SET_ITEM(msg, i, Py_BuildValue("y#ii", m->data, (int)m->sz, m->fd, (int)m->type));
                 free(m->data); m->data = NULL; m->sz = 0;
             }
             self->messages_count = 0;
@@ -383,8 +415,27 @@ parse_input(ChildMonitor *self) {
     children_mutex(unlock);
     if (msg) {
         for (Py_ssize_t i = 0; i < PyTuple_GET_SIZE(msg); i++) {
-            PyObject *resp = PyObject_CallMethod(global_state.boss, "peer_message_received", "O", PyTuple_GET_ITEM(PyTuple_GET_ITEM(msg, i), 0));
-            int peer_fd = (int)PyLong_AsLong(PyTuple_GET_ITEM(PyTuple_GET_ITEM(msg, i), 1));
+            PyObject *m = PyTuple_GET_ITEM(msg, i);
+            int peer_fd = (int)PyLong_AsLong(PyTuple_GET_ITEM(m, 1));
+            PyObject *resp = NULL;
+            switch ((PeerMessageType)PyLong_AsLong(PyTuple_GET_ITEM(m, 2))) {
+                case PEER_MESSAGE:
+                    break;
+                case PEER_FRAME:
+                    resp = PyObject_CallMethod(global_state.boss, "peer_message_received", "Oi", PyTuple_GET_ITEM(m, 0), peer_fd);
+                    send_python_response_to_persistent_peer(peer_fd, resp);
+                    continue;
+                case PEER_DRAINED:
+                    resp = PyObject_CallMethod(global_state.boss, "peer_output_drained", "i", peer_fd);
+                    send_python_response_to_persistent_peer(peer_fd, resp);
+                    continue;
+                case PEER_HANGUP:
+                    // close the connection once all pending responses are sent
+                    call_boss(peer_hung_up, "i", peer_fd);
+                    send_persistent_response(peer_fd, NULL, 0, true, false);
+                    continue;
+            }
+            resp = PyObject_CallMethod(global_state.boss, "peer_message_received", "O", PyTuple_GET_ITEM(m, 0));
             if (resp && PyBytes_Check(resp)) send_response(peer_fd, PyBytes_AS_STRING(resp), PyBytes_GET_SIZE(resp));
             else { send_response(peer_fd, NULL, 0); if (!resp) PyErr_Print(); }
             Py_CLEAR(resp);
@@ -593,6 +644,7 @@ prepare_to_render_os_window(OSWindow *os_window, double now, unsigned int *activ
                 update_window_title(w, os_window);
                 *active_window_bg = colorprofile_to_color(WD.screen->color_profile, WD.screen->color_profile->overridden.default_bg, WD.screen->color_profile->configured.default_bg);
             } else WD.screen->cursor_render_info.is_visible = false;
+            if (WD.vao_idx < 0) { WD.vao_idx = create_cell_vao(); WD.gvao_idx = create_graphics_vao(); }
             if (send_cell_data_to_gpu(WD.vao_idx, WD.gvao_idx, WD.xstart, WD.ystart, WD.dx, WD.dy, WD.screen, os_window)) needs_render = true;
             if (WD.screen->start_visual_bell_at != 0) needs_render = true;
         }
@@ -606,7 +658,7 @@ render_os_window(OSWindow *os_window, double now, unsigned int active_window_id,
     if (os_window->clear_count++ < 3) blank_os_window(os_window);
     Tab *tab = os_window->tabs + os_window->active_tab;
     BorderRects *br = &tab->border_rects;
-    draw_borders(br->vao_idx, br->num_border_rects, br->rect_buf, br->is_dirty, os_window->viewport_width, os_window->viewport_height, active_window_bg, num_visible_windows, os_window);
+    draw_borders(br, os_window->viewport_width, os_window->viewport_height, active_window_bg, num_visible_windows, os_window);
     if (TD.screen && os_window->num_tabs > 1) draw_cells(TD.vao_idx, 0, TD.xstart, TD.ystart, TD.dx, TD.dy, TD.screen, os_window, true, false);
     for (unsigned int i = 0; i < tab->num_windows; i++) {
         Window *w = tab->windows + i;
@@ -621,7 +673,7 @@ render_os_window(OSWindow *os_window, double now, unsigned int active_window_id,
         }
     }
     swap_window_buffers(os_window);
-    br->is_dirty = false;
+    br->is_dirty = false; br->dirty_start = 0; br->dirty_end = 0;
     os_window->last_active_tab = os_window->active_tab; os_window->last_num_tabs = os_window->num_tabs; os_window->last_active_window_id = active_window_id;
     os_window->focused_at_last_render = os_window->is_focused;
     os_window->is_damaged = false;
@@ -630,6 +682,9 @@ render_os_window(OSWindow *os_window, double now, unsigned int active_window_id,
 #undef TD
 }
 
+static double last_title_updates_at = -DBL_MAX;
+static bool first_frame_rendered = false;
+
 static inline void
 render(double now) {
     double time_since_last_render = now - last_render_at;
@@ -637,6 +692,18 @@ render(double now) {
         set_maximum_wait(OPT(repaint_delay) - time_since_last_render);
         return;
     }
+    if (global_state.has_pending_title_updates) {
+        // Programs can change their titles very often, so the boss only
+        // records the changes and they are applied here, at most once per
+        // title_update_interval
+        double time_since_title_updates = now - last_title_updates_at;
+        if (time_since_title_updates < OPT(title_update_interval)) set_maximum_wait(OPT(title_update_interval) - time_since_title_updates);
+        else {
+            global_state.has_pending_title_updates = false;
+            last_title_updates_at = now;
+            call_boss(apply_pending_title_updates, NULL);
+        }
+    }
 
     for (size_t i = 0; i < global_state.num_os_windows; i++) {
         OSWindow *w = global_state.os_windows + i;
@@ -658,7 +725,13 @@ render(double now) {
         if (!w->fonts_data) { log_error("No fonts data found for window id: %llu", w->id); continue; }
         if (prepare_to_render_os_window(w, now, &active_window_id, &active_window_bg, &num_visible_windows)) needs_render = true;
         if (w->last_active_window_id != active_window_id || w->last_active_tab != w->active_tab || w->focused_at_last_render != w->is_focused) needs_render = true;
-        if (needs_render) render_os_window(w, now, active_window_id, active_window_bg, num_visible_windows);
+        if (needs_render) {
+            render_os_window(w, now, active_window_id, active_window_bg, num_visible_windows);
+            if (!first_frame_rendered) {
+                first_frame_rendered = true;
+                call_boss(on_first_frame_rendered, NULL);
+            }
+        }
     }
     last_render_at = now;
 #undef TD
@@ -829,6 +902,51 @@ hangup(pid_t pid) {
 }
 
 
+static inline bool
+read_cwd_of_process(pid_t pid, char *buf, size_t sz) {
+#ifdef __APPLE__
+    struct proc_vnodepathinfo vpi;
+    if (proc_pidinfo(pid, PROC_PIDVNODEPATHINFO, 0, &vpi, sizeof(vpi)) <= 0) return false;
+    snprintf(buf, sz, "%s", vpi.pvi_cdir.vip_path);
+#else
+    char path[64];
+    snprintf(path, sizeof(path), "/proc/%ld/cwd", (long)pid);
+    ssize_t n = readlink(path, buf, sz - 1);
+    if (n <= 0) return false;
+    buf[n] = 0;
+#endif
+    return true;
+}
+
+
+static inline void
+update_foreground_processes(ChildMonitor *self) {
+    // Track the working directory of the foreground process in the terminal
+    // of every child that has produced output, so that the main thread never
+    // has to query the OS for it. Shells change directory without changing
+    // the foreground process group, so it is read even if that is unchanged.
+    static char cwd[PATH_MAX];
+    for (size_t i = 0; i < self->count; i++) {
+        Child *c = children + i;
+        if (!c->check_foreground) continue;
+        c->check_foreground = false;
+        pid_t pgid = tcgetpgrp(c->fd);
+        if (pgid <= 0 || !read_cwd_of_process(pgid, cwd, sizeof(cwd))) {
+            // the leader of the foreground process group has exited
+            pgid = c->pid;
+            if (!read_cwd_of_process(pgid, cwd, sizeof(cwd))) continue;
+        }
+        if (pgid == c->foreground_pgid && c->foreground_cwd && strcmp(cwd, c->foreground_cwd) == 0) continue;
+        char *q = strdup(cwd);
+        if (!q) continue;
+        children_mutex(lock);
+        free(c->foreground_cwd);
+        c->foreground_cwd = q; c->foreground_pgid = pgid;
+        children_mutex(unlock);
+    }
+}
+
+
 static inline void
 cleanup_child(ssize_t i) {
     close(children[i].fd);
@@ -1032,6 +1150,7 @@ io_loop(void *data) {
                 if (fds[EXTRA_FDS + i].revents & (POLLIN | POLLHUP)) {
                     data_received = true;
                     has_more = read_bytes(fds[EXTRA_FDS + i].fd, children[i].screen);
+                    children[i].check_foreground = true;
                     if (!has_more) {
                         // child is dead
                         children_mutex(lock);
@@ -1062,7 +1181,7 @@ io_loop(void *data) {
                 perror("Call to poll() failed");
             }
         }
-#define WAKEUP { wakeup_main_loop(); last_main_loop_wakeup_at = now; has_pending_wakeups = false; }
+#define WAKEUP { update_foreground_processes(self); wakeup_main_loop(); last_main_loop_wakeup_at = now; has_pending_wakeups = false; }
         // we only wakeup the main loop after input_delay as wakeup is an expensive operation
         // on some platforms, such as cocoa
         if (data_received) {
@@ -1087,7 +1206,7 @@ typedef struct {
     char *data;
     size_t capacity, used;
     int fd;
-    bool finished, close_socket;
+    bool finished, close_socket, persistent;
 } PeerReadData;
 static PeerReadData empty_prd = {.fd = -1, 0};
 
@@ -1095,7 +1214,7 @@ typedef struct {
     char *data;
     size_t sz, pos;
     int fd;
-    bool finished;
+    bool finished, keep_open, notify_when_drained;
 } PeerWriteData;
 static PeerWriteData empty_pwd = {.fd = -1, 0};
 
@@ -1114,6 +1233,10 @@ static TalkData talk_data = {0};
 typedef struct pollfd PollFD;
 #define PEER_LIMIT 256
 #define nuke_socket(s) { shutdown(s, SHUT_RDWR); close(s); }
+// Peers that start with this prefix keep their connection open and can send
+// many DCS framed commands over it, each of which gets its own response
+#define PERSISTENT_PEER_PREFIX "\x1bP@kitty-pipe"
+#define DCS_TERMINATOR "\x1b\\"
 
 static inline bool
 accept_peer(int listen_fd, bool shutting_down) {
@@ -1137,13 +1260,60 @@ accept_peer(int listen_fd, bool shutting_down) {
     return true;
 }
 
+static inline void
+queue_peer_message(ChildMonitor *self, char *data, size_t sz, int fd, PeerMessageType type) {
+    children_mutex(lock);
+    ensure_space_for(self, messages, Message, self->messages_count + 1, messages_capacity, 16, true);
+    Message *m = self->messages + self->messages_count++;
+    m->data = data; m->sz = sz; m->fd = fd; m->type = type;
+    children_mutex(unlock);
+}
+
+static inline bool
+dispatch_persistent_frames(ChildMonitor *self, PeerReadData *rd) {
+    // Queue every complete frame in the read buffer, leaving any trailing
+    // partial frame in place. Returns false if the peer sent garbage.
+    static const size_t psz = sizeof(PERSISTENT_PEER_PREFIX) - 1, tsz = sizeof(DCS_TERMINATOR) - 1;
+    size_t pos = 0;
+    bool queued = false, ok = true;
+    while (rd->used - pos >= psz + tsz) {
+        if (memcmp(rd->data + pos, PERSISTENT_PEER_PREFIX, psz) != 0) { ok = false; break; }
+        char *end = NULL, *q = rd->data + pos + psz, *limit = rd->data + rd->used - 1;
+        while (q < limit && (q = memchr(q, 0x1b, limit - q)) != NULL) {
+            if (q[1] == '\\') { end = q; break; }
+            q++;
+        }
+        if (!end) break;
+        size_t frame_sz = end + tsz - (rd->data + pos);
+        char *frame = malloc(frame_sz);
+        if (!frame) fatal("Out of memory");
+        memcpy(frame, rd->data + pos, frame_sz);
+        queue_peer_message(self, frame, frame_sz, rd->fd, PEER_FRAME);
+        queued = true;
+        pos += frame_sz;
+    }
+    if (pos) {
+        rd->used -= pos;
+        if (rd->used) memmove(rd->data, rd->data + pos, rd->used);
+    }
+    if (queued) wakeup_main_loop();
+    return ok;
+}
+
 static inline bool
 read_from_peer(ChildMonitor *self, int s) {
     bool read_finished = false;
     for (size_t i = 0; i < talk_data.num_reads; i++) {
         PeerReadData *rd = talk_data.reads + i;
-#define failed(msg) { read_finished = true; log_error("%s", msg); rd->finished = true; rd->close_socket = true; break; }
-        if (rd->fd == s) {
+#define failed(msg) { \
+    read_finished = true; log_error("%s", msg); rd->finished = true; \
+    if (rd->persistent) { queue_peer_message(self, NULL, 0, s, PEER_HANGUP); wakeup_main_loop(); } \
+    else rd->close_socket = true; \
+    break; \
+}
+        // poll() reports a hangup for both the read and a pending write of a
+        // persistent peer, it must be read from and hung up on only once
+        if (rd->fd == s && !rd->finished) {
             if (rd->used >= rd->capacity) {
                 if (rd->capacity >= 1024 * 1024) failed("Ignoring too large message from peer");
                 rd->capacity = MAX(8192, rd->capacity * 2);
@@ -1153,18 +1323,19 @@ read_from_peer(ChildMonitor *self, int s) {
             ssize_t n = recv(s, rd->data + rd->used, rd->capacity - rd->used, 0);
             if (n == 0) {
                 read_finished = true; rd->finished = true;
-                children_mutex(lock);
-                ensure_space_for(self, messages, Message, self->messages_count + 1, messages_capacity, 16, true);
-                Message *m = self->messages + self->messages_count++;
-                m->data = rd->data; rd->data = NULL; m->sz = rd->used; m->fd = s;
-                children_mutex(unlock);
+                if (rd->persistent) queue_peer_message(self, NULL, 0, s, PEER_HANGUP);
+                else { queue_peer_message(self, rd->data, rd->used, s, PEER_MESSAGE); rd->data = NULL; }
                 wakeup_main_loop();
             } else if (n < 0) {
                 if (errno != EINTR) {
                     perror("Error reading from talk peer");
                     failed("");
                 }
-            } else rd->used += n;
+            } else {
+                rd->used += n;
+                if (!rd->persistent && rd->used >= sizeof(PERSISTENT_PEER_PREFIX) - 1 && memcmp(rd->data, PERSISTENT_PEER_PREFIX, sizeof(PERSISTENT_PEER_PREFIX) - 1) == 0) rd->persistent = true;
+                if (rd->persistent && !dispatch_persistent_frames(self, rd)) failed("Malformed frame received from persistent peer");
+            }
             break;
         }
     }
@@ -1173,19 +1344,31 @@ read_from_peer(ChildMonitor *self, int s) {
 }
 
 static inline bool
-write_to_peer(int fd) {
+write_to_peer(ChildMonitor *self, int fd) {
     bool write_finished = false;
     for (size_t i = 0; i < talk_data.num_writes; i++) {
         PeerWriteData *wd = talk_data.writes + i;
-#define failed(msg) { write_finished = true; log_error("%s", msg); wd->finished = true; break; }
-        if (wd->fd == fd) {
-            ssize_t n = send(fd, wd->data + wd->pos, wd->sz - wd->pos, MSG_NOSIGNAL);
-            if (n == 0) { failed("send() to peer failed to send any data"); }
-            else if (n < 0) {
-                if (errno != EINTR) { perror("write() to peer socket failed with error"); failed(""); }
-            } else {
-                wd->pos += n;
-                if (wd->pos >= wd->sz) { write_finished = true; wd->finished = true; }
+        // For persistent peers the socket is shutdown so that the peer is
+        // seen as having hung up and the connection is closed from the main thread
+#define failed(msg) { \
+    write_finished = true; log_error("%s", msg); wd->finished = true; \
+    if (wd->keep_open) { shutdown(fd, SHUT_RDWR); wd->notify_when_drained = false; } \
+    break; \
+}
+        if (wd->fd == fd && !wd->finished) {
+            if (wd->pos < wd->sz) {
+                ssize_t n = send(fd, wd->data + wd->pos, wd->sz - wd->pos, MSG_NOSIGNAL);
+                if (n == 0) { failed("send() to peer failed to send any data"); }
+                else if (n < 0) {
+                    if (errno != EINTR) { perror("write() to peer socket failed with error"); failed(""); }
+                } else wd->pos += n;
+            }
+            if (wd->pos >= wd->sz) {
+                write_finished = true; wd->finished = true;
+                if (wd->keep_open && wd->notify_when_drained) {
+                    queue_peer_message(self, NULL, 0, fd, PEER_DRAINED);
+                    wakeup_main_loop();
+                }
             }
             break;
         }
@@ -1196,11 +1379,12 @@ write_to_peer(int fd) {
 }
 
 static inline void
-remove_poll_fd(int fd) {
+remove_poll_fd(int fd, short events) {
+    // persistent peers have the same fd polled for both reading and writing
     size_t count = talk_data.num_talk_fds + talk_data.num_listen_fds;
     for (size_t i = talk_data.num_listen_fds; i < count; i++) {
         struct pollfd *pfd = talk_data.fds + i;
-        if (pfd->fd == fd) {
+        if (pfd->fd == fd && pfd->events == events) {
             size_t num_to_right = count - 1 - i;
             if (num_to_right) memmove(talk_data.fds + i, talk_data.fds + i + 1, num_to_right * sizeof(struct pollfd));
             talk_data.num_talk_fds--;
@@ -1215,7 +1399,7 @@ prune_finished_reads() {
     for (ssize_t i = talk_data.num_reads - 1; i >= 0; i--) {
         PeerReadData *rd = talk_data.reads + i;
         if (rd->finished) {
-            remove_poll_fd(rd->fd);
+            remove_poll_fd(rd->fd, POLLIN);
             if (rd->close_socket) { nuke_socket(rd->fd); }
             else shutdown(rd->fd, SHUT_RD);
             free(rd->data);
@@ -1233,8 +1417,8 @@ prune_finished_writes() {
     for (ssize_t i = talk_data.num_writes - 1; i >= 0; i--) {
         PeerWriteData *wd = talk_data.writes + i;
         if (wd->finished) {
-            remove_poll_fd(wd->fd);
-            shutdown(wd->fd, SHUT_WR); close(wd->fd);
+            remove_poll_fd(wd->fd, POLLOUT);
+            if (!wd->keep_open) { shutdown(wd->fd, SHUT_WR); close(wd->fd); }
             free(wd->data);
             ssize_t num_to_right = talk_data.num_writes - 1 - i;
             if (num_to_right > 0) memmove(talk_data.writes + i, talk_data.writes + i + 1, num_to_right * sizeof(PeerWriteData));
@@ -1257,10 +1441,54 @@ wakeup_talk_loop(bool in_signal_handler) {
     }
 }
 
+static inline bool
+coalesce_persistent_write(PeerWriteData *src) {
+    // Append to a pending write for the same persistent peer, so that
+    // pipelined responses do not each need their own poll fd
+    for (size_t i = 0; i < talk_data.num_writes; i++) {
+        PeerWriteData *wd = talk_data.writes + i;
+        if (wd->fd == src->fd && wd->keep_open && !wd->finished) {
+            if (src->sz) {
+                wd->data = realloc(wd->data, wd->sz + src->sz);
+                if (!wd->data) fatal("Out of memory");
+                memcpy(wd->data + wd->sz, src->data, src->sz);
+                wd->sz += src->sz;
+            }
+            wd->keep_open = src->keep_open;
+            wd->notify_when_drained = wd->notify_when_drained || src->notify_when_drained;
+            free(src->data);
+            return true;
+        }
+    }
+    return false;
+}
+
+static inline bool
+hangup_persistent_peer(ChildMonitor *self, int fd) {
+    // Stop reading from a persistent peer whose responses cannot be sent. It
+    // is closed after the main thread has seen the hangup, once all its
+    // pending writes are finished, since its fd is still polled until then
+    for (size_t i = 0; i < talk_data.num_reads; i++) {
+        PeerReadData *rd = talk_data.reads + i;
+        if (rd->fd == fd && !rd->finished) {
+            rd->finished = true;
+            shutdown(fd, SHUT_RDWR);
+            queue_peer_message(self, NULL, 0, fd, PEER_HANGUP);
+            wakeup_main_loop();
+            return true;
+        }
+    }
+    return false;
+}
+
 static inline void
-move_queued_writes() {
-    while (talk_data.num_queued_writes) {
-        PeerWriteData *src = talk_data.queued_writes + --talk_data.num_queued_writes;
+move_queued_writes(ChildMonitor *self) {
+    bool has_finished_reads = false;
+    for (size_t i = 0; i < talk_data.num_queued_writes; i++) {
+        PeerWriteData *src = talk_data.queued_writes + i;
+        if (src->keep_open || src->sz == 0) {
+            if (coalesce_persistent_write(src)) { *src = empty_pwd; continue; }
+        }
         size_t fd_idx = talk_data.num_listen_fds + talk_data.num_talk_fds;
         if (fd_idx < PEER_LIMIT && talk_data.num_writes < PEER_LIMIT) {
             ensure_space_for(&talk_data, fds, PollFD, fd_idx + 1, fds_capacity, 8, false);
@@ -1270,10 +1498,14 @@ move_queued_writes() {
             talk_data.num_talk_fds++;
         } else {
             log_error("Cannot send response to peer, too many peers");
-            free(src->data); nuke_socket(src->fd);
+            free(src->data);
+            if (!src->keep_open) { nuke_socket(src->fd); }
+            else if (hangup_persistent_peer(self, src->fd)) has_finished_reads = true;
         }
         *src = empty_pwd;
     }
+    talk_data.num_queued_writes = 0;
+    if (has_finished_reads) prune_finished_reads();
 }
 
 static void*
@@ -1304,12 +1536,12 @@ talk_loop(void *data) {
             if (talk_data.fds[talk_data.num_listen_fds - 1].revents & POLLIN) drain_fd(talk_data.fds[talk_data.num_listen_fds - 1].fd);  // wakeup
             for (size_t i = talk_data.num_listen_fds; i < talk_data.num_talk_fds + talk_data.num_listen_fds; i++) {
                 if (talk_data.fds[i].revents & (POLLIN | POLLHUP)) { if (read_from_peer(self, talk_data.fds[i].fd)) has_finished_reads = true; }
-                if (talk_data.fds[i].revents & POLLOUT) { if (write_to_peer(talk_data.fds[i].fd)) has_finished_writes = true; }
+                if (talk_data.fds[i].revents & POLLOUT) { if (write_to_peer(self, talk_data.fds[i].fd)) has_finished_writes = true; }
             }
             if (has_finished_reads) prune_finished_reads();
             if (has_finished_writes) prune_finished_writes();
             peer_mutex(lock);
-            if (talk_data.num_queued_writes) move_queued_writes();
+            if (talk_data.num_queued_writes) move_queued_writes(self);
             peer_mutex(unlock);
         } else if (ret < 0) { if (errno != EAGAIN && errno != EINTR) perror("poll() on talk fds failed"); }
     }
@@ -1320,17 +1552,18 @@ end:
 }
 
 static inline bool
-add_peer_writer(int fd, const char* msg, size_t msg_sz) {
+add_peer_writer(int fd, const char* msg, size_t msg_sz, bool keep_open, bool notify_when_drained) {
     bool ok = false;
     peer_mutex(lock);
-    if (talk_data.num_queued_writes < PEER_LIMIT) {
+    if (talk_data.num_queued_writes < PEER_LIMIT || keep_open) {
         ensure_space_for(&talk_data, queued_writes, PeerWriteData, talk_data.num_queued_writes + 1, queued_writes_capacity, 8, false);
-        talk_data.queued_writes[talk_data.num_queued_writes] = empty_pwd;
-        talk_data.queued_writes[talk_data.num_queued_writes].data = malloc(msg_sz);
-        if (talk_data.queued_writes[talk_data.num_queued_writes].data) {
-            memcpy(talk_data.queued_writes[talk_data.num_queued_writes].data, msg, msg_sz);
-            talk_data.queued_writes[talk_data.num_queued_writes].sz = msg_sz;
-            talk_data.queued_writes[talk_data.num_queued_writes++].fd = fd;
+        PeerWriteData *wd = talk_data.queued_writes + talk_data.num_queued_writes;
+        *wd = empty_pwd;
+        wd->data = malloc(MAX(1u, msg_sz));
+        if (wd->data) {
+            if (msg_sz) memcpy(wd->data, msg, msg_sz);
+            wd->sz = msg_sz; wd->fd = fd; wd->keep_open = keep_open; wd->notify_when_drained = notify_when_drained;
+            talk_data.num_queued_writes++;
             ok = true;
         }
     } else log_error("Cannot send response to peer, too many peers");
@@ -1341,7 +1574,14 @@ add_peer_writer(int fd, const char* msg, size_t msg_sz) {
 static void
 send_response(int fd, const char *msg, size_t msg_sz) {
     if (msg == NULL) { shutdown(fd, SHUT_WR); close(fd); return; }
-    if (!add_peer_writer(fd, msg, msg_sz)) { shutdown(fd, SHUT_WR); close(fd); }
+    if (!add_peer_writer(fd, msg, msg_sz, false, false)) { shutdown(fd, SHUT_WR); close(fd); }
+    else wakeup_talk_loop(false);
+}
+
+static void
+send_persistent_response(int fd, const char *msg, size_t msg_sz, bool close_connection, bool notify_when_drained) {
+    // The connection is closed only after all previously queued responses have been written
+    if (!add_peer_writer(fd, msg, close_connection ? 0 : msg_sz, !close_connection, notify_when_drained)) { if (close_connection) nuke_socket(fd); }
     else wakeup_talk_loop(false);
 }
 
@@ -1380,8 +1620,28 @@ safe_pipe(PYNOARG) {
     return Py_BuildValue("ii", fds[0], fds[1]);
 }
 
+static PyObject*
+foreground_cwd_of_child(PyObject *self UNUSED, PyObject *pid_) {
+#define foreground_cwd_of_child_doc "foreground_cwd_of_child(pid) -> The working directory of the foreground process in the terminal of the child with the specified pid, as last seen by the I/O thread, or None if not known"
+    if (!PyLong_Check(pid_)) { PyErr_SetString(PyExc_TypeError, "pid must be an int"); return NULL; }
+    long pid = PyLong_AsLong(pid_);
+    PyObject *ans = NULL;
+    if (!the_monitor) Py_RETURN_NONE;
+    children_mutex(lock);
+    for (size_t i = 0; i < the_monitor->count; i++) {
+        if (children[i].pid == pid && children[i].foreground_cwd) {
+            ans = PyUnicode_DecodeFSDefault(children[i].foreground_cwd);
+            break;
+        }
+    }
+    children_mutex(unlock);
+    if (ans || PyErr_Occurred()) return ans;
+    Py_RETURN_NONE;
+}
+
 static PyMethodDef module_methods[] = {
     METHODB(safe_pipe, METH_NOARGS),
+    METHODB(foreground_cwd_of_child, METH_O),
     {NULL}  /* Sentinel */
 };
 
@@ -4,10 +4,12 @@
 
 import fcntl
 import os
+from time import monotonic
 
 import kitty.fast_data_types as fast_data_types
 
 from .constants import is_macos, shell_path, terminfo_dir
+from .spawn_helper import spawn_helper, stop_spawn_helper
 
 if is_macos:
     from kitty.fast_data_types import cmdline_of_process, cwd_of_process as _cwd, environ_of_process as _environ_of_process
@@ -21,8 +23,9 @@ else:
         return list(filter(None, open('/proc/{}/cmdline'.format(pid), 'rb').read().decode('utf-8').split('\0')))
 
     def cwd_of_process(pid):
-        ans = '/proc/{}/cwd'.format(pid)
-        return os.path.realpath(ans)
+        # The kernel already resolves the link to a canonical path, so there
+        # is no need for the many system calls made by realpath()
+        return os.readlink('/proc/{}/cwd'.format(pid))
 
     def _environ_of_process(pid):
         return open('/proc/{}/environ'.format(pid), 'rb').read().decode('utf-8')
@@ -33,21 +36,15 @@ def parse_environ_block(data):
     # The block is usually raw data from the target process.  It might contain
     # trailing garbage and lines that do not look like assignments.
     ret = {}
-    pos = 0
-
-    while True:
-        next_pos = data.find("\0", pos)
+    # anything after the last nul byte is garbage
+    for line in data.split('\0')[:-1]:
         # nul byte at the beginning or double nul byte means finish
-        if next_pos <= pos:
+        if not line:
             break
         # there might not be an equals sign
-        equal_pos = data.find("=", pos, next_pos)
-        if equal_pos > pos:
-            key = data[pos:equal_pos]
-            value = data[equal_pos + 1:next_pos]
+        key, sep, value = line.partition('=')
+        if key and sep:
             ret[key] = value
-        pos = next_pos + 1
-
     return ret
 
 
@@ -55,6 +52,13 @@ def environ_of_process(pid):
     return parse_environ_block(_environ_of_process(pid))
 
 
+def cwd_of_child(pid):
+    # Use the working directory of the foreground process in the terminal of
+    # the child, which is tracked by the I/O thread, so that programs running
+    # in the shell are respected and the OS is not queried in the main thread
+    return fast_data_types.foreground_cwd_of_child(pid) or cwd_of_process(pid)
+
+
 def remove_cloexec(fd):
     fcntl.fcntl(fd, fcntl.F_SETFD, fcntl.fcntl(fd, fcntl.F_GETFD) & ~fcntl.FD_CLOEXEC)
 
@@ -77,6 +81,9 @@ class Child:
 
     child_fd = pid = None
     forked = False
+    # Reading and parsing the cmdline and environment of the child is slow and
+    # they only change when the child execs, so they are cached for this many seconds
+    process_data_max_age = 1.0
 
     def __init__(self, argv, cwd, opts, stdin=None, env=None, cwd_from=None):
         self.allow_remote_control = False
@@ -87,7 +94,7 @@ class Child:
         self.argv = argv
         if cwd_from is not None:
             try:
-                cwd = cwd_of_process(cwd_from)
+                cwd = cwd_of_child(cwd_from)
             except Exception:
                 import traceback
                 traceback.print_exc()
@@ -97,6 +104,7 @@ class Child:
         self.opts = opts
         self.stdin = stdin
         self.env = env or {}
+        self.process_data = {}
 
     def fork(self):
         if self.forked:
@@ -113,20 +121,33 @@ class Child:
             remove_cloexec(stdin_read_fd)
         else:
             stdin_read_fd = stdin_write_fd = -1
-        env = default_env().copy()
-        env.update(self.env)
+        env = self.env.copy()
         env['TERM'] = self.opts.term
         env['COLORTERM'] = 'truecolor'
         if os.path.isdir(terminfo_dir):
             env['TERMINFO'] = terminfo_dir
-        env = tuple('{}={}'.format(k, v) for k, v in env.items())
         argv = list(self.argv)
         exe = argv[0]
         if is_macos and exe == shell_path:
             # Some macOS machines need the shell to have argv[0] prefixed by
             # hyphen, see https://github.com/kovidgoyal/kitty/issues/247
             argv[0] = ('-' + exe.split('/')[-1])
-        pid = fast_data_types.spawn(exe, self.cwd, tuple(argv), env, master, slave, stdin_read_fd, stdin_write_fd, ready_read_fd, ready_write_fd)
+        pid = None
+        helper = spawn_helper()
+        if helper is not None:
+            # The helper already has default_env() so only the changes to it
+            # are sent
+            try:
+                pid = helper.spawn(exe, self.cwd, argv, env, slave, stdin_read_fd, ready_read_fd)
+            except Exception:
+                import traceback
+                traceback.print_exc()
+                stop_spawn_helper()
+        if pid is None:
+            full_env = default_env().copy()
+            full_env.update(env)
+            env = tuple('{}={}'.format(k, v) for k, v in full_env.items())
+            pid = fast_data_types.spawn(exe, self.cwd, tuple(argv), env, master, slave, stdin_read_fd, stdin_write_fd, ready_read_fd, ready_write_fd)
         os.close(slave)
         self.pid = pid
         self.child_fd = master
@@ -142,17 +163,24 @@ class Child:
         os.close(self.terminal_ready_fd)
         self.terminal_ready_fd = -1
 
+    def cached_process_data(self, key, func):
+        now = monotonic()
+        q = self.process_data.get(key)
+        if q is None or now - q[0] > self.process_data_max_age:
+            q = self.process_data[key] = now, func(self.pid)
+        return q[1]
+
     @property
     def cmdline(self):
         try:
-            return cmdline_of_process(self.pid) or list(self.argv)
+            return list(self.cached_process_data('cmdline', cmdline_of_process) or self.argv)
         except Exception:
             return list(self.argv)
 
     @property
     def environ(self):
         try:
-            return environ_of_process(self.pid)
+            return self.cached_process_data('environ', environ_of_process).copy()
         except Exception:
             return {}
 
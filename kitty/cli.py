@@ -7,7 +7,7 @@ import re
 import sys
 from collections import deque
 
-from .conf.utils import resolve_config
+from .conf.utils import recording_config_files, resolve_config
 from .constants import appname, defconf, is_macos, is_wayland, str_version
 
 CONFIG_HELP = '''\
@@ -173,9 +173,10 @@ def prettify_rst(text):
 
 def version(add_rev=False):
     rev = ''
-    from . import fast_data_types
-    if add_rev and hasattr(fast_data_types, 'KITTY_VCS_REV'):
-        rev = ' ({})'.format(fast_data_types.KITTY_VCS_REV[:10])
+    if add_rev:
+        from . import fast_data_types
+        if hasattr(fast_data_types, 'KITTY_VCS_REV'):
+            rev = ' ({})'.format(fast_data_types.KITTY_VCS_REV[:10])
     return '{} {}{} created by {}'.format(italic(appname), green(str_version), rev, title('Kovid Goyal'))
 
 
@@ -602,6 +603,19 @@ type=bool-set
 Print out information about the system and kitty configuration.
 
 
+--debug-startup
+type=bool-set
+Print out how long the different phases of starting the windows of every tab
+take, useful for investigating slow startup with large session files.
+
+
+--startup-profile
+type=bool-set
+Print out how long importing each module and the different phases of startup,
+such as loading the config, fonts, OpenGL initialization and rendering the
+first frame, take.
+
+
 --execute -e
 type=bool-set
 !
@@ -731,3 +745,22 @@ def create_opts(args, debug_config=False):
     if debug_config:
         compare_opts(opts)
     return opts
+
+
+def opts_for_instance(args):
+    # The options for the new OS windows requested by other kitty invocations
+    # with --single-instance. The config files are parsed again only if they,
+    # or the files they include, have changed.
+    from .config import file_signature
+    key = tuple(args.config or ()), tuple(args.override or ())
+    cache = opts_for_instance.__dict__.setdefault('cache', {})
+    cached = cache.get(key)
+    if cached is not None:
+        paths, signature, opts = cached
+        if tuple(map(file_signature, paths)) == signature:
+            return opts
+    with recording_config_files() as read_paths:
+        opts = create_opts(args)
+    paths = tuple(dict.fromkeys(tuple(resolve_config(SYSTEM_CONF, defconf, args.config)) + tuple(read_paths)))
+    cache[key] = paths, tuple(map(file_signature, paths)), opts
+    return opts
@@ -5,13 +5,10 @@
 import json
 import os
 import sys
+from types import GeneratorType
 
 from .cli import parse_args
-from .config import parse_config, parse_send_text_bytes
 from .constants import appname
-from .fast_data_types import focus_os_window
-from .tabs import SpecialWindow
-from .utils import natsort_ints
 
 
 class MatchError(ValueError):
@@ -64,7 +61,11 @@ starting from zero and counting clockwise (this is the same as the order in whic
 windows are reported by the :italic:`ls` command). The window id of the current window
 is available as the KITTY_WINDOW_ID environment variable. When using the :italic:`env` field
 to match on environment variables you can specify only the environment variable name or a name
-and value, for example, :italic:`env:MY_ENV_VAR=2`
+and value, for example, :italic:`env:MY_ENV_VAR=2`. Specifications can be combined with
+:italic:`and`, :italic:`or`, :italic:`not` and parentheses, for example,
+:italic:`title:vim and not cwd:/tmp`. Use quotes for regexps containing spaces in
+combined specifications, for example, :italic:`title:"my title" or id:3`.
+A single specification is used as is, quotes included.
 '''
 MATCH_TAB_OPTION = '''\
 --match -m
@@ -74,7 +75,10 @@ You can use the :italic:`ls` command to get a list of tabs. Note that for
 numeric fields such as id and pid the expression is interpreted as a number,
 not a regular expression. When using title or id, first a matching tab is
 looked for and if not found a matching window is looked for, and the tab
-for that window is used.
+for that window is used. Specifications can be combined with :italic:`and`,
+:italic:`or`, :italic:`not` and parentheses, for example,
+:italic:`title:vim or id:3`. For fields other than title and id, a tab
+matches if any of its windows matches.
 '''
 
 
@@ -205,6 +209,7 @@ def cmd_send_text(global_opts, opts, args):
 
 
 def send_text(boss, window, payload):
+    from .config import parse_send_text_bytes
     windows = [boss.active_window]
     match = payload['match']
     if match:
@@ -509,6 +514,8 @@ def cmd_new_window(global_opts, opts, args):
 
 
 def new_window(boss, window, payload):
+    from .fast_data_types import focus_os_window
+    from .tabs import SpecialWindow
     w = SpecialWindow(cmd=payload['args'] or None, override_title=payload['title'], cwd=payload['cwd'])
     old_window = boss.active_window
     if payload['new_tab']:
@@ -565,6 +572,7 @@ def cmd_focus_window(global_opts, opts, args):
 
 
 def focus_window(boss, window, payload):
+    from .fast_data_types import focus_os_window
     windows = [window or boss.active_window]
     match = payload['match']
     if match:
@@ -632,11 +640,36 @@ getting the current selection, the result is always plain text.
 --self
 type=bool-set
 If specified get text from the window this command is run in, rather than the active window.
+
+
+--stream
+type=bool-set
+Send the text in chunks as it is generated, instead of all at once. Useful for
+getting very large amounts of scrollback without stalling kitty. Requires the
+:option:`kitty @ --to` option to be used. Not supported for the selection.
+
+
+--since
+type=int
+default=-1
+Get only the lines added to the window since the specified line sequence
+number, ignoring :option:`kitty @ get-text --extent`. The output is JSON
+containing the text and the sequence number to use for the next call, so that
+the scrollback can be polled with a cost proportional to the amount of new
+output. Start with a sequence number of zero. Lines are numbered as they are
+completed by newlines, so a line is not included until the cursor moves off
+it, and the numbers keep increasing when the screen is cleared or the window
+is resized. Lines that were erased before they were got are skipped.
 ''',
     argspec=''
 )
 def cmd_get_text(global_opts, opts, args):
-    return {'match': opts.match, 'extent': opts.extent, 'ansi': opts.ansi, 'self': opts.self}
+    if opts.stream and not (global_opts.to or os.environ.get('KITTY_LISTEN_ON')):
+        raise SystemExit('The --stream option requires the use of --to')
+    return {
+        'match': opts.match, 'extent': opts.extent, 'ansi': opts.ansi, 'self': opts.self, 'stream': opts.stream,
+        'since': opts.since if opts.since > -1 else None
+    }
 
 
 def get_text(boss, window, payload):
@@ -648,14 +681,67 @@ def get_text(boss, window, payload):
     else:
         windows = [window if window and payload['self'] else boss.active_window]
     window = windows[0]
+    if payload.get('since') is not None:
+        text, seq = window.text_since(payload['since'], as_ansi=bool(payload['ansi']))
+        return json.dumps({'text': text, 'seq': seq}, indent=2)
     if payload['extent'] == 'selection':
         ans = window.text_for_selection()
+    elif payload.get('stream'):
+        ans = window.iter_text(as_ansi=bool(payload['ansi']), add_history=payload['extent'] == 'all')
     else:
         ans = window.as_text(as_ansi=bool(payload['ansi']), add_history=payload['extent'] == 'all')
     return ans
 # }}}
 
 
+# search_scrollback {{{
+@cmd(
+    'Search the scrollback of the specified window',
+    'Search the screen and scrollback of the specified window for lines containing'
+    ' the specified text. The output is JSON containing a list of matches, in order, with'
+    ' the sequence number of the line (the same as used by :option:`kitty @ get-text --since`),'
+    ' the position of the match and the text of the line. A line that is wrapped can match'
+    ' more than once. The scrollback is indexed'
+    ' the first time it is searched, so searching it again is fast, even when it is very large.'
+    ' Text that is only in the pager history is not searched.',
+    options_spec=MATCH_WINDOW_OPTION + '''\n
+--ignore-case -i
+type=bool-set
+Ignore case when matching the text.
+
+
+--limit
+type=int
+default=100
+The maximum number of matches to return, the most recent matches are returned.
+Zero means no limit.
+
+
+--self
+type=bool-set
+If specified search the window this command is run in, rather than the active window.
+''',
+    argspec='TEXT ...'
+)
+def cmd_search_scrollback(global_opts, opts, args):
+    if not args:
+        raise SystemExit('Must specify the text to search for')
+    return {'match': opts.match, 'query': ' '.join(args), 'ignore_case': opts.ignore_case, 'limit': max(0, opts.limit), 'self': opts.self}
+
+
+def search_scrollback(boss, window, payload):
+    match = payload['match']
+    if match:
+        windows = tuple(boss.match_windows(match))
+        if not windows:
+            raise MatchError(match)
+    else:
+        windows = [window if window and payload['self'] else boss.active_window]
+    matches = windows[0].search_scrollback(payload['query'], ignore_case=bool(payload['ignore_case']), limit=payload['limit'])
+    return json.dumps([{'line': seq, 'position': pos, 'text': text} for seq, pos, text in matches], indent=2)
+# }}}
+
+
 # set_colors {{{
 @cmd(
     'Set terminal colors',
@@ -683,6 +769,7 @@ this option, any color arguments are ignored and --configured and --all are impl
     argspec='COLOR_OR_FILE ...'
 )
 def cmd_set_colors(global_opts, opts, args):
+    from .config import parse_config
     from .rgb import color_as_int, Color
     colors = {}
     if not opts.reset:
@@ -747,6 +834,7 @@ def cmd_get_colors(global_opts, opts, args):
 
 def get_colors(boss, window, payload):
     from .rgb import Color, color_as_sharp, color_from_int
+    from .utils import natsort_ints
     ans = {k: getattr(boss.opts, k) for k in boss.opts if isinstance(getattr(boss.opts, k), Color)}
     if not payload['configured']:
         windows = (window or boss.active_window,)
@@ -831,6 +919,81 @@ def kitten(boss, window, payload):
 # }}}
 
 
+# batch {{{
+@cmd(
+    'Run many commands at once',
+    'Run many commands in a single round trip. Each argument is a complete command,'
+    ' exactly as it would be specified to :italic:`kitty @`, for example:\n'
+    ':italic:`kitty @ batch "set-window-title --match id:1 One" "goto-layout tall"`\n'
+    'The commands are run in order and a JSON list with the result of each command is returned.'
+    ' Redrawing of the window borders and tab bar happens only once, after all the commands have run.',
+    options_spec='''\
+--stdin
+type=bool-set
+Read the commands to run from :italic:`stdin`, one command per line. Blank lines and
+lines starting with # are ignored.
+''',
+    argspec='[COMMAND ...]'
+)
+def cmd_batch(global_opts, opts, args):
+    import shlex
+    lines = list(args)
+    if opts.stdin:
+        lines.extend(sys.stdin.read().splitlines())
+    commands = []
+    no_command_response = global_opts.no_command_response
+    for line in lines:
+        items = shlex.split(line)
+        if not items or items[0].startswith('#'):
+            continue
+        func = cmap.get(items[0])
+        if func is None:
+            raise SystemExit('{} is not a known command'.format(items[0]))
+        if func is cmd_batch:
+            raise SystemExit('batch commands cannot be nested')
+        sub_opts, sub_args = parse_subcommand_cli(func, items)
+        payload = func(global_opts, sub_opts, sub_args)
+        if payload is not None and not isinstance(payload, dict):
+            # commands such as send-text produce their payload in chunks
+            for chunk in payload:
+                commands.append({'cmd': func.name, 'payload': dict(chunk)})
+        else:
+            commands.append({'cmd': func.name, 'payload': payload})
+    # sub-commands must not change whether the batch itself gets a response
+    global_opts.no_command_response = no_command_response
+    if not commands:
+        raise SystemExit('No commands specified')
+    return {'commands': commands}
+
+
+def batch(boss, window, payload):
+    results = []
+    with boss.deferred_relayouts():
+        for command in payload['commands']:
+            c = cmap.get(command['cmd'])
+            if c is None or c is cmd_batch:
+                results.append({'ok': False, 'error': 'Unknown command: {}'.format(command['cmd'])})
+                continue
+            func = c.impl()
+            try:
+                ans = func(boss, window) if command.get('payload') is None else func(boss, window, command['payload'])
+            except Exception as err:
+                results.append({'ok': False, 'error': str(err)})
+            else:
+                if isinstance(ans, GeneratorType):
+                    ans = ''.join(ans)
+                if c.string_return_is_error and isinstance(ans, str):
+                    # the client reports these as errors only for top level responses
+                    results.append({'ok': False, 'error': ans})
+                    continue
+                result = {'ok': True}
+                if ans is not None:
+                    result['data'] = ans
+                results.append(result)
+    return json.dumps(results, indent=2)
+# }}}
+
+
 def cli_params_for(func):
     return (func.options_spec or '\n').format, func.argspec, func.desc, '{} @ {}'.format(appname, func.name)
 
@@ -10,7 +10,6 @@ from kittens.runner import get_kitten_cli_docs, all_kitten_names
 
 from .cli import options_for_completion, parse_option_spec
 from .cmds import cmap
-from .shell import options_for_cmd
 
 parsers, serializers = {}, {}
 
@@ -218,6 +217,7 @@ def complete_cli(ans, words, new_word, seq, complete_args=lambda *a: None):
 
 
 def complete_remote_command(ans, cmd_name, words, new_word):
+    from .shell import options_for_cmd
     aliases, alias_map = options_for_cmd(cmd_name)
     if not alias_map:
         return
@@ -5,14 +5,18 @@
 import os
 import re
 import shlex
+from contextlib import contextmanager
 
-from ..rgb import to_color as as_color
 from ..utils import log_error
 
 key_pat = re.compile(r'([a-zA-Z][a-zA-Z0-9_-]*)\s+(.+)$')
+# The paths of the config files read, including included files, while
+# inside recording_config_files()
+read_config_files = None
 
 
 def to_color(x):
+    from ..rgb import to_color as as_color
     return as_color(x, validate=True)
 
 
@@ -89,6 +93,8 @@ def _parse(lines, type_map, special_handling, ans, all_keys):
     name = getattr(lines, 'name', None)
     if name:
         base_path_for_includes = os.path.dirname(os.path.abspath(name))
+        if read_config_files is not None:
+            read_config_files.append(os.path.abspath(name))
     else:
         from ..constants import config_dir
         base_path_for_includes = config_dir
@@ -103,6 +109,16 @@ def parse_config_base(
     _parse(lines, type_map, special_handling, ans, all_keys)
 
 
+@contextmanager
+def recording_config_files():
+    global read_config_files
+    read_config_files = ans = []
+    try:
+        yield ans
+    finally:
+        read_config_files = None
+
+
 def create_options_class(keys):
     keys = tuple(sorted(keys))
     slots = keys + ('_fields',)
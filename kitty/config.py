@@ -3,6 +3,7 @@
 # License: GPL v3 Copyright: 2016, Kovid Goyal <kovid at kovidgoyal.net>
 
 import json
+import marshal
 import os
 import re
 import sys
@@ -12,11 +13,12 @@ from contextlib import contextmanager
 from . import fast_data_types as defines
 from .conf.definition import as_conf_file, config_lines
 from .conf.utils import (
-    init_config, key_func, load_config as _load_config, merge_dicts,
+    create_options_class, key_func, load_config as _load_config, merge_dicts,
     parse_config_base, python_string, to_bool, to_cmdline
 )
 from .config_data import all_options, parse_mods, type_map
-from .constants import cache_dir, defconf, is_macos
+from .constants import cache_dir, defconf, is_macos, str_version
+from .rgb import Color
 from .utils import log_error
 
 named_keys = {
@@ -408,7 +410,124 @@ def parse_defaults(lines, check_keys=False):
     return ans
 
 
-Options, defaults = init_config(config_lines(all_options), parse_defaults)
+# Cache of parsed options {{{
+# The parsed defaults are cached on disk, as parsing them on every start, in
+# every kitty process, is slow compared to reading the cache with marshal.
+# marshal supports only the builtin types, the other types in parsed options
+# are stored as a dict with the single key None mapping to
+# (type name, constructor args).
+
+options_cache_version = 1
+
+
+def atomic_save(data, path):
+    import tempfile
+    fd, p = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.rename(p, path)
+    finally:
+        try:
+            os.remove(p)
+        except FileNotFoundError:
+            pass
+        except Exception as err:
+            log_error('Failed to delete temp file {} for atomic save with error: {}'.format(
+                p, err))
+
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return
+    return st.st_mtime_ns, st.st_size
+
+
+def encode_options(x):
+    t = type(x)
+    if t is dict:
+        ans = {k: encode_options(v) for k, v in x.items()}
+        return ans if ans == x else {None: ('dict', ans)}
+    if t in (list, tuple, set, frozenset):
+        ans = t(map(encode_options, x))
+        return ans if ans == x else {None: (t.__name__, ans)}
+    if t is Color:
+        return {None: ('Color', tuple(x))}
+    if t is KeyAction:
+        return {None: ('KeyAction', (x.func, encode_options(x.args)))}
+    if t is KeyDefinition:
+        return {None: ('KeyDefinition', (x.is_sequence, encode_options(x.action)) + x.trigger + (x.rest,))}
+    if t in (str, int, float, bool, bytes) or x is None:
+        return x
+    raise TypeError('Cannot cache options of type: {}'.format(t))
+
+
+containers = {t.__name__: t for t in (list, tuple, set, frozenset)}
+# Faster than calling the namedtuple classes
+new_tuple = tuple.__new__
+
+
+def decode_options(x):
+    # Only the values that contain other types are walked
+    if type(x) is not dict or None not in x:
+        return x
+    name, args = x[None]
+    if name == 'dict':
+        return {k: decode_options(v) for k, v in args.items()}
+    if name == 'Color':
+        return new_tuple(Color, args)
+    if name == 'KeyAction':
+        return new_tuple(KeyAction, (args[0], decode_options(args[1])))
+    if name == 'KeyDefinition':
+        action = decode_options(args[1])
+        all_key_actions.add(action.func)
+        return KeyDefinition(args[0], action, *args[2:])
+    return containers[name](map(decode_options, args))
+
+
+def cached_parse(name, key, parse):
+    # Return the result of parse(), which must be a dict of options, from the
+    # cache if it was cached with the same key
+    try:
+        path = os.path.join(cache_dir(), name + '.cache')
+    except Exception:
+        return parse()  # the cache directory could not be created
+    try:
+        with open(path, 'rb') as f:
+            ckey, value = marshal.loads(f.read())
+        if ckey == key:
+            return decode_options(value)
+    except FileNotFoundError:
+        pass
+    except Exception as err:
+        log_error('Ignoring invalid options cache {} with error: {}'.format(path, err))
+    ans = parse()
+    try:
+        atomic_save(marshal.dumps((key, encode_options(ans))), path)
+    except Exception as err:
+        log_error('Failed to save options cache {} with error: {}'.format(path, err))
+    return ans
+
+
+def defaults_cache_key():
+    # Running from source the definitions can change without the version
+    # changing, so the modules used for parsing are part of the key
+    base = os.path.dirname(os.path.abspath(__file__))
+    sources = tuple(file_signature(os.path.join(base, *x.split('/'))) for x in (
+        'config.py', 'config_data.py', 'conf/utils.py', 'conf/definition.py'))
+    return options_cache_version, str_version, sources
+
+
+def load_defaults():
+    ans = cached_parse('options-defaults', defaults_cache_key(), lambda: parse_defaults(config_lines(all_options)))
+    Options = create_options_class(ans.keys())
+    return Options, Options(ans)
+# }}}
+
+
+Options, defaults = load_defaults()
 actions = frozenset(all_key_actions) | frozenset(
     'run_simple_kitten combine send_text goto_tab goto_layout set_font_size new_tab_with_cwd new_window_with_cwd new_os_window_with_cwd'.
     split()
@@ -440,23 +559,6 @@ def build_ansi_color_table(opts=defaults):
     return list(map(col, range(256)))
 
 
-def atomic_save(data, path):
-    import tempfile
-    fd, p = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
-    try:
-        with os.fdopen(fd, 'wb') as f:
-            f.write(data)
-        os.rename(p, path)
-    finally:
-        try:
-            os.remove(p)
-        except FileNotFoundError:
-            pass
-        except Exception as err:
-            log_error('Failed to delete temp file {} for atomic save with error: {}'.format(
-                p, err))
-
-
 @contextmanager
 def cached_values_for(name):
     cached_path = os.path.join(cache_dir(), name + '.json')
@@ -346,9 +346,16 @@ o('scrollback_pager_history_size', 0, option_type=scrollback_pager_history_size,
 Separate scrollback history size, used only for browsing the scrollback buffer (in MB).
 This separate buffer is not available for interactive scrolling but will be
 piped to the pager program when viewing scrollback buffer in a separate window.
-The current implementation stores one character in 4 bytes, so approximatively
-2500 lines per megabyte at 100 chars per line. A value of zero or less disables
-this feature. The maximum allowed size is 4GB.'''))
+The text is stored as UTF-8, so approximately 10000 lines per megabyte at 100
+chars per line, for mostly ASCII text. A value of zero or less disables this
+feature. The maximum allowed size is 4GB.'''))
+
+o('scrollback_pager_history_on_disk', False, long_text=_('''
+Store most of the separate scrollback history used for the pager compressed, in
+a temporary file in the kitty cache directory, instead of in RAM. Only the most
+recently added history is kept uncompressed in RAM, greatly reducing memory
+usage when many windows have a large :opt:`scrollback_pager_history_size`,
+which is then the maximum size of the compressed history on disk.'''))
 
 o('wheel_scroll_multiplier', 5.0, long_text=_('''
 Modify the amount scrolled by the mouse wheel. Note this is only used for low
@@ -437,6 +444,20 @@ increase CPU usage and might cause flicker in full screen programs that
 redraw the entire screen on each loop, because kitty is so fast that partial
 screen updates will be drawn.'''))
 
+o('title_update_interval', 100, option_type=positive_int, long_text=_('''
+Minimum interval (in milliseconds) between updates of the window and tab
+titles. Some programs change the title very often, for example on every
+prompt or for every step of a progress indicator. Only the latest title set
+by a program in each interval is used.'''))
+
+o('spawn_helper', False, long_text=_('''
+Use a small helper process, started together with kitty, to create the child
+processes (shells) of new windows. This makes creating windows faster, as the
+time taken no longer depends on the amount of memory used by kitty. The child
+processes are then not children of kitty itself, so this is not used when
+:opt:`close_on_child_death` is enabled.
+'''))
+
 o('sync_to_monitor', True, long_text=_('''
 Sync screen updates to the refresh rate of the monitor. This prevents
 tearing (https://en.wikipedia.org/wiki/Screen_tearing) when scrolling. However,
@@ -175,10 +175,13 @@ typedef struct {
 
 typedef struct {
     index_type bufsize, maxsz;
-    Py_UCS4 *buffer;
+    // UTF-8 encoded ANSI text, lines end with \r and are separated by \n
+    uint8_t *buffer;
     index_type start, end;
     index_type bufend;
     bool rewrap_needed;
+    // Compressed storage for older history, NULL when all history is kept in buffer
+    struct PagerHistoryStorage *storage;
 } PagerHistoryBuf;
 
 typedef struct {
@@ -189,6 +192,10 @@ typedef struct {
     PagerHistoryBuf *pagerhist;
     Line *line;
     index_type start_of_data, count;
+    // The total number of lines ever added, used as a sequence number for lines
+    unsigned long long lines_added;
+    // Index for searching the lines, NULL until the buffer is first searched
+    struct SearchIndex *search_index;
 } HistoryBuf;
 
 typedef struct {
@@ -365,6 +365,14 @@ alloc_and_map_vao_buffer(ssize_t vao_idx, GLsizeiptr size, size_t bufnum, GLenum
     return map_buffer(buf_idx, access);
 }
 
+static void
+update_vao_buffer(ssize_t vao_idx, size_t bufnum, GLintptr offset, GLsizeiptr size, const void *data) {
+    ssize_t buf_idx = vaos[vao_idx].buffers[bufnum];
+    bind_buffer(buf_idx);
+    glBufferSubData(buffers[buf_idx].usage, offset, size, data);
+    unbind_buffer(buf_idx);
+}
+
 static void
 bind_vao_uniform_buffer(ssize_t vao_idx, size_t bufnum, GLuint block_index) {
     ssize_t buf_idx = vaos[vao_idx].buffers[bufnum];
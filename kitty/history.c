@@ -5,9 +5,15 @@
  * Distributed under terms of the GPL3 license.
  */
 
+#define EXTRA_INIT if (PyModule_AddFunctions(module, module_methods) != 0) return false;
 #include "data-types.h"
 #include "lineops.h"
 #include <structmember.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <zlib.h>
 
 extern PyTypeObject Line_Type;
 #define SEGMENT_SIZE 2048
@@ -54,29 +60,310 @@ attrptr(HistoryBuf *self, index_type y) {
     seg_ptr(line_attrs, 1);
 }
 
+// Pager history storage {{{
+// When a storage directory is set, older pager history is kept as zlib
+// compressed UTF-8 blocks in a temporary file, used as a ring. Only the most
+// recent history is kept uncompressed in the buffer, it is moved into storage
+// as a single block every time it fills up. The file is written with pwrite()
+// so that a full disk is an error rather than a SIGBUS and read back through
+// a memory mapping.
+
+typedef struct {
+    size_t offset;
+    uint32_t compressed_sz, sz;
+    // The width the text is wrapped at, zero if unknown
+    index_type xnum;
+} PagerHistoryBlock;
+
+typedef struct PagerHistoryStorage {
+    int fd;
+    uint8_t *map;
+    size_t capacity, write_pos;
+    PagerHistoryBlock *blocks;
+    size_t num_blocks, blocks_capacity;
+    // The most recently read block, decompressed
+    size_t cached_block, cache_capacity, cache_len;
+    uint8_t *cache;
+} PagerHistoryStorage;
+
+static char *storage_dir = NULL;
+
+static inline void
+release_pages(PagerHistoryStorage *s, size_t offset, size_t sz) {
+    // Drop pages that were read from the mapping, reducing resident memory
+#ifdef MADV_DONTNEED
+    static size_t page_size = 0;
+    if (!page_size) page_size = sysconf(_SC_PAGESIZE);
+    size_t start = offset - offset % page_size;
+    madvise(s->map + start, offset + sz - start, MADV_DONTNEED);
+#else
+    (void)s; (void)offset; (void)sz;
+#endif
+}
+
+static void
+free_storage(PagerHistoryStorage *s) {
+    if (!s) return;
+    munmap(s->map, s->capacity);
+    close(s->fd);
+    PyMem_Free(s->blocks);
+    PyMem_Free(s->cache);
+    PyMem_Free(s);
+}
+
+static PagerHistoryStorage*
+alloc_storage(size_t capacity) {
+    if (!storage_dir) return NULL;
+    size_t sz = strlen(storage_dir) + 32;
+    char *path = PyMem_Malloc(sz);
+    if (!path) return NULL;
+    snprintf(path, sz, "%s/pagerhist-XXXXXX", storage_dir);
+    int fd = mkstemp(path);
+    if (fd < 0) {
+        log_error("Failed to create pager history storage file in %s with error: %s", storage_dir, strerror(errno));
+        PyMem_Free(path);
+        return NULL;
+    }
+    unlink(path); PyMem_Free(path);
+    void *map = MAP_FAILED;
+    if (ftruncate(fd, capacity) == 0) map = mmap(NULL, capacity, PROT_READ, MAP_SHARED, fd, 0);
+    if (map == MAP_FAILED) {
+        log_error("Failed to map pager history storage file with error: %s", strerror(errno));
+        close(fd);
+        return NULL;
+    }
+    PagerHistoryStorage *s = PyMem_Calloc(1, sizeof(PagerHistoryStorage));
+    if (!s) { munmap(map, capacity); close(fd); return NULL; }
+    s->fd = fd; s->map = map; s->capacity = capacity; s->cached_block = SIZE_MAX;
+    return s;
+}
+
+static inline void
+evict_oldest_block(PagerHistoryStorage *s) {
+    s->num_blocks--;
+    memmove(s->blocks, s->blocks + 1, s->num_blocks * sizeof(PagerHistoryBlock));
+    s->cached_block = SIZE_MAX;
+}
+
+static bool
+storage_append(PagerHistoryStorage *s, const uint8_t *text, size_t sz, index_type xnum) {
+    bool ok = false;
+    Bytef *compressed = NULL;
+    uLongf csz = compressBound(sz);
+    if (csz > s->capacity) return false;
+    if (s->write_pos + csz > s->capacity) {
+        // wrap around, the blocks after the write position are the oldest ones
+        while (s->num_blocks && s->blocks[0].offset >= s->write_pos) evict_oldest_block(s);
+        s->write_pos = 0;
+    }
+    while (s->num_blocks && s->blocks[0].offset < s->write_pos + csz && s->blocks[0].offset + s->blocks[0].compressed_sz > s->write_pos) evict_oldest_block(s);
+    if (s->num_blocks >= s->blocks_capacity) {
+        size_t newcap = MAX(16u, s->blocks_capacity * 2);
+        PagerHistoryBlock *blocks = PyMem_Realloc(s->blocks, newcap * sizeof(PagerHistoryBlock));
+        if (!blocks) goto end;
+        s->blocks = blocks; s->blocks_capacity = newcap;
+    }
+    if (!(compressed = PyMem_Malloc(csz))) goto end;
+    if (compress2(compressed, &csz, text, sz, Z_BEST_SPEED) != Z_OK) goto end;
+    for (size_t written = 0; written < csz;) {
+        ssize_t n = pwrite(s->fd, compressed + written, csz - written, s->write_pos + written);
+        if (n < 0) {
+            if (errno == EINTR) continue;
+            log_error("Failed to write to pager history storage with error: %s", strerror(errno));
+            goto end;
+        }
+        written += n;
+    }
+    s->blocks[s->num_blocks++] = (PagerHistoryBlock){.offset=s->write_pos, .compressed_sz=csz, .sz=sz, .xnum=xnum};
+    s->write_pos += csz;
+    ok = true;
+end:
+    PyMem_Free(compressed);
+    return ok;
+}
+
+static const uint8_t*
+storage_read(PagerHistoryStorage *s, size_t idx, size_t *len) {
+    if (s->cached_block == idx) { *len = s->cache_len; return s->cache; }
+    PagerHistoryBlock *b = s->blocks + idx;
+    if (b->sz > s->cache_capacity) {
+        uint8_t *cache = PyMem_Realloc(s->cache, b->sz);
+        if (!cache) { PyErr_NoMemory(); return NULL; }
+        s->cache = cache; s->cache_capacity = b->sz;
+    }
+    uLongf sz = b->sz;
+    int ret = uncompress(s->cache, &sz, s->map + b->offset, b->compressed_sz);
+    release_pages(s, b->offset, b->compressed_sz);
+    if (ret != Z_OK) {
+        s->cached_block = SIZE_MAX;
+        PyErr_Format(PyExc_ValueError, "Failed to decompress pager history block with zlib error: %d", ret);
+        return NULL;
+    }
+    s->cached_block = idx; s->cache_len = sz;
+    *len = sz;
+    return s->cache;
+}
+
+static PyObject*
+set_pagerhist_storage_dir(PyObject UNUSED *self, PyObject *args) {
+    const char *path = NULL;
+    if (!PyArg_ParseTuple(args, "z", &path)) return NULL;
+    PyMem_Free(storage_dir); storage_dir = NULL;
+    if (path && path[0]) {
+        storage_dir = PyMem_Malloc(strlen(path) + 1);
+        if (!storage_dir) return PyErr_NoMemory();
+        strcpy(storage_dir, path);
+    }
+    Py_RETURN_NONE;
+}
+// }}}
+
 static inline PagerHistoryBuf*
 alloc_pagerhist(unsigned int pagerhist_sz) {
     PagerHistoryBuf *ph;
     if (!pagerhist_sz) return NULL;
     ph = PyMem_Calloc(1, sizeof(PagerHistoryBuf));
-    ph->maxsz = pagerhist_sz / sizeof(Py_UCS4);
-    ph->bufsize = 1024*1024 / sizeof(Py_UCS4);
-    ph->buffer = PyMem_RawMalloc(1024*1024);
-    if (!ph->buffer) { PyMem_Free(ph); return NULL; }
+    ph->maxsz = pagerhist_sz;
+    ph->bufsize = 1024*1024;
+    ph->storage = alloc_storage(pagerhist_sz);
+    // With storage the buffer never grows and holds at most a quarter of the storage capacity
+    if (ph->storage) ph->bufsize = MAX(256u * 1024u, MIN(ph->bufsize, pagerhist_sz / 4));
+    ph->buffer = PyMem_RawMalloc(ph->bufsize);
+    if (!ph->buffer) { free_storage(ph->storage); PyMem_Free(ph); return NULL; }
     return ph;
 }
 
 static inline bool
 pagerhist_extend(PagerHistoryBuf *ph, size_t minsz) {
-    if (ph->bufsize >= ph->maxsz) return false;
+    if (ph->bufsize >= ph->maxsz || ph->storage) return false;
     size_t newsz = ph->bufsize + MAX(1024 * 1024, minsz);
-    void *newbuf = PyMem_Realloc(ph->buffer, newsz * sizeof(Py_UCS4));
+    void *newbuf = PyMem_Realloc(ph->buffer, newsz);
     if (!newbuf) return false;
     ph->buffer = newbuf;
     ph->bufsize = newsz;
     return true;
 }
 
+// Search index {{{
+// Every block of SEARCH_BLOCK_SIZE consecutive lines (by sequence number) has a
+// bloom filter of the case folded character trigrams in its lines, so that a
+// search only has to look at the text of the blocks that can contain a match.
+// The filters are kept in a ring with enough slots that a slot is only reused
+// once every line in its previous block has left the history.
+
+#define SEARCH_BLOCK_SIZE 64u
+
+typedef struct SearchIndex {
+    index_type num_slots;
+    // The number of bits in each filter minus one, the number of bits is a power of two
+    size_t mask;
+    // Allocated when first used
+    uint64_t **filters;
+    // The last characters of the most recently indexed line, for trigrams spanning continued lines
+    char_type tail[2];
+    unsigned int tail_len;
+} SearchIndex;
+
+static inline char_type
+fold_case(char_type ch) {
+    if (ch < 128) return 'A' <= ch && ch <= 'Z' ? ch + 32 : ch;
+    return Py_UNICODE_TOLOWER(ch);
+}
+
+static inline uint64_t
+trigram_hash(char_type a, char_type b, char_type c) {
+    uint64_t h = ((uint64_t)a << 42) ^ ((uint64_t)b << 21) ^ c;
+    // The MurmurHash3 finalizer
+    h ^= h >> 33; h *= 0xff51afd7ed558ccdULL; h ^= h >> 33; h *= 0xc4ceb9fe1a85ec53ULL; h ^= h >> 33;
+    return h;
+}
+
+static inline void
+bloom_add(uint64_t *f, size_t mask, uint64_t h) {
+    size_t a = h & mask, b = (h >> 32) & mask;
+    f[a >> 6] |= 1ULL << (a & 63);
+    f[b >> 6] |= 1ULL << (b & 63);
+}
+
+static inline bool
+bloom_has(const uint64_t *f, size_t mask, uint64_t h) {
+    size_t a = h & mask, b = (h >> 32) & mask;
+    return (f[a >> 6] & (1ULL << (a & 63))) && (f[b >> 6] & (1ULL << (b & 63)));
+}
+
+static SearchIndex*
+alloc_search_index(index_type ynum, index_type xnum) {
+    SearchIndex *si = PyMem_Calloc(1, sizeof(SearchIndex));
+    if (!si) fatal("Out of memory allocating history search index");
+    si->num_slots = ynum / SEARCH_BLOCK_SIZE + 2;
+    si->filters = PyMem_Calloc(si->num_slots, sizeof(uint64_t*));
+    if (!si->filters) fatal("Out of memory allocating history search index");
+    // Four bits per cell keeps the false positive rate of a single trigram
+    // below 0.16 even for blocks of completely filled lines
+    size_t bits = 512;
+    while (bits < (size_t)SEARCH_BLOCK_SIZE * xnum * 4) bits <<= 1;
+    si->mask = bits - 1;
+    return si;
+}
+
+static void
+free_search_index(SearchIndex *si) {
+    if (!si) return;
+    for (index_type i = 0; i < si->num_slots; i++) PyMem_Free(si->filters[i]);
+    PyMem_Free(si->filters);
+    PyMem_Free(si);
+}
+
+static inline uint64_t*
+search_filter(SearchIndex *si, unsigned long long block) {
+    return si->filters[block % si->num_slots];
+}
+
+static inline Py_UCS4*
+search_text_buffer(size_t sz) {
+    static Py_UCS4 *buf = NULL;
+    static size_t bufsz = 0;
+    if (bufsz < sz) {
+        sz = MAX(sz, 2 * bufsz);
+        Py_UCS4 *b = PyMem_RawRealloc(buf, sz * sizeof(Py_UCS4));
+        if (!b) fatal("Out of memory allocating history search buffer");
+        buf = b; bufsz = sz;
+    }
+    return buf;
+}
+
+static inline index_type
+search_text(Line *l, Py_UCS4 *buf) {
+    // The text of the line, the same as str(line). buf must have space for 3 * xnum characters.
+    index_type n = 0, limit = xlimit_for_line(l);
+    char_type previous_width = 0;
+    for (index_type i = 0; i < limit; i++) {
+        if (l->cpu_cells[i].ch == 0 && previous_width == 2) { previous_width = 0; continue; }
+        n += cell_as_unicode(l->cpu_cells + i, true, buf + n, ' ');
+        previous_width = l->gpu_cells[i].attrs & WIDTH_MASK;
+    }
+    return n;
+}
+
+static void
+search_index_add(SearchIndex *si, Line *l, unsigned long long seq) {
+    uint64_t **filter = si->filters + (seq / SEARCH_BLOCK_SIZE) % si->num_slots;
+    if (!*filter) {
+        *filter = PyMem_Calloc((si->mask + 1) / 64, sizeof(uint64_t));
+        if (!*filter) fatal("Out of memory allocating history search index");
+    } else if (seq % SEARCH_BLOCK_SIZE == 0) memset(*filter, 0, (si->mask + 1) / 8);
+    Py_UCS4 *buf = search_text_buffer(3u * l->xnum + 2);
+    index_type n = 0, num;
+    if (l->continued) for (; n < si->tail_len; n++) buf[n] = si->tail[n];
+    num = search_text(l, buf + n);
+    for (index_type i = n; i < n + num; i++) buf[i] = fold_case(buf[i]);
+    n += num;
+    for (index_type i = 2; i < n; i++) bloom_add(*filter, si->mask, trigram_hash(buf[i-2], buf[i-1], buf[i]));
+    si->tail_len = MIN(2u, n);
+    for (index_type i = 0; i < si->tail_len; i++) si->tail[i] = buf[n - si->tail_len + i];
+}
+// }}}
+
 static PyObject *
 new(PyTypeObject *type, PyObject *args, PyObject UNUSED *kwds) {
     HistoryBuf *self;
@@ -93,8 +380,9 @@ new(PyTypeObject *type, PyObject *args, PyObject UNUSED *kwds) {
     if (self != NULL) {
         self->xnum = xnum;
         self->ynum = ynum;
+        // Segments are allocated as lines are added, so that the history of
+        // windows that never scroll uses no memory
         self->num_segments = 0;
-        add_segment(self);
         self->line = alloc_line();
         self->line->xnum = xnum;
         self->pagerhist = alloc_pagerhist(pagerhist_sz);
@@ -112,8 +400,12 @@ dealloc(HistoryBuf* self) {
         PyMem_Free(self->segments[i].line_attrs);
     }
     PyMem_Free(self->segments);
-    if (self->pagerhist) PyMem_Free(self->pagerhist->buffer);
+    if (self->pagerhist) {
+        PyMem_Free(self->pagerhist->buffer);
+        free_storage(self->pagerhist->storage);
+    }
     PyMem_Free(self->pagerhist);
+    free_search_index(self->search_index);
     Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
@@ -156,42 +448,69 @@ inline void
 historybuf_clear(HistoryBuf *self) {
     self->count = 0;
     self->start_of_data = 0;
+    if (self->search_index) self->search_index->tail_len = 0;
+}
+
+static inline bool
+pagerhist_flush(PagerHistoryBuf *ph, index_type xnum) {
+    // Move the contents of the buffer into storage, emptying it
+    if (!ph->storage || ph->bufend || ph->start == ph->end) return false;
+    if (!storage_append(ph->storage, ph->buffer + ph->start, ph->end - ph->start, ph->rewrap_needed ? 0 : xnum)) return false;
+    ph->start = 0; ph->end = 0; ph->rewrap_needed = false;
+    return true;
+}
+
+static inline void
+pagerhist_update_start(PagerHistoryBuf *ph) {
+    // After writing at end in a buffer that has wrapped, the history starts
+    // at the first complete line that has not been overwritten
+    if (!ph->bufend) return;
+    uint8_t *p = ph->end < ph->bufend ? memchr(ph->buffer + ph->end, '\n', ph->bufend - ph->end) : NULL;
+    if (p) ph->start = p - ph->buffer + 1;
+    else ph->start = ph->bufend = 0;
 }
 
 static inline void
 pagerhist_push(HistoryBuf *self) {
+    static Py_UCS4 *ansi = NULL;
+    static uint8_t *utf8 = NULL;
+    static size_t ansi_sz = 0;
     PagerHistoryBuf *ph = self->pagerhist;
     if (!ph) return;
     bool truncated;
+    index_type num;
     Line l = {.xnum=self->xnum};
     init_line(self, self->start_of_data, &l);
-#define EXPAND_IF_FULL(sz) { \
-        if (ph->bufsize - ph->end < sz && !pagerhist_extend(ph, sz)) { \
-            ph->bufend = ph->end; ph->end = 0; \
-        } \
-}
-    size_t sz = MAX(1024, ph->bufsize - ph->end);
-    sz = MAX(sz, self->xnum + self->xnum);
-    EXPAND_IF_FULL(sz);
-    if (ph->start != ph->end && !l.continued) {
-        ph->buffer[ph->end++] = '\n';
-    }
-    while(sz < ph->maxsz - 2) {
-        size_t num = line_as_ansi(&l, ph->buffer + ph->end, ph->bufsize - ph->end - 2, &truncated);
-        if (!truncated) {
-            ph->end += num;
-            ph->buffer[ph->end++] = '\r';
-            if (ph->bufend) {
-                ph->start = ph->end + 1 < ph->bufend ? ph->end + 1 : 0;
-            }
-            break;
+    size_t sz = MAX(4096u, 32u * self->xnum);
+    while (true) {
+        if (ansi_sz < sz) {
+            Py_UCS4 *a = PyMem_RawRealloc(ansi, sz * sizeof(Py_UCS4));
+            if (a) ansi = a;
+            uint8_t *u = PyMem_RawRealloc(utf8, sz * 4);
+            if (u) utf8 = u;
+            if (!a || !u) return;
+            ansi_sz = sz;
         }
-        // check if sz is too large too fit in buffer
-        if (ph->bufsize > ph->maxsz && !ph->end) break;
-        sz *= 2;
-        EXPAND_IF_FULL(sz);
+        num = line_as_ansi(&l, ansi, ansi_sz, &truncated);
+        if (!truncated) break;
+        sz = ansi_sz * 2;
+    }
+    sz = 0;
+    for (index_type i = 0; i < num; i++) sz += encode_utf8(ansi[i], (char*)utf8 + sz);
+    size_t needed = sz + 2;
+    if (ph->bufsize - ph->end < needed && !pagerhist_extend(ph, needed) && !pagerhist_flush(ph, self->xnum)) {
+        if (needed > ph->bufsize) return;
+        // wrap around, overwriting the oldest history
+        ph->bufend = ph->end; ph->end = 0;
     }
-#undef EXPAND_IF_FULL
+    if (ph->bufsize - ph->end < needed) return;
+    if ((ph->start != ph->end || ph->bufend || (ph->storage && ph->storage->num_blocks)) && !l.continued) {
+        ph->buffer[ph->end++] = '\n';
+    }
+    memcpy(ph->buffer + ph->end, utf8, sz);
+    ph->end += sz;
+    ph->buffer[ph->end++] = '\r';
+    pagerhist_update_start(ph);
 }
 
 static inline index_type
@@ -202,6 +521,7 @@ historybuf_push(HistoryBuf *self) {
         pagerhist_push(self);
         self->start_of_data = (self->start_of_data + 1) % self->ynum;
     } else self->count++;
+    self->lines_added++;
     return idx;
 }
 
@@ -210,6 +530,99 @@ historybuf_add_line(HistoryBuf *self, const Line *line) {
     index_type idx = historybuf_push(self);
     copy_line(line, self->line);
     *attrptr(self, idx) = (line->continued & CONTINUED_MASK) | (line->has_dirty_text ? TEXT_DIRTY_MASK : 0);
+    if (self->search_index) {
+        Line l = {.xnum=self->xnum};
+        init_line(self, idx, &l);
+        search_index_add(self->search_index, &l, self->lines_added - 1);
+    }
+}
+
+static void
+search_index_rebuild(HistoryBuf *self) {
+    SearchIndex *si = self->search_index;
+    for (index_type i = 0; i < si->num_slots; i++) {
+        if (si->filters[i]) memset(si->filters[i], 0, (si->mask + 1) / 8);
+    }
+    si->tail_len = 0;
+    Line l = {.xnum=self->xnum};
+    unsigned long long first = self->lines_added - self->count;
+    for (index_type i = 0; i < self->count; i++) {
+        init_line(self, (self->start_of_data + i) % self->ynum, &l);
+        search_index_add(si, &l, first + i);
+    }
+}
+
+static inline bool
+search_block_possible(SearchIndex *si, unsigned long long block, bool has_next, const uint64_t *hashes, size_t num_hashes) {
+    // Matches can continue into the next block, so a trigram can be in either filter
+    const uint64_t *f = search_filter(si, block), *nf = has_next ? search_filter(si, block + 1) : NULL;
+    for (size_t i = 0; i < num_hashes; i++) {
+        if (!bloom_has(f, si->mask, hashes[i]) && !(nf && bloom_has(nf, si->mask, hashes[i]))) return false;
+    }
+    return true;
+}
+
+static inline Py_ssize_t
+find_in_text(const Py_UCS4 *text, index_type len, index_type max_start, const Py_UCS4 *q, Py_ssize_t qlen, bool ignore_case) {
+    for (index_type pos = 0; pos < max_start && pos + qlen <= len; pos++) {
+        Py_ssize_t i = 0;
+        if (ignore_case) { while (i < qlen && fold_case(text[pos + i]) == q[i]) i++; }
+        else { while (i < qlen && text[pos + i] == q[i]) i++; }
+        if (i == qlen) return pos;
+    }
+    return -1;
+}
+
+static PyObject*
+search(HistoryBuf *self, PyObject *args) {
+#define search_doc "search(query, ignore_case=False, limit=0) -> A list of (sequence number, position, text) for the most recent lines containing query, at most limit of them, if limit is not zero, in order of sequence number. text is the text of the line followed by the text of any lines it continues into that are needed to contain the match and position is the index of the match in it. The first search indexes the buffer, after that lines are indexed as they are added."
+    PyObject *query;
+    int ignore_case = 0;
+    unsigned int limit = 0;
+    if (!PyArg_ParseTuple(args, "U|pI", &query, &ignore_case, &limit)) return NULL;
+    if (!self->search_index) {
+        self->search_index = alloc_search_index(self->ynum, self->xnum);
+        search_index_rebuild(self);
+    }
+    PyObject *ans = PyList_New(0);
+    Py_ssize_t qlen = PyUnicode_GET_LENGTH(query);
+    if (!ans || !qlen || !self->count) return ans;
+    SearchIndex *si = self->search_index;
+    size_t num_hashes = qlen > 2 ? qlen - 2 : 0;
+    Py_UCS4 *q = PyUnicode_AsUCS4Copy(query);
+    uint64_t *hashes = PyMem_Malloc(MAX(1u, num_hashes) * sizeof(uint64_t));
+    if (!q || !hashes) { PyMem_Free(q); PyMem_Free(hashes); Py_DECREF(ans); return PyErr_NoMemory(); }
+    for (size_t i = 0; i < num_hashes; i++) hashes[i] = trigram_hash(fold_case(q[i]), fold_case(q[i+1]), fold_case(q[i+2]));
+    if (ignore_case) { for (Py_ssize_t i = 0; i < qlen; i++) q[i] = fold_case(q[i]); }
+
+    unsigned long long first = self->lines_added - self->count, last = self->lines_added - 1;
+    Line l = {.xnum=self->xnum};
+    for (unsigned long long block = last / SEARCH_BLOCK_SIZE + 1; block-- > first / SEARCH_BLOCK_SIZE;) {
+        if (!search_block_possible(si, block, block < last / SEARCH_BLOCK_SIZE, hashes, num_hashes)) continue;
+        unsigned long long start = MAX(first, block * SEARCH_BLOCK_SIZE);
+        for (unsigned long long seq = MIN(last, block * SEARCH_BLOCK_SIZE + SEARCH_BLOCK_SIZE - 1) + 1; seq-- > start;) {
+            init_line(self, index_of(self, last - seq), &l);
+            Py_UCS4 *buf = search_text_buffer(3u * self->xnum);
+            index_type line_len = search_text(&l, buf), len = line_len;
+            if (!line_len) continue;
+            for (unsigned long long next = seq + 1; next <= last && len < line_len + qlen - 1; next++) {
+                init_line(self, index_of(self, last - next), &l);
+                if (!l.continued) break;
+                buf = search_text_buffer(len + 3u * self->xnum);
+                len += search_text(&l, buf + len);
+            }
+            Py_ssize_t pos = find_in_text(buf, len, line_len, q, qlen, ignore_case);
+            if (pos < 0) continue;
+            PyObject *m = Py_BuildValue("KnN", seq, pos, PyUnicode_FromKindAndData(PyUnicode_4BYTE_KIND, buf, len));
+            if (!m || PyList_Append(ans, m) != 0) { Py_XDECREF(m); Py_CLEAR(ans); goto end; }
+            Py_DECREF(m);
+            if (limit && PyList_GET_SIZE(ans) >= limit) goto end;
+        }
+    }
+end:
+    PyMem_Free(q); PyMem_Free(hashes);
+    if (ans) PyList_Reverse(ans);
+    return ans;
 }
 
 static PyObject*
@@ -276,13 +689,14 @@ get_line(HistoryBuf *self, index_type y, Line *l) { init_line(self, index_of(sel
 
 static void
 pagerhist_rewrap(PagerHistoryBuf *ph, index_type xnum) {
-    Py_UCS4 *buf = PyMem_RawMalloc(ph->bufsize * sizeof(Py_UCS4));
+    uint8_t *buf = PyMem_RawMalloc(ph->bufsize);
     if (!buf) return;
     index_type s = ph->start, i = s, dest = 0, dest_bufend = 0, x = 0;
     index_type end = ph->bufend ? ph->bufend : ph->end;
     index_type lastmod_s = 0, lastmod_len = 0;
 #define CPY(_s, _l) { if (dest + (_l) >= ph->bufsize - 1) { dest_bufend = dest; dest = 0; } \
-              memcpy(buf + dest, ph->buffer + (_s), (_l) * sizeof(Py_UCS4)); dest += (_l); }
+              memcpy(buf + dest, ph->buffer + (_s), (_l)); dest += (_l); }
+#define IS_CONTINUATION_BYTE(b) (((b) & 0xc0) == 0x80)
     while (i < end) {
         switch (ph->buffer[i]) {
         case '\n':
@@ -291,7 +705,7 @@ pagerhist_rewrap(PagerHistoryBuf *ph, index_type xnum) {
             break;
         case '\r':
             CPY(s, i - s);
-            if (!memcmp(ph->buffer + lastmod_s, ph->buffer + i + 1, lastmod_len * sizeof(Py_UCS4)))
+            if (!memcmp(ph->buffer + lastmod_s, ph->buffer + i + 1, lastmod_len))
                 i += lastmod_len;
             s = i + 1;
             break;
@@ -302,62 +716,120 @@ pagerhist_rewrap(PagerHistoryBuf *ph, index_type xnum) {
             lastmod_len = i - lastmod_s + 1;
             break;
         default:
-            x++; break;
+            // count characters, not bytes
+            if (!IS_CONTINUATION_BYTE(ph->buffer[i])) x++;
+            break;
         }
         i++;
         if (ph->bufend && i == ph->bufend) {
             if (s != i) CPY(s, i - s);
             end = ph->end; i = s = 0;
         }
-        if (x == xnum) {
+        if (x == xnum && (i >= end || !IS_CONTINUATION_BYTE(ph->buffer[i]))) {
             CPY(s, i - s); buf[dest++] = '\r'; s = i; x = 0;
             if (!(ph->buffer[i] == '\x1b' && ph->buffer[i+1] == '[') && lastmod_len)
                 CPY(lastmod_s, lastmod_len);
         }
     }
+#undef IS_CONTINUATION_BYTE
 #undef CPY
     PyMem_Free(ph->buffer);
     ph->buffer = buf;
     ph->end = dest; ph->bufend = dest_bufend;
-    ph->start = dest_bufend ? dest + 1 : 0;
+    ph->start = 0;
+    pagerhist_update_start(ph);
     ph->rewrap_needed = false;
 }
 
+static void
+storage_rewrap(PagerHistoryBuf *ph, index_type xnum) {
+    // Rewrap all blocks not wrapped at xnum, by copying the history into new storage
+    PagerHistoryStorage *s = ph->storage, *ns;
+    size_t i;
+    for (i = 0; i < s->num_blocks && s->blocks[i].xnum == xnum; i++);
+    if (i >= s->num_blocks || !(ns = alloc_storage(s->capacity))) return;
+    for (i = 0; i < s->num_blocks; i++) {
+        size_t len;
+        const uint8_t *text = storage_read(s, i, &len);
+        if (!text) { PyErr_Clear(); continue; }
+        if (s->blocks[i].xnum == xnum) { storage_append(ns, text, len, xnum); continue; }
+        PagerHistoryBuf t = {.bufsize = 2 * len + 4096, .end = len};
+        if (!(t.buffer = PyMem_RawMalloc(t.bufsize))) continue;
+        memcpy(t.buffer, text, len);
+        pagerhist_rewrap(&t, xnum);
+        storage_append(ns, t.buffer + t.start, (t.bufend ? t.bufend : t.end) - t.start, xnum);
+        if (t.bufend) storage_append(ns, t.buffer, t.end, xnum);
+        PyMem_Free(t.buffer);
+    }
+    free_storage(s);
+    ph->storage = ns;
+}
+
+typedef struct {
+    PyObject *callback;
+    size_t pos, offset, remaining, delivered;
+} TextDelivery;
+
+static inline bool
+deliver_text(TextDelivery *d, const uint8_t *buf, size_t len) {
+    // Deliver the part of buf that is in the requested range, buf is at position d->pos in the history
+    size_t start = d->offset + d->delivered;
+    if (d->remaining && start >= d->pos && start < d->pos + len) {
+        size_t end = start + MIN(d->remaining, d->pos + len - start);
+        // never split a UTF-8 encoded character
+        while (end < d->pos + len && (buf[end - d->pos] & 0xc0) == 0x80) end++;
+        PyObject *t = PyUnicode_DecodeUTF8((const char*)buf + start - d->pos, end - start, "replace");
+        if (t == NULL) return false;
+        PyObject *ret = PyObject_CallFunctionObjArgs(d->callback, t, NULL);
+        Py_DECREF(t);
+        if (ret == NULL) return false;
+        Py_DECREF(ret);
+        d->delivered += end - start; d->remaining -= MIN(d->remaining, end - start);
+    }
+    d->pos += len;
+    return true;
+}
+
 static PyObject *
-pagerhist_as_text(HistoryBuf *self, PyObject *callback) {
+pagerhist_as_text(HistoryBuf *self, PyObject *args) {
+#define pagerhist_as_text_doc "pagerhist_as_text(callback, offset=0, limit=0) -> Call callback with the contents of the pager history. " \
+    "If limit is non-zero, only approximately limit bytes of UTF-8 starting at offset are delivered and the number of bytes " \
+    "delivered is returned, zero means the end of the history has been reached."
     PagerHistoryBuf *ph = self->pagerhist;
-    PyObject *ret = NULL, *t = NULL;
-    Py_UCS4 *buf = NULL;
-    index_type num;
-    if (!ph) Py_RETURN_NONE;
+    PyObject *callback;
+    Py_ssize_t offset = 0, limit = 0;
+    if (!PyArg_ParseTuple(args, "O|nn", &callback, &offset, &limit)) return NULL;
+    if (offset < 0 || limit < 0) { PyErr_SetString(PyExc_ValueError, "offset and limit must not be negative"); return NULL; }
+    if (!ph) { if (limit) return PyLong_FromUnsignedLong(0); Py_RETURN_NONE; }
 
     if (ph->rewrap_needed) pagerhist_rewrap(ph, self->xnum);
-
-#define CALLBACK { \
-        if (t == NULL) goto end; \
-        ret = PyObject_CallFunctionObjArgs(callback, t, NULL); \
-        Py_DECREF(t); \
-        if (ret == NULL) goto end; \
-        Py_DECREF(ret); \
-}
-
-        num = (ph->bufend ? ph->bufend : ph->end) - ph->start;
-        buf = ph->buffer + ph->start;
-        t = PyUnicode_FromKindAndData(PyUnicode_4BYTE_KIND, buf, num);
-        CALLBACK;
-        if (ph->bufend) {
-            num = ph->end; buf = ph->buffer;
-            t = PyUnicode_FromKindAndData(PyUnicode_4BYTE_KIND, buf, num);
-            CALLBACK;
+    if (ph->storage) storage_rewrap(ph, self->xnum);
+
+    // The contents are the blocks in storage, followed by the range [start,
+    // bufend or end) followed, if the buffer has wrapped, by [0, end). offset
+    // and limit refer to positions in this logical sequence.
+    TextDelivery d = {.callback=callback, .offset=offset, .remaining=limit ? (size_t)limit : SIZE_MAX};
+    if (ph->storage) {
+        PagerHistoryStorage *s = ph->storage;
+        for (size_t i = 0; i < s->num_blocks && d.remaining; i++) {
+            size_t len = s->blocks[i].sz;
+            if (d.offset + d.delivered < d.pos + len) {
+                const uint8_t *text = storage_read(s, i, &len);
+                if (!text || !deliver_text(&d, text, len)) return NULL;
+            } else d.pos += len;
         }
+    }
+    if (!deliver_text(&d, ph->buffer + ph->start, (ph->bufend ? ph->bufend : ph->end) - ph->start)) return NULL;
+    if (ph->bufend && !deliver_text(&d, ph->buffer, ph->end)) return NULL;
+    if (!limit || !d.delivered) {
         Line l = {.xnum=self->xnum}; get_line(self, 0, &l);
         if (!l.continued) {
-            t = PyUnicode_FromString("\n");
-            CALLBACK;
+            PyObject *ret = PyObject_CallFunction(callback, "s", "\n");
+            if (ret == NULL) return NULL;
+            Py_DECREF(ret);
         }
-#undef CALLBACK
-end:
-    if (PyErr_Occurred()) return NULL;
+    }
+    if (limit) return PyLong_FromSize_t(d.delivered);
     Py_RETURN_NONE;
 }
 
@@ -390,11 +862,12 @@ static PyObject* rewrap(HistoryBuf *self, PyObject *args);
 static PyMethodDef methods[] = {
     METHOD(line, METH_O)
     METHOD(as_ansi, METH_O)
-    METHODB(pagerhist_as_text, METH_O),
+    METHOD(pagerhist_as_text, METH_VARARGS)
     METHODB(as_text, METH_VARARGS),
     METHOD(dirty_lines, METH_NOARGS)
     METHOD(push, METH_VARARGS)
     METHOD(rewrap, METH_VARARGS)
+    METHOD(search, METH_VARARGS)
     {NULL, NULL, 0, NULL}  /* Sentinel */
 };
 
@@ -402,9 +875,15 @@ static PyMemberDef members[] = {
     {"xnum", T_UINT, offsetof(HistoryBuf, xnum), READONLY, "xnum"},
     {"ynum", T_UINT, offsetof(HistoryBuf, ynum), READONLY, "ynum"},
     {"count", T_UINT, offsetof(HistoryBuf, count), READONLY, "count"},
+    {"lines_added", T_ULONGLONG, offsetof(HistoryBuf, lines_added), READONLY, "The total number of lines ever added to this buffer, the most recently added line has sequence number lines_added - 1"},
     {NULL}  /* Sentinel */
 };
 
+static PyMethodDef module_methods[] = {
+    METHODB(set_pagerhist_storage_dir, METH_VARARGS),
+    {NULL, NULL, 0, NULL}  /* Sentinel */
+};
+
 PyTypeObject HistoryBuf_Type = {
     PyVarObject_HEAD_INIT(NULL, 0)
     .tp_name = "fast_data_types.HistoryBuf",
@@ -431,7 +910,7 @@ HistoryBuf *alloc_historybuf(unsigned int lines, unsigned int columns, unsigned
 
 #define init_src_line(src_y) init_line(src, map_src_index(src_y), src->line);
 
-#define is_src_line_continued(src_y) (map_src_index(src_y) < src->ynum - 1 ? (*attrptr(src, map_src_index(src_y + 1)) & CONTINUED_MASK) : false)
+#define is_src_line_continued(src_y) (src_y + 1 < src->count ? (*attrptr(src, map_src_index(src_y + 1)) & CONTINUED_MASK) : false)
 
 #define next_dest_line(cont) *attrptr(dest, historybuf_push(dest)) = cont & CONTINUED_MASK; dest->line->continued = cont;
 
@@ -439,6 +918,14 @@ HistoryBuf *alloc_historybuf(unsigned int lines, unsigned int columns, unsigned
 
 #include "rewrap.h"
 
+static inline void
+rewrap_search_index(HistoryBuf *self, HistoryBuf *other) {
+    // Keep searched buffers indexed across resizes
+    if (!self->search_index) return;
+    if (!other->search_index) other->search_index = alloc_search_index(other->ynum, other->xnum);
+    search_index_rebuild(other);
+}
+
 void historybuf_rewrap(HistoryBuf *self, HistoryBuf *other) {
     while(other->num_segments < self->num_segments) add_segment(other);
     if (other->xnum == self->xnum && other->ynum == self->ynum) {
@@ -449,6 +936,8 @@ void historybuf_rewrap(HistoryBuf *self, HistoryBuf *other) {
             memcpy(other->segments[i].line_attrs, self->segments[i].line_attrs, SEGMENT_SIZE * sizeof(line_attrs_type));
         }
         other->count = self->count; other->start_of_data = self->start_of_data;
+        other->lines_added = self->lines_added;
+        rewrap_search_index(self, other);
         return;
     }
     if (other->pagerhist && other->xnum != self->xnum && other->pagerhist->end != other->pagerhist->start)
@@ -459,6 +948,9 @@ void historybuf_rewrap(HistoryBuf *self, HistoryBuf *other) {
         rewrap_inner(self, other, self->count, NULL, &x, &y);
         for (index_type i = 0; i < other->count; i++) *attrptr(other, (other->start_of_data + i) % other->ynum) |= TEXT_DIRTY_MASK;
     }
+    // Sequence numbers must never decrease, even if rewrapping reduces the number of lines
+    other->lines_added = self->lines_added + (other->count > self->count ? other->count - self->count : 0);
+    rewrap_search_index(self, other);
 }
 
 static PyObject*
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2019, Kovid Goyal <kovid at kovidgoyal.net>
+
+# Send the command line to an already running instance for
+# kitty --single-instance. This is run by __main__.py before kitty.main is
+# imported, so it must import only what it needs.
+
+import os
+import sys
+
+from .constants import appname, is_macos
+from .utils import single_instance, unix_socket_paths
+
+
+def talk_to_instance(args):
+    import json
+    import socket
+    data = {'cmd': 'new_instance', 'args': tuple(sys.argv),
+            'startup_id': os.environ.get('DESKTOP_STARTUP_ID'),
+            'cwd': os.getcwd()}
+    notify_socket = None
+    if args.wait_for_single_instance_window_close:
+        address = '\0{}-os-window-close-notify-{}-{}'.format(appname, os.getpid(), os.geteuid())
+        notify_socket = socket.socket(family=socket.AF_UNIX)
+        try:
+            notify_socket.bind(address)
+        except FileNotFoundError:
+            for address in unix_socket_paths(address[1:], ext='.sock'):
+                notify_socket.bind(address)
+                break
+        data['notify_on_os_window_death'] = address
+        notify_socket.listen()
+
+    data = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    single_instance.socket.sendall(data)
+    try:
+        single_instance.socket.shutdown(socket.SHUT_RDWR)
+    except EnvironmentError:
+        pass
+    single_instance.socket.close()
+
+    if args.wait_for_single_instance_window_close:
+        conn = notify_socket.accept()[0]
+        conn.recv(1)
+        try:
+            conn.shutdown(socket.SHUT_RDWR)
+        except EnvironmentError:
+            pass
+        conn.close()
+
+
+def forward_to_instance(argv):
+    # Return True if the command line was sent to a running instance.
+    # Otherwise kitty.main has to be run, and if this is the first instance,
+    # single_instance.socket is already listening for the next ones.
+    if is_macos and os.environ.get('KITTY_LAUNCHED_BY_LAUNCH_SERVICES') == '1':
+        return False  # the command line is changed by kitty.main
+    try:
+        if not os.path.isdir(os.getcwd()):
+            return False
+    except Exception:
+        return False
+    from .cli import parse_args
+    args, rest = parse_args(args=argv)
+    if not args.single_instance or args.debug_config or args.replay_commands or getattr(args, 'detach', False):
+        return False
+    if single_instance(args.instance_group):
+        return False
+    talk_to_instance(args)
+    return True
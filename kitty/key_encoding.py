@@ -5,8 +5,6 @@
 import string
 from collections import namedtuple
 
-from . import fast_data_types as defines
-
 # ENCODING {{{
 ENCODING = {
     '0': 'G',
@@ -287,6 +285,7 @@ def symbolic_name(glfw_name):
 def update_encoding():
     import re
     import subprocess
+    from . import fast_data_types as defines
     keys = {a for a in dir(defines) if a.startswith('GLFW_KEY_')}
     ans = ENCODING
     key_map = {}
@@ -1,4 +1,4 @@
-// auto-generated from keys.py, do not edit!
+// auto-generated from gen-key-constants.py, do not edit!
 #pragma once
 #include <stddef.h>
 #include <stdint.h>
@@ -2,6 +2,7 @@
 # vim:fileencoding=utf-8
 # License: GPL v3 Copyright: 2016, Kovid Goyal <kovid at kovidgoyal.net>
 
+from bisect import bisect_right
 from collections import namedtuple
 from functools import partial
 from itertools import islice, repeat
@@ -174,6 +175,8 @@ class Layout:  # {{{
         self.layout_opts = self.parse_layout_opts(layout_opts)
         self.full_name = self.name + ((':' + layout_opts) if layout_opts else '')
         self.remove_all_biases()
+        # The inputs and results of the last call to do_layout()
+        self.last_layout = None
 
     def bias_increment_for_cell(self, is_horizontal):
         self._set_dimensions()
@@ -187,6 +190,11 @@ class Layout:  # {{{
     def remove_all_biases(self):
         return False
 
+    def bias_key(self):
+        # The state of the biases applied to this layout, as a value that can
+        # be compared with a previous one
+        return None
+
     def modify_size_of_window(self, all_windows, window_id, increment, is_horizontal=True):
         idx = idx_for_id(window_id, all_windows)
         if idx is None:
@@ -336,10 +344,21 @@ class Layout:  # {{{
 
     def _set_dimensions(self):
         global central, cell_width, cell_height
-        central, tab_bar, vw, vh, cell_width, cell_height = viewport_for_window(self.os_window_id)
+        ans = viewport_for_window(self.os_window_id)
+        central, tab_bar, vw, vh, cell_width, cell_height = ans
+        return ans
 
     def __call__(self, all_windows, active_window_idx):
-        self._set_dimensions()
+        key = (self._set_dimensions(), tuple((w.id, w.overlay_window_id) for w in all_windows),
+               active_window_idx, self.bias_key())
+        last = self.last_layout
+        if last is not None and last[0] == key and all(
+                w.geometry is g and w.is_visible_in_layout is v and not w.needs_layout
+                for w, (g, v) in zip(all_windows, last[1])):
+            # Nothing has changed since the last layout and the windows have
+            # not been changed by anything else, such as another layout, so
+            # laying them out again would give the same results
+            return last[2]
         active_window = all_windows[active_window_idx]
         overlaid_windows, windows = process_overlaid_windows(all_windows)
         if overlaid_windows:
@@ -353,7 +372,9 @@ class Layout:  # {{{
         self.update_visibility(all_windows, active_window, overlaid_windows)
         self.blank_rects = []
         self.do_layout(windows, active_window_idx)
-        return idx_for_id(active_window.id, all_windows)
+        ans = idx_for_id(active_window.id, all_windows)
+        self.last_layout = key, tuple((w.geometry, w.is_visible_in_layout) for w in all_windows), ans
+        return ans
 
     # Utils {{{
     def layout_single_window(self, w):
@@ -433,6 +454,9 @@ class Tall(Layout):  # {{{
         self.biased_map = {}
         return True
 
+    def bias_key(self):
+        return tuple(self.main_bias), tuple(self.biased_map.items())
+
     def variable_layout(self, num_windows, biased_map):
         num_windows -= 1
         return self.vlayout(num_windows, bias=variable_bias(num_windows, biased_map) if num_windows > 1 else None)
@@ -569,6 +593,9 @@ class Grid(Layout):  # {{{
         self.biased_cols = {}
         return True
 
+    def bias_key(self):
+        return tuple(self.biased_rows.items()), tuple(self.biased_cols.items())
+
     def variable_layout(self, layout_func, num_windows, biased_map):
         return layout_func(num_windows, bias=variable_bias(num_windows, biased_map) if num_windows > 1 else None)
 
@@ -651,9 +678,9 @@ class Grid(Layout):  # {{{
         if n == 1:
             return self.layout_single_window(windows[0])
         ncols, nrows, special_rows, special_col = self.calc_grid_size(n)
-        layout_data = n, ncols, nrows, special_rows, special_col
+        topology = GridTopology(tuple(w.id for w in windows), ncols, nrows, special_rows, special_col)
         for w in windows:
-            w.layout_data = layout_data
+            w.layout_data = topology
 
         win_col_map = []
 
@@ -675,95 +702,93 @@ class Grid(Layout):  # {{{
         for i in range(ncols - 1):
             self.between_blank_rect(win_col_map[i][0], win_col_map[i + 1][0])
 
-    def minimal_borders(self, windows, active_window, needs_borders_map):
-        try:
-            n, ncols, nrows, special_rows, special_col = windows[0].layout_data
-        except Exception:
-            n = -1
-        if n != len(windows):
+    def topology_for(self, windows):
+        topology = getattr(windows[0], 'layout_data', None) if windows else None
+        if not isinstance(topology, GridTopology) or topology.ids != tuple(w.id for w in windows):
             # Something bad happened
+            return None
+        return topology
+
+    def minimal_borders(self, windows, active_window, needs_borders_map):
+        topology = self.topology_for(windows)
+        if topology is None:
             yield from Layout.minimal_borders(self, windows, active_window, needs_borders_map)
             return
-        blank_row = [None for i in range(ncols)]
-        matrix = tuple(blank_row[:] for j in range(max(nrows, special_rows)))
-        wi = iter(windows)
-        pos_map = {}
-        col_counts = []
-        for col in range(ncols):
-            rows = special_rows if col == special_col else nrows
-            for row in range(rows):
-                matrix[row][col] = wid = next(wi).id
-                pos_map[wid] = row, col
-            col_counts.append(rows)
-
-        for w in windows:
-            wid = w.id
-            if needs_borders_map[wid]:
+        ids = topology.ids
+        for w, (right, bottom, next_col_has_different_count) in zip(windows, topology.border_neighbors):
+            if needs_borders_map[w.id]:
                 yield all_borders
                 continue
-            row, col = pos_map[wid]
-            if col + 1 < ncols:
-                next_col_has_different_count = col_counts[col + 1] != col_counts[col]
-                right_neighbor_id = matrix[row][col+1]
-            else:
-                right_neighbor_id = None
-                next_col_has_different_count = False
-            try:
-                bottom_neighbor_id = matrix[row+1][col]
-            except IndexError:
-                bottom_neighbor_id = None
             yield (
                 False, False,
-                (right_neighbor_id is not None and not needs_borders_map[right_neighbor_id]) or next_col_has_different_count,
-                bottom_neighbor_id is not None and not needs_borders_map[bottom_neighbor_id]
+                (right is not None and not needs_borders_map[ids[right]]) or next_col_has_different_count,
+                bottom is not None and not needs_borders_map[ids[bottom]]
             )
 
     def neighbors_for_window(self, window, windows):
         n = len(windows)
         if n < 4:
             return Tall.neighbors_for_window(self, window, windows)
-        try:
-            n, ncols, nrows, special_rows, special_col = windows[0].layout_data
-        except Exception:
-            n = -1
-        if n != len(windows):
-            # Something bad happened
+        topology = self.topology_for(windows)
+        if topology is None:
             return Layout.neighbors_for_window(self, window, windows)
-
-        blank_row = [None for i in range(ncols)]
-        matrix = tuple(blank_row[:] for j in range(max(nrows, special_rows)))
-        wi = iter(windows)
-        pos_map = {}
-        col_counts = []
-        id_map = {}
-        for col in range(ncols):
-            rows = special_rows if col == special_col else nrows
-            for row in range(rows):
-                w = next(wi)
-                matrix[row][col] = wid = w.id
-                pos_map[wid] = row, col
-                id_map[wid] = w
-            col_counts.append(rows)
-        row, col = pos_map[window.id]
-
-        def neighbors(row, col):
-            try:
-                ans = matrix[row][col]
-            except IndexError:
-                ans = None
-            return [] if ans is None else [id_map[ans]]
-
-        def side(row, col, delta):
+        neighbors = topology.neighbors(topology.ids.index(window.id))
+        return {k: [windows[i] for i in v] for k, v in neighbors.items()}
+
+
+class GridTopology:
+
+    ''' The position of every window in a grid and the indices of its
+    neighbors, computed at most once per layout '''
+
+    def __init__(self, ids, ncols, nrows, special_rows, special_col):
+        self.ids = ids
+        self.ncols = ncols
+        self.col_counts = [special_rows if col == special_col else nrows for col in range(ncols)]
+        self.col_starts = [0] * ncols
+        for col in range(1, ncols):
+            self.col_starts[col] = self.col_starts[col - 1] + self.col_counts[col - 1]
+        self._border_neighbors = None
+
+    def idx_at(self, row, col):
+        if 0 <= col < self.ncols and 0 <= row < self.col_counts[col]:
+            return self.col_starts[col] + row
+
+    def position(self, idx):
+        col = bisect_right(self.col_starts, idx) - 1
+        return idx - self.col_starts[col], col
+
+    @property
+    def border_neighbors(self):
+        # For every window, in order: the index of its right neighbor, of its
+        # bottom neighbor and whether the next column has a different number
+        # of rows
+        if self._border_neighbors is None:
+            ans = []
+            idx_at, col_counts = self.idx_at, self.col_counts
+            for col in range(self.ncols):
+                next_col_has_different_count = col + 1 < self.ncols and col_counts[col + 1] != col_counts[col]
+                for row in range(col_counts[col]):
+                    ans.append((idx_at(row, col + 1), idx_at(row + 1, col), next_col_has_different_count))
+            self._border_neighbors = ans
+        return self._border_neighbors
+
+    def neighbors(self, idx):
+        row, col = self.position(idx)
+        col_counts = self.col_counts
+
+        def as_list(idx):
+            return [] if idx is None else [idx]
+
+        def side(delta):
             neighbor_col = col + delta
-            if col_counts[neighbor_col] == col_counts[col]:
-                return neighbors(row, neighbor_col)
-            return neighbors(min(row, col_counts[neighbor_col] - 1), neighbor_col)
+            return as_list(self.idx_at(min(row, col_counts[neighbor_col] - 1), neighbor_col))
 
         return {
-            'top': neighbors(row-1, col) if row else [],
-            'bottom': neighbors(row + 1, col),
-            'left': side(row, col, -1) if col else [],
-            'right': side(row, col, 1) if col < ncols - 1 else [],
+            'top': as_list(self.idx_at(row - 1, col)),
+            'bottom': as_list(self.idx_at(row + 1, col)),
+            'left': side(-1) if col else [],
+            'right': side(1) if col < self.ncols - 1 else [],
         }
 
 
@@ -784,6 +809,9 @@ class Vertical(Layout):  # {{{
         self.biased_map = {}
         return True
 
+    def bias_key(self):
+        return tuple(self.biased_map.items())
+
     def apply_bias(self, idx, increment, num_windows, is_horizontal):
         if self.main_is_horizontal != is_horizontal:
             return False
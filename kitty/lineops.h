@@ -93,7 +93,8 @@ void historybuf_clear(HistoryBuf *self);
 #define as_text_generic(args, container, get_line, lines, columns) { \
     PyObject *callback; \
     int as_ansi = 0, insert_wrap_markers = 0; \
-    if (!PyArg_ParseTuple(args, "O|pp", &callback, &as_ansi, &insert_wrap_markers)) return NULL; \
+    unsigned int start_line = 0, num_lines = UINT_MAX; \
+    if (!PyArg_ParseTuple(args, "O|ppII", &callback, &as_ansi, &insert_wrap_markers, &start_line, &num_lines)) return NULL; \
     PyObject *ret = NULL, *t = NULL; \
     Py_UCS4 *buf = NULL; \
     PyObject *nl = PyUnicode_FromString("\n"); \
@@ -103,7 +104,7 @@ void historybuf_clear(HistoryBuf *self);
         buf = malloc(sizeof(Py_UCS4) * columns * 100); \
         if (buf == NULL) { PyErr_NoMemory(); goto end; } \
     } \
-    for (index_type y = 0; y < lines; y++) { \
+    for (index_type y = start_line; y < lines && y - start_line < num_lines; y++) { \
         Line *line = get_line(container, y); \
         if (!line->continued && y > 0) { \
             ret = PyObject_CallFunctionObjArgs(callback, nl, NULL); \
@@ -9,23 +9,24 @@ from contextlib import contextmanager
 
 from .borders import load_borders_program
 from .boss import Boss
-from .child import set_default_env
+from .child import default_env, set_default_env
 from .cli import create_opts, parse_args
 from .config import cached_values_for, initial_window_size_func
 from .constants import (
-    appname, beam_cursor_data_file, config_dir, glfw_path, is_macos,
+    appname, beam_cursor_data_file, cache_dir, config_dir, glfw_path, is_macos,
     is_wayland, kitty_exe, logo_data_file
 )
 from .fast_data_types import (
     GLFW_IBEAM_CURSOR, GLFW_MOD_SUPER, create_os_window, free_font_data,
     glfw_init, glfw_terminate, load_png_data, set_custom_cursor,
-    set_default_window_icon, set_options
+    set_default_window_icon, set_options, set_pagerhist_storage_dir
 )
 from .fonts.box_drawing import set_scale
 from .fonts.render import set_font_family
+from .instance import talk_to_instance
+from .startup_profile import phase_done, stop as stop_startup_profile
 from .utils import (
-    detach, log_error, single_instance, startup_notification_handler,
-    unix_socket_paths
+    detach, log_error, single_instance, startup_notification_handler
 )
 from .window import load_shader_programs
 
@@ -45,43 +46,6 @@ def set_custom_ibeam_cursor():
         log_error('Failed to set custom beam cursor with error: {}'.format(e))
 
 
-def talk_to_instance(args):
-    import json
-    import socket
-    data = {'cmd': 'new_instance', 'args': tuple(sys.argv),
-            'startup_id': os.environ.get('DESKTOP_STARTUP_ID'),
-            'cwd': os.getcwd()}
-    notify_socket = None
-    if args.wait_for_single_instance_window_close:
-        address = '\0{}-os-window-close-notify-{}-{}'.format(appname, os.getpid(), os.geteuid())
-        notify_socket = socket.socket(family=socket.AF_UNIX)
-        try:
-            notify_socket.bind(address)
-        except FileNotFoundError:
-            for address in unix_socket_paths(address[1:], ext='.sock'):
-                notify_socket.bind(address)
-                break
-        data['notify_on_os_window_death'] = address
-        notify_socket.listen()
-
-    data = json.dumps(data, ensure_ascii=False).encode('utf-8')
-    single_instance.socket.sendall(data)
-    try:
-        single_instance.socket.shutdown(socket.SHUT_RDWR)
-    except EnvironmentError:
-        pass
-    single_instance.socket.close()
-
-    if args.wait_for_single_instance_window_close:
-        conn = notify_socket.accept()[0]
-        conn.recv(1)
-        try:
-            conn.shutdown(socket.SHUT_RDWR)
-        except EnvironmentError:
-            pass
-        conn.close()
-
-
 def load_all_shaders(semi_transparent=0):
     load_shader_programs(semi_transparent, load_all_shaders.cursor_text_color)
     load_borders_program()
@@ -133,8 +97,10 @@ def _run_app(opts, args):
                     pre_show_callback,
                     appname, args.name or args.cls or appname,
                     args.cls or appname, load_all_shaders)
+        phase_done('OS window and OpenGL init')
         boss = Boss(window_id, opts, args, cached_values, new_os_window_trigger)
         boss.start()
+        phase_done('windows')
         try:
             boss.child_monitor.main_loop()
         finally:
@@ -144,7 +110,10 @@ def _run_app(opts, args):
 def run_app(opts, args):
     set_scale(opts.box_drawing_scale)
     set_options(opts, is_wayland, args.debug_gl, args.debug_font_fallback)
+    if opts.scrollback_pager_history_on_disk and opts.scrollback_pager_history_size:
+        set_pagerhist_storage_dir(cache_dir())
     set_font_family(opts, debug_font_matching=args.debug_font_fallback)
+    phase_done('fonts')
     try:
         _run_app(opts, args)
     finally:
@@ -210,6 +179,11 @@ def setup_environment(opts, args):
     if args.listen_on:
         os.environ['KITTY_LISTEN_ON'] = args.listen_on
     set_default_env(extra_env)
+    if opts.spawn_helper and not opts.close_on_child_death:
+        # Fork the helper before the fonts, OpenGL context and windows are
+        # created, so that it stays small
+        from .spawn_helper import start_spawn_helper
+        start_spawn_helper(default_env())
 
 
 def _main():
@@ -249,6 +223,9 @@ def _main():
         os.chdir(os.path.expanduser('~'))
     args, rest = parse_args(args=args)
     args.args = rest
+    if not args.startup_profile:
+        stop_startup_profile()
+    phase_done('command line')
     if args.debug_config:
         init_glfw(args.debug_keyboard)  # needed for parsing native keysyms
         create_opts(args, debug_config=True)
@@ -259,14 +236,18 @@ def _main():
         from kitty.client import main
         main(args.replay_commands)
         return
-    if args.single_instance:
+    # The socket is already listening if __main__.py found no running instance
+    if args.single_instance and getattr(single_instance, 'socket', None) is None:
         is_first = single_instance(args.instance_group)
         if not is_first:
             talk_to_instance(args)
             return
     init_glfw(args.debug_keyboard)  # needed for parsing native keysyms
+    phase_done('glfw init')
     opts = create_opts(args)
+    phase_done('config')
     setup_environment(opts, args)
+    phase_done('environment')
     try:
         with setup_profiling(args):
             # Avoid needing to launch threads to reap zombies
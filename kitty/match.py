@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2019, Kovid Goyal <kovid at kovidgoyal.net>
+
+# Compile match expressions, such as those used with kitty @ --match, into
+# predicates for windows and tabs. Expressions are field:regexp terms,
+# optionally combined with and, or, not and parentheses, for example:
+#   title:vim and not (cwd:/tmp or env:DEBUG=1)
+# Values containing spaces can be quoted: title:"some title" or id:1
+# A lone field:regexp term is used as is, quotes and all, as it always was.
+
+import re
+from functools import lru_cache
+
+numeric_fields = frozenset({'id', 'pid', 'num'})
+term_pat = re.compile(r'(\w+):("(?:[^"\\]|\\.)*"|\S*)')
+word_pat = re.compile(r'[^\s()]+')
+
+
+class MatchSyntaxError(ValueError):
+    pass
+
+
+@lru_cache(maxsize=128)
+def compile_match_pattern(exp):
+    return re.compile(exp)
+
+
+def unique(windows):
+    seen = set()
+    for w in windows:
+        if w is not None and w.id not in seen and not getattr(w, 'destroyed', False):
+            seen.add(w.id)
+            yield w
+
+
+class Term:
+
+    def __init__(self, field, exp):
+        self.field = field
+        self.num = self.pat = None
+        if field in numeric_fields:
+            try:
+                self.num = int(exp)
+            except ValueError:
+                pass
+        elif field == 'env':
+            kp, vp = exp.partition('=')[::2]
+            self.pat = compile_match_pattern(kp), (compile_match_pattern(vp) if vp else None)
+        else:
+            self.pat = compile_match_pattern(exp)
+
+    def nth_window(self, boss):
+        tab = boss.active_tab
+        if tab is not None:
+            try:
+                return tab.get_nth_window(self.num)
+            except Exception:
+                pass
+
+    def window_candidates(self, boss):
+        if self.field in numeric_fields:
+            if self.num is None:
+                return ()
+            if self.field == 'id':
+                return boss.window_id_map.get(self.num),
+            if self.field == 'pid':
+                w = boss.window_pid_map.get(self.num)
+                return (w,) if w is not None and w.id in boss.window_id_map else ()
+            return self.nth_window(boss),
+
+    def tab_candidates(self, boss):
+        if self.field == 'id':
+            return () if self.num is None else (boss.tab_id_map.get(self.num),)
+
+    def matches_window(self, window, boss):
+        if self.field in numeric_fields:
+            if self.num is None:
+                return False
+            if self.field == 'id':
+                return window.id == self.num
+            if self.field == 'pid':
+                return window.child.pid == self.num
+            return self.nth_window(boss) is window
+        return window.matches(self.field, self.pat)
+
+    def matches_tab(self, tab, boss):
+        if self.field == 'id':
+            return tab.id == self.num
+        if self.field == 'title':
+            return tab.matches(self.field, self.pat)
+        return any(self.matches_window(w, boss) for w in tab)
+
+
+class Not:
+
+    def __init__(self, child):
+        self.child = child
+
+    def window_candidates(self, boss):
+        pass
+
+    def tab_candidates(self, boss):
+        pass
+
+    def matches_window(self, window, boss):
+        return not self.child.matches_window(window, boss)
+
+    def matches_tab(self, tab, boss):
+        return not self.child.matches_tab(tab, boss)
+
+
+class And:
+
+    def __init__(self, children):
+        self.children = children
+
+    def window_candidates(self, boss):
+        # Any indexed term limits the windows that can match
+        for c in self.children:
+            ans = c.window_candidates(boss)
+            if ans is not None:
+                return ans
+
+    def tab_candidates(self, boss):
+        for c in self.children:
+            ans = c.tab_candidates(boss)
+            if ans is not None:
+                return ans
+
+    def matches_window(self, window, boss):
+        return all(c.matches_window(window, boss) for c in self.children)
+
+    def matches_tab(self, tab, boss):
+        return all(c.matches_tab(tab, boss) for c in self.children)
+
+
+class Or:
+
+    def __init__(self, children):
+        self.children = children
+
+    def window_candidates(self, boss):
+        ans = []
+        for c in self.children:
+            q = c.window_candidates(boss)
+            if q is None:
+                return
+            ans.extend(q)
+        return ans
+
+    def tab_candidates(self, boss):
+        ans = []
+        for c in self.children:
+            q = c.tab_candidates(boss)
+            if q is None:
+                return
+            ans.extend(q)
+        return ans
+
+    def matches_window(self, window, boss):
+        return any(c.matches_window(window, boss) for c in self.children)
+
+    def matches_tab(self, tab, boss):
+        return any(c.matches_tab(tab, boss) for c in self.children)
+
+
+def tokenize(text):
+    pos, limit = 0, len(text)
+    while pos < limit:
+        ch = text[pos]
+        if ch.isspace():
+            pos += 1
+            continue
+        if ch in '()':
+            yield ch
+            pos += 1
+            continue
+        m = term_pat.match(text, pos)
+        if m is not None:
+            field, val = m.groups()
+            pos = m.end()
+            if val.startswith('"') and len(val) > 1 and val.endswith('"'):
+                val = val[1:-1].replace('\\"', '"')
+            else:
+                # Unbalanced closing parentheses at the end of the value
+                # close a group instead of being part of the regexp
+                extra = val.count(')') - val.count('(')
+                while extra > 0 and val.endswith(')'):
+                    val, pos, extra = val[:-1], pos - 1, extra - 1
+            yield field, val
+            continue
+        m = word_pat.match(text, pos)
+        word = m.group()
+        if word not in ('and', 'or', 'not'):
+            raise MatchSyntaxError('Unexpected text in match expression: {}'.format(word))
+        yield word
+        pos = m.end()
+
+
+class Parser:
+
+    def __init__(self, text):
+        self.tokens = tuple(tokenize(text))
+        self.pos = 0
+
+    def peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+
+    def take(self):
+        ans = self.peek()
+        if ans is None:
+            raise MatchSyntaxError('Incomplete match expression')
+        self.pos += 1
+        return ans
+
+    def parse(self):
+        ans = self.or_expr()
+        if self.peek() is not None:
+            raise MatchSyntaxError('Unexpected {} in match expression'.format(self.peek()))
+        return ans
+
+    def or_expr(self):
+        children = [self.and_expr()]
+        while self.peek() == 'or':
+            self.take()
+            children.append(self.and_expr())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def and_expr(self):
+        children = [self.unary()]
+        while self.peek() == 'and':
+            self.take()
+            children.append(self.unary())
+        return children[0] if len(children) == 1 else And(children)
+
+    def unary(self):
+        tok = self.take()
+        if tok == 'not':
+            return Not(self.unary())
+        if tok == '(':
+            ans = self.or_expr()
+            if self.take() != ')':
+                raise MatchSyntaxError('Unbalanced parentheses in match expression')
+            return ans
+        if isinstance(tok, tuple):
+            return Term(*tok)
+        raise MatchSyntaxError('Unexpected {} in match expression'.format(tok))
+
+
+@lru_cache(maxsize=256)
+def compile_match(expression):
+    try:
+        parser = Parser(expression)
+        if len(parser.tokens) != 1:
+            return parser.parse()
+    except (MatchSyntaxError, re.error):
+        pass
+    # Previous versions of kitty used everything after the colon as the
+    # regexp, which can contain spaces, quotes or other text that is not a
+    # valid expression, so a lone term or anything that cannot be parsed is
+    # treated that way. None means that nothing can match.
+    field, sep, exp = expression.partition(':')
+    if sep:
+        return Term(field, exp)
+
+
+def match_windows(boss, expression):
+    expr = compile_match(expression)
+    if expr is None:
+        return
+    candidates = expr.window_candidates(boss)
+    for window in (boss.all_windows if candidates is None else unique(candidates)):
+        if expr.matches_window(window, boss):
+            yield window
+
+
+def match_tabs(boss, expression):
+    expr = compile_match(expression)
+    if expr is None:
+        return
+    candidates = expr.tab_candidates(boss)
+    found = False
+    for tab in (boss.all_tabs if candidates is None else unique(candidates)):
+        if expr.matches_tab(tab, boss):
+            yield tab
+            found = True
+    if not found:
+        # Use the tabs of the matching windows
+        seen = set()
+        for window in match_windows(boss, expression):
+            tab = boss.tab_for_window(window)
+            if tab is not None and tab.id not in seen:
+                seen.add(tab.id)
+                yield tab
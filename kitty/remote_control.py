@@ -7,17 +7,19 @@ import os
 import re
 import sys
 import types
+from collections import deque
 from functools import partial
+from itertools import count
 
 from .cli import emph, parse_args
 from .cmds import cmap, parse_subcommand_cli
 from .constants import appname, version
-from .fast_data_types import read_command_response
 from .utils import TTYIO, parse_address_spec
 
 
 def handle_cmd(boss, window, cmd):
-    cmd = json.loads(cmd)
+    if isinstance(cmd, str):
+        cmd = json.loads(cmd)
     v = cmd['version']
     no_response = cmd['no_response']
     if tuple(v)[:2] > version[:2]:
@@ -100,6 +102,7 @@ class SocketIO:
 class RCIO(TTYIO):
 
     def recv(self, timeout):
+        from .fast_data_types import read_command_response
         ans = []
         read_command_response(self.tty_fd, timeout, ans)
         return b''.join(ans)
@@ -144,14 +147,7 @@ def parse_rc_args(args):
     return parse_args(args[1:], global_options_spec, 'command ...', msg, '{} @'.format(appname))
 
 
-def main(args):
-    global_opts, items = parse_rc_args(args)
-    global_opts.no_command_response = None
-
-    if not items:
-        from kitty.shell import main
-        main(global_opts)
-        return
+def create_request(global_opts, items):
     cmd = items[0]
     try:
         func = cmap[cmd]
@@ -171,8 +167,176 @@ def main(args):
     else:
         no_response = func.no_response
     send['no_response'] = no_response
+    return func, send
+
+
+class RemoteControlConnection:
+
+    '''
+    A persistent connection to a kitty instance started with :option:`kitty
+    --listen-on`. Any number of commands can be sent over the connection
+    without waiting for the responses to earlier ones, responses are matched
+    to their requests by id. Commands are specified exactly as on the
+    command line of kitty @, for example::
+
+        from kitty.remote_control import RemoteControlConnection
+
+        with RemoteControlConnection('unix:/tmp/mykitty') as conn:
+            ids = [conn.submit('set-window-title', '--match', 'id:%d' % i, 'x') for i in (1, 2, 3)]
+            responses = [conn.wait(i) for i in ids]
+            print(conn('ls')['data'])
+    '''
+
+    pipe_prefix = b'\x1bP@kitty-pipe'
+
+    def __init__(self, to=None, timeout=10):
+        to = to or os.environ.get('KITTY_LISTEN_ON')
+        if not to:
+            raise ValueError('No address to connect to specified and KITTY_LISTEN_ON is not set')
+        self.family, self.address = parse_address_spec(to)[:2]
+        self.timeout = timeout
+        self.socket = None
+        self.request_ids = count(1)
+        self.responses = {}
+        self.read_buf = b''
+        self.frame_pat = re.compile(re.escape(self.pipe_prefix) + br'([^\x1b]*)\x1b\\')
+
+    def connect(self):
+        import socket
+        if self.socket is None:
+            self.socket = socket.socket(self.family)
+            self.socket.setblocking(True)
+            self.socket.connect(self.address)
+        return self
+
+    def close(self):
+        import socket
+        if self.socket is not None:
+            try:
+                self.socket.shutdown(socket.SHUT_RDWR)
+            except EnvironmentError:
+                pass
+            self.socket.close()
+            self.socket = None
+
+    __enter__ = connect
+
+    def __exit__(self, *a):
+        self.close()
+
+    def send_request(self, send):
+        ''' Send an already created request dict, returning its id '''
+        self.connect()
+        send['id'] = request_id = next(self.request_ids)
+        self.socket.sendall(self.pipe_prefix + json.dumps(send).encode('ascii') + b'\x1b\\')
+        return request_id
+
+    def submit(self, cmd, *args):
+        '''
+        Send the specified command, returning the id of the request. Returns
+        None for commands that have no response, such as send-text.
+        '''
+        global_opts = types.SimpleNamespace(to=None, no_command_response=None)
+        func, send = create_request(global_opts, (cmd,) + args)
+        payload = send.get('payload')
+        request_id = None
+        if isinstance(payload, types.GeneratorType):
+            for chunk in payload:
+                request_id = self.send_request(dict(send, payload=chunk))
+        else:
+            request_id = self.send_request(send)
+        if not send['no_response']:
+            return request_id
+
+    def read_frame(self, request_id, timeout=None):
+        '''
+        Wait for and return the next response frame for the request with the
+        specified id. Streamed responses consist of many frames, see
+        :meth:`iter_stream`.
+        '''
+        import socket
+        self.socket.settimeout(self.timeout if timeout is None else timeout)
+        while not self.responses.get(request_id):
+            try:
+                data = self.socket.recv(65536)
+            except socket.timeout as err:
+                raise TimeoutError('Timed out while waiting to read cmd response') from err
+            if not data:
+                raise ConnectionError('kitty closed the connection')
+            self.read_buf += data
+            pos = 0
+            for m in self.frame_pat.finditer(self.read_buf):
+                response = json.loads(m.group(1).decode('ascii'))
+                self.responses.setdefault(response.pop('id', None), deque()).append(response)
+                pos = m.end()
+            self.read_buf = self.read_buf[pos:]
+        frames = self.responses[request_id]
+        ans = frames.popleft()
+        if not frames:
+            del self.responses[request_id]
+        return ans
+
+    def iter_stream(self, request_id, timeout=None):
+        '''
+        Iterate over the frames of a streamed response, such as the one
+        produced by get-text --stream. The last frame yielded is the one
+        without the stream key, it has no data unless it is an error.
+        '''
+        while True:
+            response = self.read_frame(request_id, timeout)
+            yield response
+            if not response.get('stream'):
+                break
+
+    def wait(self, request_id, timeout=None):
+        ''' Wait for and return the response to the request with the specified id '''
+        response = self.read_frame(request_id, timeout)
+        if response.get('stream'):
+            # join streamed responses into a single one
+            data = [response['data']]
+            for response in self.iter_stream(request_id, timeout):
+                if response.get('stream'):
+                    data.append(response['data'])
+            if response.get('ok'):
+                response['data'] = ''.join(data)
+        return response
+
+    def __call__(self, cmd, *args):
+        request_id = self.submit(cmd, *args)
+        if request_id is None:
+            return {'ok': True}
+        return self.wait(request_id)
+
+
+def stream_response(global_opts, send):
+    with RemoteControlConnection(global_opts.to) as conn:
+        request_id = conn.send_request(send)
+        for response in conn.iter_stream(request_id):
+            if not response.get('ok'):
+                if response.get('tb'):
+                    print(response['tb'], file=sys.stderr)
+                raise SystemExit(response['error'])
+            data = response.get('data')
+            if data:
+                sys.stdout.write(data)
+    sys.stdout.write('\n')
+    sys.stdout.flush()
+
+
+def main(args):
+    global_opts, items = parse_rc_args(args)
+    global_opts.no_command_response = None
+
+    if not items:
+        from kitty.shell import main
+        main(global_opts)
+        return
+    func, send = create_request(global_opts, items)
+    no_response = send['no_response']
     if not global_opts.to and 'KITTY_LISTEN_ON' in os.environ:
         global_opts.to = os.environ['KITTY_LISTEN_ON']
+    if isinstance(send.get('payload'), dict) and send['payload'].get('stream'):
+        return stream_response(global_opts, send)
     response = do_io(global_opts.to, send, no_response)
     if no_response:
         return
@@ -20,7 +20,8 @@
 #endif
 
 #ifndef first_dest_line
-#define first_dest_line init_dest_line(0)
+// The first line can continue a line in the history
+#define first_dest_line dest->line_attrs[0] = src->line_attrs[0] & CONTINUED_MASK; init_dest_line(0)
 #endif
 
 #ifndef next_dest_line
@@ -127,6 +127,57 @@ new(PyTypeObject *type, PyObject *args, PyObject UNUSED *kwds) {
 
 static void deactivate_overlay_line(Screen *self);
 static inline Line* range_line_(Screen *self, int y);
+static inline void uncounted_linefeed(Screen *self);
+
+// Numbering of complete lines {{{
+
+#define LINE_START_UNKNOWN INT_MAX
+
+static inline Line*
+main_range_line(Screen *self, int y) {
+    // Same as range_line_() but always for the main screen
+    if (y < 0) {
+        historybuf_init_line(self->historybuf, -(y + 1), self->historybuf->line);
+        return self->historybuf->line;
+    }
+    linebuf_init_line(self->main_linebuf, y);
+    return self->main_linebuf->line;
+}
+
+static inline void
+forget_completed_lines(Screen *self) {
+    // The rows above the current line no longer hold the most recently
+    // completed lines, so they cannot be numbered until the next linefeed
+    self->lines_contiguous = 0;
+    self->line_start = LINE_START_UNKNOWN;
+}
+
+static inline unsigned int
+line_starts_between(Screen *self, int top, int bottom) {
+    // The number of lines that start in the rows top < y <= bottom
+    unsigned int ans = 0;
+    for (int y = top + 1; y <= bottom; y++) {
+        if (!main_range_line(self, y)->continued) ans++;
+    }
+    return ans;
+}
+
+static inline int
+start_of_line(Screen *self, int y) {
+    // The row at which the line containing row y starts
+    int top = -(int)self->historybuf->count;
+    while (y > top && main_range_line(self, y)->continued) y--;
+    return y;
+}
+
+static inline void
+main_lines_scrolled_up(Screen *self, unsigned int top, unsigned int bottom) {
+    if (top || bottom != self->lines - 1) forget_completed_lines(self);
+    // Rows more than one past the top of the history are never looked at
+    else if (self->line_start != LINE_START_UNKNOWN && self->line_start >= -(int)self->historybuf->ynum) self->line_start--;
+}
+
+// }}}
 
 void
 screen_reset(Screen *self) {
@@ -134,6 +185,7 @@ screen_reset(Screen *self) {
     if (self->overlay_line.is_active) deactivate_overlay_line(self);
     linebuf_clear(self->linebuf, BLANK_CHAR);
     historybuf_clear(self->historybuf);
+    self->lines_contiguous = 0; self->line_start = 0;
     grman_clear(self->grman, false, self->cell_size);
     self->modes = empty_modes;
 #define R(name) self->color_profile->overridden.name = 0
@@ -197,6 +249,11 @@ screen_resize(Screen *self, unsigned int lines, unsigned int columns) {
     // Resize overlay line
     if (!init_overlay_line(self, columns)) return false;
 
+    // The lines completed before the current line are still directly above
+    // it after rewrapping, if the cursor is in that line
+    unsigned int cursor_y_before = self->cursor->y;
+    bool track_lines = is_main && self->line_start != LINE_START_UNKNOWN && (int)cursor_y_before >= self->line_start && !line_starts_between(self, self->line_start, cursor_y_before);
+
     // Resize main linebuf
     HistoryBuf *nh = realloc_hb(self->historybuf, self->historybuf->ynum, columns);
     if (nh == NULL) return false;
@@ -206,6 +263,7 @@ screen_resize(Screen *self, unsigned int lines, unsigned int columns) {
     if (n == NULL) return false;
     Py_CLEAR(self->main_linebuf); self->main_linebuf = n;
     if (is_main) setup_cursor();
+    index_type main_content_lines = num_content_lines_before;
     grman_resize(self->main_grman, self->lines, lines, self->columns, columns);
 
     // Resize alt linebuf
@@ -240,6 +298,10 @@ screen_resize(Screen *self, unsigned int lines, unsigned int columns) {
         self->cursor->y = num_content_lines;
         if (self->cursor->y >= self->lines) { self->cursor->y = self->lines - 1; screen_index(self); }
     }
+    // Empty lines between the content and the cursor are not kept
+    if (main_content_lines ? cursor_is_beyond_content && cursor_y_before > main_content_lines : self->cursor->y != cursor_y_before) track_lines = false;
+    if (track_lines) self->line_start = start_of_line(self, self->cursor->y);
+    else forget_completed_lines(self);
     return true;
 }
 
@@ -318,7 +380,7 @@ move_widened_char(Screen *self, CPUCell* cpu_cell, GPUCell *gpu_cell, index_type
 
     if (self->modes.mDECAWM) {  // overflow goes onto next line
         screen_carriage_return(self);
-        screen_linefeed(self);
+        uncounted_linefeed(self);
         self->linebuf->line_attrs[self->cursor->y] |= CONTINUED_MASK;
         linebuf_init_line(self->linebuf, self->cursor->y);
         dest_cpu = self->linebuf->line->cpu_cells;
@@ -392,7 +454,7 @@ screen_draw(Screen *self, uint32_t och) {
     if (UNLIKELY(self->columns - self->cursor->x < (unsigned int)char_width)) {
         if (self->modes.mDECAWM) {
             screen_carriage_return(self);
-            screen_linefeed(self);
+            uncounted_linefeed(self);
             self->linebuf->line_attrs[self->cursor->y] |= CONTINUED_MASK;
         } else {
             self->cursor->x = self->columns - char_width;
@@ -450,6 +512,7 @@ screen_align(Screen *self) {
     self->margin_top = 0; self->margin_bottom = self->lines - 1;
     screen_cursor_position(self, 1, 1);
     linebuf_clear(self->linebuf, 'E');
+    if (self->linebuf == self->main_linebuf) forget_completed_lines(self);
 }
 
 // }}}
@@ -466,6 +529,7 @@ screen_alignment_display(Screen *self) {
         line_clear_text(self->linebuf->line, 0, self->linebuf->xnum, 'E');
         linebuf_mark_line_dirty(self->linebuf, y);
     }
+    if (self->linebuf == self->main_linebuf) forget_completed_lines(self);
 }
 
 void
@@ -845,6 +909,7 @@ index_selection(Screen *self, Selection *s, bool up) {
         historybuf_add_line(self->historybuf, self->linebuf->line); \
         self->history_line_added_count++; \
     } \
+    if (self->linebuf == self->main_linebuf) main_lines_scrolled_up(self, top, bottom); \
     linebuf_clear_line(self->linebuf, bottom); \
     self->is_dirty = true; \
     index_selection(self, &self->selection, true);
@@ -872,6 +937,7 @@ screen_scroll(Screen *self, unsigned int count) {
     if (self->overlay_line.is_active) deactivate_overlay_line(self); \
     linebuf_reverse_index(self->linebuf, top, bottom); \
     linebuf_clear_line(self->linebuf, top); \
+    if (self->linebuf == self->main_linebuf) forget_completed_lines(self); \
     INDEX_GRAPHICS(1) \
     self->is_dirty = true; \
     index_selection(self, &self->selection, false);
@@ -904,14 +970,31 @@ screen_carriage_return(Screen *self) {
     }
 }
 
-void
-screen_linefeed(Screen *self) {
+static inline void
+uncounted_linefeed(Screen *self) {
     bool in_margins = cursor_within_margins(self);
     screen_index(self);
     if (self->modes.mLNM) screen_carriage_return(self);
     screen_ensure_bounds(self, false, in_margins);
 }
 
+void
+screen_linefeed(Screen *self) {
+    if (self->linebuf != self->main_linebuf) { uncounted_linefeed(self); return; }
+    // A linefeed completes the line the cursor is on, along with any lines
+    // started below the current line since the last linefeed, for example,
+    // by moving the cursor down. If the cursor is above the current line,
+    // the lines above the cursor are no longer the most recently completed.
+    int y = self->cursor->y;
+    bool contiguous = self->line_start != LINE_START_UNKNOWN && y >= self->line_start;
+    unsigned int num = contiguous ? 1 + line_starts_between(self, self->line_start, y) : 1;
+    uncounted_linefeed(self);
+    if (!contiguous || self->line_start == LINE_START_UNKNOWN) self->lines_contiguous = 0;
+    self->lines_completed += num;
+    self->lines_contiguous += num;
+    self->line_start = self->cursor->y;
+}
+
 #define buffer_push(self, ans) { \
     ans = (self)->buf + (((self)->start_of_data + (self)->count) % SAVEPOINTS_SZ); \
     if ((self)->count == SAVEPOINTS_SZ) (self)->start_of_data = ((self)->start_of_data + 1) % SAVEPOINTS_SZ; \
@@ -1091,6 +1174,7 @@ screen_erase_in_display(Screen *self, unsigned int how, bool private) {
         default:
             return;
     }
+    if (self->linebuf == self->main_linebuf && (how || (int)self->cursor->y < self->line_start)) forget_completed_lines(self);
     if (b > a) {
         for (unsigned int i=a; i < b; i++) {
             linebuf_init_line(self->linebuf, i);
@@ -1122,6 +1206,7 @@ screen_insert_lines(Screen *self, unsigned int count) {
     if (count == 0) count = 1;
     if (top <= self->cursor->y && self->cursor->y <= bottom) {
         linebuf_insert_lines(self->linebuf, count, self->cursor->y, bottom);
+        if (self->linebuf == self->main_linebuf && (int)self->cursor->y <= self->line_start) forget_completed_lines(self);
         self->is_dirty = true;
         self->selection = EMPTY_SELECTION;
         screen_carriage_return(self);
@@ -1143,6 +1228,7 @@ screen_delete_lines(Screen *self, unsigned int count) {
     if (count == 0) count = 1;
     if (top <= self->cursor->y && self->cursor->y <= bottom) {
         linebuf_delete_lines(self->linebuf, count, self->cursor->y, bottom);
+        if (self->linebuf == self->main_linebuf && (int)self->cursor->y <= self->line_start) forget_completed_lines(self);
         self->is_dirty = true;
         self->selection = EMPTY_SELECTION;
         screen_carriage_return(self);
@@ -1708,6 +1794,81 @@ as_text_alternate(Screen *self, PyObject *args) {
     return ans;
 }
 
+static PyObject*
+complete_lines_as_text(Screen *self, PyObject *args) {
+#define complete_lines_as_text_doc "complete_lines_as_text(callback, seq, as_ansi=False) -> Call callback with the text of the complete lines on the main screen numbered seq and later, see lines_completed, each line followed by a newline. Lines that are no longer directly above the current line are skipped."
+    PyObject *callback;
+    unsigned long long seq;
+    int as_ansi = 0;
+    if (!PyArg_ParseTuple(args, "OK|p", &callback, &seq, &as_ansi)) return NULL;
+    unsigned long long num = seq < self->lines_completed ? MIN(self->lines_completed - seq, self->lines_contiguous) : 0;
+    int top = -(int)self->historybuf->count, stop = MIN(self->line_start, (int)self->lines), y = stop;
+    if (!num || stop <= top) Py_RETURN_NONE;
+    while (num && y > top) {
+        y--;
+        if (!main_range_line(self, y)->continued) num--;
+    }
+    PyObject *ret = NULL, *t = NULL, *nl = PyUnicode_FromString("\n");
+    Py_UCS4 *buf = NULL;
+    if (nl == NULL) return NULL;
+    if (as_ansi) {
+        buf = malloc(sizeof(Py_UCS4) * self->columns * 100);
+        if (buf == NULL) { PyErr_NoMemory(); goto end; }
+    }
+    for (int start = y; y < stop; y++) {
+        Line *line = main_range_line(self, y);
+        if (y > start && !line->continued) {
+            ret = PyObject_CallFunctionObjArgs(callback, nl, NULL);
+            if (ret == NULL) goto end;
+            Py_CLEAR(ret);
+        }
+        if (as_ansi) {
+            bool truncated;
+            index_type n = line_as_ansi(line, buf, self->columns * 100 - 2, &truncated);
+            t = PyUnicode_FromKindAndData(PyUnicode_4BYTE_KIND, buf, n);
+        } else t = line_as_unicode(line);
+        if (t == NULL) goto end;
+        ret = PyObject_CallFunctionObjArgs(callback, t, NULL);
+        Py_CLEAR(t);
+        if (ret == NULL) goto end;
+        Py_CLEAR(ret);
+    }
+    ret = PyObject_CallFunctionObjArgs(callback, nl, NULL);
+    Py_CLEAR(ret);
+end:
+    Py_CLEAR(nl); free(buf);
+    if (PyErr_Occurred()) return NULL;
+    Py_RETURN_NONE;
+}
+
+static PyObject*
+line_seqs(Screen *self, PyObject *rows) {
+#define line_seqs_doc "line_seqs(rows) -> The numbers, as used by complete_lines_as_text(), of the lines containing rows, a list of rows of the main screen, negative for the history, in increasing order. Rows of the current line are numbered lines_completed. Lines that are not directly above the current line are numbered as if they were."
+    if (!PyList_Check(rows)) { PyErr_SetString(PyExc_TypeError, "rows must be a list"); return NULL; }
+    Py_ssize_t num = PyList_GET_SIZE(rows);
+    PyObject *ans = PyList_New(num);
+    if (ans == NULL) return NULL;
+    int top = -(int)self->historybuf->count, current = MIN(self->line_start, (int)self->lines), y = current;
+    unsigned long long starts = 0;
+    for (Py_ssize_t i = num; i-- > 0;) {
+        long r = PyLong_AsLong(PyList_GET_ITEM(rows, i));
+        if (r == -1 && PyErr_Occurred()) { Py_DECREF(ans); return NULL; }
+        unsigned long long seq = self->lines_completed;
+        if (r < current) {
+            r = MAX(r, top);
+            // Count the lines that start below row r
+            while (y > r + 1) {
+                y--;
+                if (!main_range_line(self, y)->continued) starts++;
+            }
+            seq = self->lines_completed > starts ? self->lines_completed - starts - 1 : 0;
+        }
+        PyObject *s = PyLong_FromUnsignedLongLong(seq);
+        if (s == NULL) { Py_DECREF(ans); return NULL; }
+        PyList_SET_ITEM(ans, i, s);
+    }
+    return ans;
+}
 
 static PyObject*
 screen_wcswidth(PyObject UNUSED *self, PyObject *str) {
@@ -2197,6 +2358,8 @@ static PyMethodDef methods[] = {
     MND(as_text, METH_VARARGS)
     MND(as_text_non_visual, METH_VARARGS)
     MND(as_text_alternate, METH_VARARGS)
+    METHOD(complete_lines_as_text, METH_VARARGS)
+    METHOD(line_seqs, METH_O)
     MND(tab, METH_NOARGS)
     MND(backspace, METH_NOARGS)
     MND(linefeed, METH_NOARGS)
@@ -2252,6 +2415,7 @@ static PyMemberDef members[] = {
     {"margin_top", T_UINT, offsetof(Screen, margin_top), READONLY, "margin_top"},
     {"margin_bottom", T_UINT, offsetof(Screen, margin_bottom), READONLY, "margin_bottom"},
     {"history_line_added_count", T_UINT, offsetof(Screen, history_line_added_count), 0, "history_line_added_count"},
+    {"lines_completed", T_ULONGLONG, offsetof(Screen, lines_completed), READONLY, "The number of lines of output completed on the main screen, the most recently completed line is numbered lines_completed - 1"},
     {NULL}
 };
 
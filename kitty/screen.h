@@ -82,6 +82,13 @@ typedef struct {
     GraphicsManager *grman, *main_grman, *alt_grman;
     HistoryBuf *historybuf;
     unsigned int history_line_added_count;
+    // Complete lines of output on the main screen are numbered by counting
+    // them as they are completed by linefeeds. The most recent
+    // lines_contiguous of them are directly above line_start, the row at which
+    // the current, incomplete line starts, which is negative once that row
+    // has scrolled into the history.
+    unsigned long long lines_completed, lines_contiguous;
+    int line_start;
     bool *tabstops, *main_tabstops, *alt_tabstops;
     ScreenModes modes;
     ColorProfile *color_profile;
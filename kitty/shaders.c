@@ -513,13 +513,17 @@ create_border_vao() {
 }
 
 void
-draw_borders(ssize_t vao_idx, unsigned int num_border_rects, BorderRect *rect_buf, bool rect_data_is_dirty, uint32_t viewport_width, uint32_t viewport_height, color_type active_window_bg, unsigned int num_visible_windows, OSWindow *w) {
+draw_borders(BorderRects *br, uint32_t viewport_width, uint32_t viewport_height, color_type active_window_bg, unsigned int num_visible_windows, OSWindow *w) {
+    ssize_t vao_idx = br->vao_idx;
+    unsigned int num_border_rects = br->num_border_rects;
     if (num_border_rects) {
-        if (rect_data_is_dirty) {
-            size_t sz = sizeof(GLuint) * 5 * num_border_rects;
+        if (br->is_dirty) {
+            size_t sz = sizeof(BorderRect) * num_border_rects;
             void *borders_buf_address = alloc_and_map_vao_buffer(vao_idx, sz, 0, GL_STATIC_DRAW, GL_WRITE_ONLY);
-            if (borders_buf_address) memcpy(borders_buf_address, rect_buf, sz);
+            if (borders_buf_address) memcpy(borders_buf_address, br->rect_buf, sz);
             unmap_vao_buffer(vao_idx, 0);
+        } else if (br->dirty_end > br->dirty_start) {
+            update_vao_buffer(vao_idx, 0, sizeof(BorderRect) * br->dirty_start, sizeof(BorderRect) * (br->dirty_end - br->dirty_start), br->rect_buf + br->dirty_start);
         }
         bind_program(BORDERS_PROGRAM);
         static bool constants_set = false;
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2019, Kovid Goyal <kovid at kovidgoyal.net>
+
+# A small helper process (zygote) that is forked early, while kitty is still
+# small, and does the fork/exec of child processes on behalf of kitty. This
+# makes the cost of creating a new window independent of the memory size of
+# the kitty process. Requests are sent over a unix socket, the file
+# descriptors of the terminal are passed to the helper with SCM_RIGHTS.
+
+import array
+import json
+import os
+import signal
+import socket
+import struct
+
+import kitty.fast_data_types as fast_data_types
+
+header = struct.Struct('!I')
+MAX_FDS = 3
+
+
+def send_message(sock, payload, fds=()):
+    data = json.dumps(payload).encode('utf-8')
+    data = header.pack(len(data)) + data
+    ancdata = [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', fds))] if fds else []
+    written = sock.sendmsg([data], ancdata)
+    if written < len(data):
+        sock.sendall(data[written:])
+
+
+def recv_exactly(sock, size):
+    ans = b''
+    while len(ans) < size:
+        data = sock.recv(size - len(ans))
+        if not data:
+            raise EOFError('Spawn helper connection closed')
+        ans += data
+    return ans
+
+
+def recv_message(sock, max_fds=0):
+    fds = array.array('i')
+    data, ancdata, flags, addr = sock.recvmsg(header.size, socket.CMSG_SPACE(max_fds * fds.itemsize))
+    for level, kind, payload in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(payload[:len(payload) - (len(payload) % fds.itemsize)])
+    if not data:
+        for fd in fds:
+            os.close(fd)
+        raise EOFError('Spawn helper connection closed')
+    if len(data) < header.size:
+        data += recv_exactly(sock, header.size - len(data))
+    size = header.unpack(data)[0]
+    return json.loads(recv_exactly(sock, size).decode('utf-8')), list(fds)
+
+
+def reap_children(*a):
+    while True:
+        try:
+            pid = os.waitpid(-1, os.WNOHANG)[0]
+        except ChildProcessError:
+            break
+        if pid == 0:
+            break
+
+
+def spawn(req, fds, base_env):
+    env = base_env.copy()
+    env.update(req['env'])
+    env = tuple('{}={}'.format(k, v) for k, v in env.items())
+    slave, ready_read_fd = fds[:2]
+    stdin_read_fd = fds[2] if len(fds) > 2 else -1
+    # The child closes master, stdin_write_fd and ready_write_fd, which
+    # are not present in this process at all
+    return fast_data_types.spawn(
+        req['exe'], req['cwd'], tuple(req['argv']), env, -1, slave, stdin_read_fd, -1, ready_read_fd, -1)
+
+
+def serve(sock, base_env):
+    # The children of the helper are not children of kitty, so they have
+    # to be reaped here. Handlers, unlike ignored signals, are reset by exec
+    # so the children get the default dispositions.
+    signal.signal(signal.SIGCHLD, reap_children)
+    signal.signal(signal.SIGINT, lambda *a: None)
+    while True:
+        try:
+            req, fds = recv_message(sock, MAX_FDS)
+        except (EOFError, OSError):
+            break
+        try:
+            ans = {'pid': spawn(req, fds, base_env)}
+        except Exception as err:
+            ans = {'error': str(err)}
+        finally:
+            for fd in fds:
+                os.close(fd)
+        try:
+            send_message(sock, ans)
+        except OSError:
+            break
+
+
+class SpawnHelper:
+
+    def __init__(self, env):
+        self.sock, helper_sock = socket.socketpair()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                fd = helper_sock.fileno()
+                # Close everything else that kitty has open, in particular
+                # the connection to the display server
+                os.closerange(3, fd)
+                os.closerange(fd + 1, os.sysconf('SC_OPEN_MAX'))
+                serve(helper_sock, env)
+            finally:
+                os._exit(0)
+        helper_sock.close()
+        self.pid = pid
+
+    def spawn(self, exe, cwd, argv, env, slave, stdin_read_fd, ready_read_fd):
+        fds = [slave, ready_read_fd]
+        if stdin_read_fd > -1:
+            fds.append(stdin_read_fd)
+        send_message(self.sock, {'exe': exe, 'cwd': cwd, 'argv': argv, 'env': env}, fds)
+        ans = recv_message(self.sock)[0]
+        if 'error' in ans:
+            raise OSError(ans['error'])
+        return ans['pid']
+
+    def shutdown(self):
+        self.sock.close()
+        try:
+            os.waitpid(self.pid, 0)
+        except ChildProcessError:
+            pass
+
+
+def spawn_helper():
+    return getattr(spawn_helper, 'ans', None)
+
+
+def start_spawn_helper(env):
+    stop_spawn_helper()
+    spawn_helper.ans = SpawnHelper(env)
+    return spawn_helper.ans
+
+
+def stop_spawn_helper():
+    helper = spawn_helper()
+    if helper is not None:
+        del spawn_helper.ans
+        helper.shutdown()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2019, Kovid Goyal <kovid at kovidgoyal.net>
+
+# Record how long importing every module and the phases of starting kitty
+# take, for kitty --startup-profile. The profile is started by __main__.py
+# before kitty.main is imported, so that all imports are recorded.
+
+import sys
+from time import monotonic
+
+
+class TimedLoader:
+
+    def __init__(self, loader, timer):
+        self.loader, self.timer = loader, timer
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        # Extension modules are loaded and initialized here
+        self.timer.push()
+        try:
+            return self.loader.create_module(spec)
+        finally:
+            self.timer.pop(spec.name)
+
+    def exec_module(self, module):
+        self.timer.push()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.timer.pop(module.__name__)
+
+
+class ImportTimer:
+
+    # A meta path finder that times the loaders found by the other finders
+
+    def __init__(self):
+        self.stack = []
+        self.timings = {}
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, 'find_spec', None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = TimedLoader(spec.loader, self)
+                return spec
+
+    def push(self):
+        self.stack.append([monotonic(), 0])
+
+    def pop(self, name):
+        start, in_children = self.stack.pop()
+        elapsed = monotonic() - start
+        if self.stack:
+            self.stack[-1][1] += elapsed
+        t = self.timings.setdefault(name, [0, 0])
+        t[0] += elapsed - in_children
+        t[1] += elapsed
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        try:
+            sys.meta_path.remove(self)
+        except ValueError:
+            pass
+
+
+class Profile:
+
+    def __init__(self):
+        self.start = self.last = monotonic()
+        self.phases = []
+        self.import_timer = ImportTimer()
+        self.import_timer.install()
+
+    def phase_done(self, name):
+        now = monotonic()
+        self.phases.append((name, now - self.start, now - self.last))
+        self.last = now
+
+    def report(self, num_imports=25):
+        self.import_timer.uninstall()
+        lines = ['Startup profile (times in ms)', '', 'Phases (since start, duration):']
+        for name, since_start, duration in self.phases:
+            lines.append('  {:30} {:8.1f} {:8.1f}'.format(name, since_start * 1000, duration * 1000))
+        timings = self.import_timer.timings
+        total = sum(t[0] for t in timings.values())
+        lines.extend(('', 'Imports: {} modules in {:.1f}, slowest (self, cumulative):'.format(len(timings), total * 1000)))
+        for name, (self_time, cumulative) in sorted(timings.items(), key=lambda x: x[1][0], reverse=True)[:num_imports]:
+            lines.append('  {:30} {:8.1f} {:8.1f}'.format(name, self_time * 1000, cumulative * 1000))
+        return '\n'.join(lines)
+
+
+profile = None
+
+
+def start():
+    global profile
+    profile = Profile()
+
+
+def stop():
+    global profile
+    if profile is not None:
+        profile.import_timer.uninstall()
+        profile = None
+
+
+def phase_done(name):
+    if profile is not None:
+        profile.phase_done(name)
+
+
+def report():
+    # Print the report once the first frame has been rendered
+    global profile
+    if profile is not None:
+        print(profile.report(), file=sys.stderr)
+        sys.stderr.flush()
+        profile = None
@@ -104,13 +104,14 @@ static inline id_type
 add_window(id_type os_window_id, id_type tab_id, PyObject *title) {
     WITH_TAB(os_window_id, tab_id);
         ensure_space_for(tab, windows, Window, tab->num_windows + 1, capacity, 1, true);
-        make_os_window_context_current(osw);
         memset(tab->windows + tab->num_windows, 0, sizeof(Window));
         tab->windows[tab->num_windows].id = ++global_state.window_id_counter;
         tab->windows[tab->num_windows].visible = true;
         tab->windows[tab->num_windows].title = title;
-        tab->windows[tab->num_windows].render_data.vao_idx = create_cell_vao();
-        tab->windows[tab->num_windows].render_data.gvao_idx = create_graphics_vao();
+        // The VAOs are created when the window is first rendered, so that
+        // windows in tabs that are never shown have no GPU state
+        tab->windows[tab->num_windows].render_data.vao_idx = -1;
+        tab->windows[tab->num_windows].render_data.gvao_idx = -1;
         Py_INCREF(tab->windows[tab->num_windows].title);
         return tab->windows[tab->num_windows++].id;
     END_WITH_TAB;
@@ -134,7 +135,8 @@ update_window_title(id_type os_window_id, id_type tab_id, id_type window_id, PyO
 static inline void
 destroy_window(Window *w) {
     Py_CLEAR(w->render_data.screen); Py_CLEAR(w->title);
-    remove_vao(w->render_data.vao_idx); remove_vao(w->render_data.gvao_idx);
+    if (w->render_data.vao_idx > -1) remove_vao(w->render_data.vao_idx);
+    if (w->render_data.gvao_idx > -1) remove_vao(w->render_data.gvao_idx);
 }
 
 static inline void
@@ -234,16 +236,31 @@ swap_windows(id_type os_window_id, id_type tab_id, unsigned int a, unsigned int
     END_WITH_TAB;
 }
 
-static void
-add_borders_rect(id_type os_window_id, id_type tab_id, uint32_t left, uint32_t top, uint32_t right, uint32_t bottom, uint32_t color) {
+static bool
+set_borders_rects(id_type os_window_id, id_type tab_id, const BorderRect *rects, unsigned int num) {
     WITH_TAB(os_window_id, tab_id)
         BorderRects *br = &tab->border_rects;
-        br->is_dirty = true;
-        if (!left && !top && !right && !bottom) { br->num_border_rects = 0; return; }
-        ensure_space_for(br, rect_buf, BorderRect, br->num_border_rects + 1, capacity, 32, false);
-        BorderRect *r = br->rect_buf + br->num_border_rects++;
-        r->left = left; r->right = right; r->top = top; r->bottom = bottom; r->color = color;
+        if (num != br->num_border_rects) {
+            ensure_space_for(br, rect_buf, BorderRect, num, capacity, 32, false);
+            if (num) memcpy(br->rect_buf, rects, sizeof(BorderRect) * num);
+            br->num_border_rects = num;
+            br->is_dirty = true;
+            return true;
+        }
+        // Only the rects that actually changed need to be sent to the GPU, so
+        // that, for example, a focus change updates just a few border colors
+        unsigned int start = 0, end = num;
+        while (start < end && memcmp(br->rect_buf + start, rects + start, sizeof(BorderRect)) == 0) start++;
+        if (start == end) return false;
+        while (end > start && memcmp(br->rect_buf + end - 1, rects + end - 1, sizeof(BorderRect)) == 0) end--;
+        memcpy(br->rect_buf + start, rects + start, sizeof(BorderRect) * (end - start));
+        if (br->dirty_end > br->dirty_start) {
+            br->dirty_start = MIN(br->dirty_start, start);
+            br->dirty_end = MAX(br->dirty_end, end);
+        } else { br->dirty_start = start; br->dirty_end = end; }
+        return true;
     END_WITH_TAB
+    return false;
 }
 
 
@@ -286,7 +303,6 @@ os_window_regions(OSWindow *os_window, Region *central, Region *tab_bar) {
 #define KII(name) PYWRAP1(name) { id_type a; unsigned int b, c; PA("KII", &a, &b, &c); name(a, b, c); Py_RETURN_NONE; }
 #define KKI(name) PYWRAP1(name) { id_type a, b; unsigned int c; PA("KKI", &a, &b, &c); name(a, b, c); Py_RETURN_NONE; }
 #define KKII(name) PYWRAP1(name) { id_type a, b; unsigned int c, d; PA("KKII", &a, &b, &c, &d); name(a, b, c, d); Py_RETURN_NONE; }
-#define KK5I(name) PYWRAP1(name) { id_type a, b; unsigned int c, d, e, f, g; PA("KKIIIII", &a, &b, &c, &d, &e, &f, &g); name(a, b, c, d, e, f, g); Py_RETURN_NONE; }
 #define BOOL_SET(name) PYWRAP1(set_##name) { global_state.name = PyObject_IsTrue(args); Py_RETURN_NONE; }
 
 static inline color_type
@@ -385,6 +401,7 @@ PYWRAP1(set_options) {
     S(bell_border_color, color_as_int);
     S(repaint_delay, repaint_delay);
     S(input_delay, repaint_delay);
+    S(title_update_interval, repaint_delay);
     S(sync_to_monitor, PyObject_IsTrue);
     S(close_on_child_death, PyObject_IsTrue);
     S(window_alert_on_bell, PyObject_IsTrue);
@@ -537,6 +554,11 @@ PYWRAP1(mark_tab_bar_dirty) {
     Py_RETURN_NONE;
 }
 
+PYWRAP0(mark_pending_title_updates) {
+    global_state.has_pending_title_updates = true;
+    Py_RETURN_NONE;
+}
+
 PYWRAP1(change_background_opacity) {
     id_type os_window_id;
     float opacity;
@@ -670,8 +692,10 @@ PYWRAP1(os_window_font_size) {
 
 PYWRAP1(set_boss) {
     Py_CLEAR(global_state.boss);
-    global_state.boss = args;
-    Py_INCREF(global_state.boss);
+    if (args != Py_None) {
+        global_state.boss = args;
+        Py_INCREF(global_state.boss);
+    }
     Py_RETURN_NONE;
 }
 
@@ -710,7 +734,21 @@ KI(set_active_tab)
 KKI(set_active_window)
 KII(swap_tabs)
 KKII(swap_windows)
-KK5I(add_borders_rect)
+
+PYWRAP1(set_borders_rects) {
+    id_type os_window_id, tab_id;
+    Py_buffer rects;
+    PA("KKy*", &os_window_id, &tab_id, &rects);
+    if (rects.len % sizeof(BorderRect)) {
+        PyBuffer_Release(&rects);
+        PyErr_SetString(PyExc_ValueError, "The size of the border rects buffer is not a multiple of the size of a rect");
+        return NULL;
+    }
+    bool changed = set_borders_rects(os_window_id, tab_id, rects.buf, rects.len / sizeof(BorderRect));
+    PyBuffer_Release(&rects);
+    if (changed) { Py_RETURN_TRUE; }
+    Py_RETURN_FALSE;
+}
 
 #define M(name, arg_type) {#name, (PyCFunction)name, arg_type, NULL}
 #define MW(name, arg_type) {#name, (PyCFunction)py##name, arg_type, NULL}
@@ -732,7 +770,7 @@ static PyMethodDef module_methods[] = {
     MW(set_active_window, METH_VARARGS),
     MW(swap_tabs, METH_VARARGS),
     MW(swap_windows, METH_VARARGS),
-    MW(add_borders_rect, METH_VARARGS),
+    MW(set_borders_rects, METH_VARARGS),
     MW(set_tab_bar_render_data, METH_VARARGS),
     MW(set_window_render_data, METH_VARARGS),
     MW(viewport_for_window, METH_VARARGS),
@@ -741,6 +779,7 @@ static PyMethodDef module_methods[] = {
     MW(set_titlebar_color, METH_VARARGS),
     MW(focus_os_window, METH_VARARGS),
     MW(mark_tab_bar_dirty, METH_O),
+    MW(mark_pending_title_updates, METH_NOARGS),
     MW(change_background_opacity, METH_VARARGS),
     MW(background_opacity_of, METH_O),
     MW(update_window_visibility, METH_VARARGS),
@@ -22,7 +22,7 @@ typedef struct {
     unsigned int scrollback_pager_history_size;
     char_type select_by_word_characters[256]; size_t select_by_word_characters_count;
     color_type url_color, background, active_border_color, inactive_border_color, bell_border_color;
-    double repaint_delay, input_delay;
+    double repaint_delay, input_delay, title_update_interval;
     bool focus_follows_mouse, hide_window_decorations;
     bool macos_option_as_alt, macos_hide_from_tasks, macos_quit_when_last_window_closed, macos_window_resizable, macos_traditional_fullscreen;
     float macos_thicken_font;
@@ -84,7 +84,10 @@ typedef struct {
 typedef struct {
     BorderRect *rect_buf;
     unsigned int num_border_rects, capacity;
+    // is_dirty means the whole buffer must be uploaded, otherwise only the
+    // rects in [dirty_start, dirty_end) have changed since the last upload
     bool is_dirty;
+    unsigned int dirty_start, dirty_end;
     ssize_t vao_idx;
 } BorderRects;
 
@@ -147,7 +150,7 @@ typedef struct {
     bool close_all_windows;
     bool is_wayland;
     bool debug_gl, debug_font_fallback;
-    bool has_pending_resizes;
+    bool has_pending_resizes, has_pending_title_updates;
     bool in_sequence_mode;
     bool tab_bar_hidden;
     double font_sz_in_pts;
@@ -188,7 +191,7 @@ OSWindow* add_os_window();
 OSWindow* current_os_window();
 void os_window_regions(OSWindow*, Region *main, Region *tab_bar);
 bool drag_scroll(Window *, OSWindow*);
-void draw_borders(ssize_t vao_idx, unsigned int num_border_rects, BorderRect *rect_buf, bool rect_data_is_dirty, uint32_t viewport_width, uint32_t viewport_height, color_type, unsigned int, OSWindow *w);
+void draw_borders(BorderRects *br, uint32_t viewport_width, uint32_t viewport_height, color_type, unsigned int, OSWindow *w);
 ssize_t create_cell_vao();
 ssize_t create_graphics_vao();
 ssize_t create_border_vao();
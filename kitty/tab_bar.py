@@ -87,6 +87,9 @@ class TabBar:
         self.data_buffer_size = 0
         self.laid_out_once = False
         self.dirty = True
+        # The tabs drawn on the screen as (key, before, end, x, cursor) tuples
+        self.drawn_tabs = []
+        self.drawn_max_title_length = None
         self.screen = s = Screen(None, 1, 10, 0, self.cell_width, cell_height)
         s.color_profile.update_ansi_color_table(build_ansi_color_table(opts))
         s.color_profile.set_configured_colors(
@@ -114,6 +117,8 @@ class TabBar:
             self.opts.tab_fade, self.opts.active_tab_background, self.opts.inactive_tab_background,
             self.opts.background
         )
+        # An upper bound on the number of cells a tab uses in addition to its title
+        self.max_decoration_width = self.leading_spaces + self.trailing_spaces + len(self.sep) + len(self.opts.tab_fade) + 4
         self.draw_func = draw_tab_with_separator if self.opts.tab_bar_style == 'separator' else draw_tab_with_fade
 
     def patch_colors(self, spec):
@@ -126,6 +131,7 @@ class TabBar:
             self.draw_data = self.draw_data._replace(inactive_bg=color_from_int(spec['inactive_tab_background']))
         if 'background' in spec:
             self.draw_data = self.draw_data._replace(default_bg=color_from_int(spec['background']))
+        self.drawn_tabs = []
         self.screen.color_profile.set_configured_colors(
                 spec.get('inactive_tab_foreground', color_as_int(self.opts.inactive_tab_foreground)),
                 spec.get('inactive_tab_background', color_as_int(self.opts.inactive_tab_background))
@@ -141,6 +147,7 @@ class TabBar:
         ncells = viewport_width // cell_width
         s.resize(1, ncells)
         s.reset_mode(DECAWM)
+        self.drawn_tabs = []
         self.laid_out_once = True
         margin = (viewport_width - ncells * cell_width) // 2 + self.margin_width
         self.window_geometry = g = WindowGeometry(
@@ -156,24 +163,54 @@ class TabBar:
         if not self.laid_out_once:
             return
         s = self.screen
-        s.cursor.x = 0
-        s.erase_in_line(2, False)
         max_title_length = max(1, (self.screen_geometry.xnum // max(1, len(data))) - 1)
+        if max_title_length != self.drawn_max_title_length:
+            self.drawn_max_title_length = max_title_length
+            self.drawn_tabs = []
+        drawn_tabs, self.drawn_tabs = self.drawn_tabs, []
+        if not drawn_tabs:
+            s.cursor.x = 0
+            s.erase_in_line(2, False)
         cr = []
         last_tab = data[-1] if data else None
-
-        for t in data:
-            s.cursor.bg = self.active_bg if t.is_active else 0
-            s.cursor.fg = self.active_fg if t.is_active else 0
-            s.cursor.bold, s.cursor.italic = self.active_font_style if t.is_active else self.inactive_font_style
-            before = s.cursor.x
-            end = self.draw_func(self.draw_data, s, t, before, max_title_length)
+        x = 0
+        max_x = s.columns - max_title_length
+        c = s.cursor
+        overdrawn, irregular = 0, False
+        for i, t in enumerate(data):
+            key = t.title, t.is_active, t.needs_attention and self.draw_data.bell_on_tab
+            if x >= overdrawn and i < len(drawn_tabs) and drawn_tabs[i][:2] == (key, x):
+                # The cells of this tab are already correct, only restore the
+                # cursor state the tab was drawn with
+                key, before, end, x, (c.fg, c.bg, c.bold, c.italic) = drawn_tabs[i]
+            else:
+                c.x = before = x
+                c.bg = self.active_bg if t.is_active else 0
+                c.fg = self.active_fg if t.is_active else 0
+                c.bold, c.italic = self.active_font_style if t.is_active else self.inactive_font_style
+                end = self.draw_func(self.draw_data, s, t, before, max_title_length)
+                x = c.x
+                if end - before >= max_title_length:
+                    # A truncated title is drawn in full before being cut
+                    # short, so it can have been drawn over the following
+                    # tabs, which have to be drawn again as well
+                    overdrawn = max(overdrawn, before + 2 * len(t.title) + self.max_decoration_width)
+                if x < before:
+                    # The title did not fit in what is left of the line and was
+                    # drawn over earlier tabs, so draw everything next time
+                    irregular = True
+            self.drawn_tabs.append((key, before, end, x, (c.fg, c.bg, c.bold, c.italic)))
             cr.append((before, end))
-            if s.cursor.x > s.columns - max_title_length and t is not last_tab:
+            if x > max_x and t is not last_tab:
+                c.x = x
                 s.draw('…')
+                x = c.x
                 break
+        s.cursor.x = x
         s.erase_in_line(0, False)  # Ensure no long titles bleed after the last tab
         self.cell_ranges = cr
+        if irregular:
+            self.drawn_tabs = []
 
     def destroy(self):
         self.screen.reset_callbacks()
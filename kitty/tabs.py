@@ -2,9 +2,11 @@
 # vim:fileencoding=utf-8
 # License: GPL v3 Copyright: 2016, Kovid Goyal <kovid at kovidgoyal.net>
 
+import sys
 import weakref
 from collections import deque, namedtuple
 from functools import partial
+from time import monotonic
 
 from .borders import Borders
 from .child import Child
@@ -41,6 +43,9 @@ class Tab:  # {{{
 
     def __init__(self, tab_manager, session_tab=None, special_window=None, cwd_from=None):
         self._active_window_idx = 0
+        # Set when the tab needs to be laid out again before it is next shown
+        self.needs_relayout = False
+        self.num_windows_needing_attention = 0
         self.tab_manager_ref = weakref.ref(tab_manager)
         self.os_window_id = tab_manager.os_window_id
         self.id = add_tab(self.os_window_id)
@@ -78,12 +83,45 @@ class Tab:  # {{{
         self._current_layout_name = layout_name
 
     def startup(self, session_tab):
-        for cmd in session_tab.windows:
-            if isinstance(cmd, (SpecialWindowInstance,)):
-                self.new_special_window(cmd)
-            else:
-                self.new_window(cmd=cmd)
-        self.set_active_window_idx(session_tab.active_window_idx)
+        # Spawn all the children first and then lay out the tab and draw its
+        # borders once, instead of once for every window
+        timings = []
+        start = monotonic()
+
+        def phase_done(name):
+            nonlocal start
+            now = monotonic()
+            timings.append((name, now - start))
+            start = now
+
+        specs = [
+            cmd if isinstance(cmd, (SpecialWindowInstance,)) else SpecialWindow(cmd)
+            for cmd in session_tab.windows]
+        # The windows are added to the tab in order below, and add_window()
+        # gives them consecutive ids, so each child gets the id of its window
+        first_id = next_window_id()
+        children = [
+            self.launch_child(cmd=sw.cmd, stdin=sw.stdin, cwd_from=sw.cwd_from, cwd=sw.cwd, env=sw.env, window_id=first_id + i)
+            for i, sw in enumerate(specs)]
+        phase_done('spawn children')
+        boss = get_boss()
+        for sw, child in zip(specs, children):
+            window = Window(self, child, self.opts, self.args, override_title=sw.override_title)
+            # Must add child before laying out so that resize_pty succeeds
+            boss.add_child(window)
+            self.windows.append(window)
+        phase_done('create windows')
+        if self.windows:
+            self._active_window_idx = max(0, min(session_tab.active_window_idx, len(self.windows) - 1))
+            self.active_window.focus_changed(True)
+            self.relayout()
+            self.active_window_idx = self.current_layout.set_active_window(self.windows, self.active_window_idx)
+            glfw_post_empty_event()
+        phase_done('layout')
+        if getattr(self.args, 'debug_startup', False):
+            print('Started tab {!r} with {} windows in {}'.format(
+                self.name or self.title, len(self.windows), ', '.join(
+                    '{}: {:.1f}ms'.format(name, t * 1000) for name, t in timings)), file=sys.stderr)
 
     @property
     def active_window_idx(self):
@@ -145,6 +183,7 @@ class Tab:  # {{{
                 yield w
 
     def relayout(self):
+        self.needs_relayout = False
         if self.windows:
             self.active_window_idx = self.current_layout(self.windows, self.active_window_idx)
         self.relayout_borders()
@@ -152,6 +191,10 @@ class Tab:  # {{{
     def relayout_borders(self):
         tm = self.tab_manager_ref()
         if tm is not None:
+            pending = get_boss().pending_border_relayouts
+            if pending is not None:
+                pending.add(self)
+                return
             visible_windows = [w for w in self.windows if w.is_visible_in_layout]
             w = self.active_window
             self.borders(visible_windows, w, self.current_layout,
@@ -203,7 +246,7 @@ class Tab:  # {{{
         if self.current_layout.remove_all_biases():
             self.relayout()
 
-    def launch_child(self, use_shell=False, cmd=None, stdin=None, cwd_from=None, cwd=None, env=None):
+    def launch_child(self, use_shell=False, cmd=None, stdin=None, cwd_from=None, cwd=None, env=None, window_id=None):
         if cmd is None:
             if use_shell:
                 cmd = resolved_shell(self.opts)
@@ -212,7 +255,7 @@ class Tab:  # {{{
         fenv = {}
         if env:
             fenv.update(env)
-        fenv['KITTY_WINDOW_ID'] = str(next_window_id())
+        fenv['KITTY_WINDOW_ID'] = str(next_window_id() if window_id is None else window_id)
         if not is_macos and not is_wayland:
             try:
                 fenv['WINDOWID'] = str(x11_window_id(self.os_window_id))
@@ -230,7 +273,8 @@ class Tab:  # {{{
             overlaid = next(w for w in self.windows if w.id == overlay_for)
             window.overlay_for = overlay_for
             overlaid.overlay_window_id = window.id
-        # Must add child before laying out so that resize_pty succeeds
+        # Must add child before laying out so that resize_pty succeeds, this
+        # also registers the window in the boss' window_id_map
         get_boss().add_child(window)
         self.active_window_idx = self.current_layout.add_window(self.windows, window, self.active_window_idx)
         self.relayout_borders()
@@ -245,8 +289,10 @@ class Tab:  # {{{
             self.remove_window(self.windows[self.active_window_idx])
 
     def remove_window(self, window):
+        window.needs_attention = False
         self.active_window_idx = self.current_layout.remove_window(self.windows, window, self.active_window_idx)
         remove_window(self.os_window_id, self.id, window.id)
+        get_boss().window_id_map.pop(window.id, None)
         self.relayout_borders()
         glfw_post_empty_event()
 
@@ -402,6 +448,7 @@ class TabManager:  # {{{
     def _add_tab(self, tab):
         before = len(self.tabs)
         self.tabs.append(tab)
+        get_boss().tab_id_map[tab.id] = tab
         if len(self.tabs) > 1 and before < 2:
             self.tabbar_visibility_changed()
 
@@ -409,12 +456,16 @@ class TabManager:  # {{{
         before = len(self.tabs)
         remove_tab(self.os_window_id, tab.id)
         self.tabs.remove(tab)
+        get_boss().tab_id_map.pop(tab.id, None)
         if len(self.tabs) < 2 and before > 1:
             self.tabbar_visibility_changed()
 
     def _set_active_tab(self, idx):
         self.active_tab_idx = idx
         set_active_tab(self.os_window_id, idx)
+        tab = self.active_tab
+        if tab is not None and tab.needs_relayout:
+            tab.relayout()
 
     def tabbar_visibility_changed(self):
         if not self.tab_bar_hidden:
@@ -424,6 +475,10 @@ class TabManager:  # {{{
 
     def mark_tab_bar_dirty(self):
         if len(self.tabs) > 1 and not self.tab_bar_hidden:
+            pending = get_boss().pending_tab_bar_updates
+            if pending is not None:
+                pending.add(self)
+                return
             mark_tab_bar_dirty(self.os_window_id)
 
     def update_tab_bar_data(self):
@@ -434,8 +489,13 @@ class TabManager:  # {{{
             if not self.tab_bar_hidden:
                 self.tab_bar.layout()
                 self.mark_tab_bar_dirty()
+        active_tab = self.active_tab
         for tab in self.tabs:
-            tab.relayout()
+            if tab is active_tab:
+                tab.relayout()
+            else:
+                # Inactive tabs are laid out when they are next activated
+                tab.needs_relayout = True
 
     def set_active_tab_idx(self, idx):
         self._set_active_tab(idx)
@@ -493,9 +553,9 @@ class TabManager:  # {{{
             return t.active_window
 
     def tab_for_id(self, tab_id):
-        for t in self.tabs:
-            if t.id == tab_id:
-                return t
+        t = get_boss().tab_id_map.get(tab_id)
+        if t is not None and t.os_window_id == self.os_window_id:
+            return t
 
     def move_tab(self, delta=1):
         if len(self.tabs) > 1:
@@ -542,12 +602,7 @@ class TabManager:  # {{{
         ans = []
         for t in self.tabs:
             title = (t.name or t.title or appname).strip()
-            needs_attention = False
-            for w in t:
-                if w.needs_attention:
-                    needs_attention = True
-                    break
-            ans.append(TabBarData(title, t is at, needs_attention))
+            ans.append(TabBarData(title, t is at, t.num_windows_needing_attention > 0))
         return ans
 
     def activate_tab_at(self, x):
@@ -560,7 +615,9 @@ class TabManager:  # {{{
         return self.tab_bar.blank_rects if len(self.tabs) > 1 else ()
 
     def destroy(self):
+        tab_id_map = get_boss().tab_id_map
         for t in self:
+            tab_id_map.pop(t.id, None)
             t.destroy()
         self.tab_bar.destroy()
         del self.tab_bar
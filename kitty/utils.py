@@ -15,7 +15,6 @@ from time import monotonic
 from .constants import (
     appname, is_macos, is_wayland, supports_primary_selection
 )
-from .rgb import Color, to_color
 
 BASE = os.path.dirname(os.path.abspath(__file__))
 
@@ -56,10 +55,12 @@ def color_as_int(val):
 
 
 def color_from_int(val):
+    from .rgb import Color
     return Color((val >> 16) & 0xFF, (val >> 8) & 0xFF, val & 0xFF)
 
 
 def parse_color_set(raw):
+    from .rgb import to_color
     parts = raw.split(';')
     lp = len(parts)
     if lp % 2 != 0:
@@ -10,7 +10,7 @@ from collections import deque
 from enum import IntEnum
 from itertools import chain
 
-from .child import cwd_of_process
+from .child import cwd_of_child
 from .config import build_ansi_color_table
 from .constants import (
     ScreenGeometry, WindowGeometry, appname, get_boss, wakeup
@@ -123,7 +123,7 @@ class Window:
         self.action_on_close = None
         self.layout_data = None
         self.pty_resized_once = False
-        self.needs_attention = False
+        self._needs_attention = False
         self.override_title = override_title
         self.overlay_window_id = None
         self.overlay_for = None
@@ -141,6 +141,7 @@ class Window:
         self.destroyed = False
         self.click_queue = deque(maxlen=3)
         self.geometry = WindowGeometry(0, 0, 0, 0, 0, 0)
+        self.render_data_key = None
         self.needs_layout = True
         self.is_visible_in_layout = True
         self.child, self.opts = child, opts
@@ -213,6 +214,11 @@ class Window:
     def set_geometry(self, window_idx, new_geometry):
         if self.destroyed:
             return
+        render_data_key = self.os_window_id, self.tab_id, window_idx, new_geometry, viewport_for_window(self.os_window_id)
+        if render_data_key == self.render_data_key and not self.needs_layout:
+            # Neither the geometry of the window nor of its OS window has changed
+            self.geometry = new_geometry
+            return
         if self.needs_layout or new_geometry.xnum != self.screen.columns or new_geometry.ynum != self.screen.lines:
             boss = get_boss()
             self.screen.resize(new_geometry.ynum, new_geometry.xnum)
@@ -229,6 +235,7 @@ class Window:
             sg = self.update_position(new_geometry)
         self.geometry = g = new_geometry
         set_window_render_data(self.os_window_id, self.tab_id, self.id, window_idx, sg.xstart, sg.ystart, sg.dx, sg.dy, self.screen, *g[:4])
+        self.render_data_key = render_data_key
 
     def contains(self, x, y):
         g = self.geometry
@@ -281,7 +288,7 @@ class Window:
     def title_changed(self, new_title):
         self.child_title = sanitize_title(new_title or self.default_title)
         if self.override_title is None:
-            self.title_updated()
+            get_boss().queue_title_update(self)
 
     def icon_changed(self, new_icon):
         pass  # TODO: Implement this
@@ -290,6 +297,21 @@ class Window:
     def is_active(self):
         return get_boss().active_window is self
 
+    @property
+    def needs_attention(self):
+        return self._needs_attention
+
+    @needs_attention.setter
+    def needs_attention(self, val):
+        val = bool(val)
+        if val is not self._needs_attention:
+            self._needs_attention = val
+            # The tab keeps a count of its windows needing attention so that
+            # drawing the tab bar does not have to check every window
+            tab = self.tabref()
+            if tab is not None:
+                tab.num_windows_needing_attention += 1 if val else -1
+
     def on_bell(self):
         if not self.is_active:
             self.needs_attention = True
@@ -441,7 +463,8 @@ class Window:
             if pop:
                 if self.title_stack:
                     self.child_title = self.title_stack.pop()
-                    self.title_updated()
+                    if self.override_title is None:
+                        get_boss().queue_title_update(self)
             else:
                 if self.child_title:
                     self.title_stack.append(self.child_title)
@@ -475,13 +498,103 @@ class Window:
             lines = chain(h, lines)
         return ''.join(lines)
 
+    def iter_text(self, as_ansi=False, add_history=False, add_wrap_markers=False, alternate_screen=False, chunk_size=65536):
+        # Same as as_text() but generates the text in chunks of approximately
+        # chunk_size characters, doing only the work needed for one chunk at a
+        # time. Note that the text is not a snapshot, lines that scroll into
+        # the history while the chunks are being generated can be skipped or
+        # repeated.
+        add_history = add_history and not (self.screen.is_using_alternate_linebuf() ^ alternate_screen)
+        if add_history:
+            hb = self.screen.historybuf
+            sanitizer = None
+            if not as_ansi or not add_wrap_markers:
+                sanitizer = text_sanitizer(as_ansi, add_wrap_markers)
+            offset, pending = 0, ''
+            while True:
+                h = []
+                num = hb.pagerhist_as_text(h.append, offset, chunk_size)
+                text = pending + ''.join(h)
+                pending = ''
+                if sanitizer is not None and num:
+                    # Dont split an escape code between chunks
+                    idx = text.rfind('\x1b')
+                    if idx > -1 and 'm' not in text[idx:]:
+                        text, pending = text[:idx], text[idx:]
+                if text:
+                    yield text if sanitizer is None else sanitizer(text)
+                if not num:
+                    break
+                offset += num
+            lines_per_chunk = max(1, chunk_size // max(1, hb.xnum))
+            y = 0
+            while y < hb.count:
+                h = []
+                hb.as_text(h.append, as_ansi, add_wrap_markers, y, lines_per_chunk)
+                y += lines_per_chunk
+                yield ''.join(h)
+        lines = []
+        if alternate_screen:
+            f = self.screen.as_text_alternate
+        else:
+            f = self.screen.as_text_non_visual if add_history else self.screen.as_text
+        f(lines.append, as_ansi, add_wrap_markers)
+        yield ''.join(lines)
+
+    def text_since(self, seq, as_ansi=False):
+        # Return (text, next_seq) where text is the complete lines of the main
+        # screen starting with the line with sequence number seq and next_seq
+        # is the sequence number of the next line to be completed. Lines are
+        # numbered by counting them as they are completed by linefeeds, so
+        # the numbers only ever increase, even when the screen is cleared or
+        # rewrapped. Lines that are no longer directly above the current line,
+        # for example, because they were erased, or dropped from the history,
+        # are skipped. The line the cursor is on is considered incomplete.
+        screen = self.screen
+        lines = []
+        screen.complete_lines_as_text(lines.append, seq, as_ansi)
+        return ''.join(lines), screen.lines_completed
+
+    def search_scrollback(self, query, ignore_case=False, limit=100):
+        # Return a list of (seq, position, text) for the limit most recent
+        # lines containing query, in order, numbered as in text_since(). text
+        # is the text of the line followed by the text of the lines it
+        # continues into, if needed to contain the match. The scrollback is
+        # indexed the first time it is searched, so only blocks of lines that
+        # can contain the query are examined.
+        screen = self.screen
+        hb = screen.historybuf
+        if not query:
+            return []
+        q = query.lower() if ignore_case else query
+        matches = []
+        if not screen.is_using_alternate_linebuf():
+            lb = screen.linebuf
+            texts = [str(lb.line(y)) for y in range(screen.lines)]
+            for y in range(screen.lines - 1, -1, -1):
+                if limit and len(matches) >= limit:
+                    break
+                text, line_len = texts[y], len(texts[y])
+                n = y + 1
+                while n < screen.lines and len(text) < line_len + len(q) - 1 and lb.is_continued(n):
+                    text += texts[n]
+                    n += 1
+                pos = (text.lower() if ignore_case else text).find(q, 0, line_len + len(q) - 1)
+                if pos > -1:
+                    matches.append((y, pos, text))
+            matches.reverse()
+        if not limit or len(matches) < limit:
+            # The history numbers its lines by the number of lines added to it,
+            # convert to rows, negative for the history
+            matches[:0] = ((seq - hb.lines_added, pos, text) for seq, pos, text in hb.search(query, ignore_case, (limit - len(matches)) if limit else 0))
+        seqs = screen.line_seqs([m[0] for m in matches])
+        return [(seq, pos, text) for seq, (y, pos, text) in zip(seqs, matches)]
+
     @property
     def cwd_of_child(self):
-        # TODO: Maybe use the cwd of the leader of the foreground process
-        # group in the session of the child process?
         pid = self.child.pid
         if pid is not None:
-            return cwd_of_process(pid) or None
+            return cwd_of_child(pid) or None
 
     def pipe_data(self, text, has_wrap_markers=False):
         text = text or ''
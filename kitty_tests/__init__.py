@@ -2,12 +2,18 @@
 # vim:fileencoding=utf-8
 # License: GPL v3 Copyright: 2016, Kovid Goyal <kovid at kovidgoyal.net>
 
+from contextlib import ExitStack, contextmanager
+from itertools import count
+from time import monotonic
 from unittest import TestCase
+from unittest.mock import patch
 
 from kitty.config import Options, defaults, merge_configs
-from kitty.fast_data_types import set_options
+from kitty.fast_data_types import Region, set_options
 from kitty.fast_data_types import LineBuf, Cursor, Screen, HistoryBuf
 
+VIEWPORT_WIDTH, VIEWPORT_HEIGHT, CELL_WIDTH, CELL_HEIGHT = 1920, 1080, 9, 18
+
 
 class Callbacks:
 
@@ -69,6 +75,145 @@ def filled_history_buf(ynum=5, xnum=5, cursor=Cursor()):
     return ans
 
 
+def timed(func, repeat=1):
+    # The mean time in seconds taken by a call to func, for the benchmarks
+    start = monotonic()
+    for i in range(repeat):
+        func()
+    return (monotonic() - start) / repeat
+
+
+class HeadlessChild:
+
+    pids = count(100000)
+    allow_remote_control = False
+    child_fd = -1
+
+    def __init__(self, argv, cwd, opts, stdin=None, env=None, cwd_from=None):
+        self.argv, self.cwd, self.env = list(argv), cwd or '/', env or {}
+        self.pid = None
+
+    def fork(self):
+        self.pid = next(self.pids)
+        return self.pid
+
+    def mark_terminal_ready(self):
+        pass
+
+    @property
+    def cmdline(self):
+        return list(self.argv)
+
+    @property
+    def environ(self):
+        return self.env.copy()
+
+    @property
+    def current_cwd(self):
+        return self.cwd
+
+
+class HeadlessChildMonitor:
+
+    def __init__(self, death_notify, dump_callback, talk_fd, listen_fd):
+        self.death_notify = death_notify
+
+    def add_child(self, window_id, pid, fd, screen):
+        pass
+
+    def mark_for_close(self, window_id):
+        # The I/O thread reports the death of the child once it is closed
+        self.death_notify(window_id)
+
+    def resize_pty(self, *a):
+        pass
+
+    def needs_write(self, *a):
+        return True
+
+    def set_iutf8(self, *a):
+        pass
+
+    def wakeup(self):
+        pass
+
+
+def viewport_for_window(os_window_id=None):
+    rows = VIEWPORT_HEIGHT // CELL_HEIGHT
+    central = Region((0, 0, VIEWPORT_WIDTH - 1, (rows - 1) * CELL_HEIGHT - 1, VIEWPORT_WIDTH, (rows - 1) * CELL_HEIGHT))
+    tab_bar = Region((0, (rows - 1) * CELL_HEIGHT, VIEWPORT_WIDTH - 1, rows * CELL_HEIGHT - 1, VIEWPORT_WIDTH, CELL_HEIGHT))
+    return central, tab_bar, VIEWPORT_WIDTH, VIEWPORT_HEIGHT, CELL_WIDTH, CELL_HEIGHT
+
+
+@contextmanager
+def headless():
+    # Run the Boss, tabs and windows without any OS windows, OpenGL or child
+    # processes, by replacing the functions from fast_data_types that need an
+    # OS window with stubs
+    import kitty.borders
+    import kitty.boss
+    import kitty.layout
+    import kitty.tab_bar
+    import kitty.tabs
+    import kitty.window
+    from kitty.constants import set_boss
+    ids = count(1)
+    window_ids = count(1)
+    last_window_id = 0
+
+    def noop(*a):
+        pass
+
+    def add_window(os_window_id, tab_id, title):
+        nonlocal last_window_id
+        last_window_id = next(window_ids)
+        return last_window_id
+
+    stubs = {
+        kitty.boss: dict(
+            ChildMonitor=HeadlessChildMonitor, current_os_window=lambda: 1, glfw_post_empty_event=noop,
+            mark_os_window_for_close=noop, mark_pending_title_updates=noop),
+        kitty.tabs: dict(
+            Child=HeadlessChild, add_tab=lambda os_window_id: next(ids), remove_tab=noop, remove_window=noop, set_active_tab=noop,
+            swap_tabs=noop, mark_tab_bar_dirty=noop, glfw_post_empty_event=noop, x11_window_id=lambda os_window_id: 0,
+            next_window_id=lambda: last_window_id + 1),
+        kitty.window: dict(
+            add_window=add_window, set_window_render_data=noop, update_window_title=noop,
+            update_window_visibility=noop, set_titlebar_color=noop, glfw_post_empty_event=noop,
+            viewport_for_window=viewport_for_window, cell_size_for_window=lambda os_window_id: (CELL_WIDTH, CELL_HEIGHT)),
+        kitty.tab_bar: dict(
+            set_tab_bar_render_data=noop, viewport_for_window=viewport_for_window,
+            cell_size_for_window=lambda os_window_id: (CELL_WIDTH, CELL_HEIGHT)),
+        kitty.layout: dict(set_active_window=noop, swap_windows=noop, viewport_for_window=viewport_for_window),
+        kitty.borders: dict(set_borders_rects=noop),
+    }
+    set_options(defaults)
+    with ExitStack() as stack:
+        for module, values in stubs.items():
+            stack.enter_context(patch.multiple(module, **values))
+        yield
+    set_boss(None)
+
+
+def create_boss(num_tabs, num_windows):
+    # Must be called inside headless()
+    import kitty.boss
+    from kitty.cli import parse_args
+    args, rest = parse_args(args=[])
+    args.args = rest
+    boss = kitty.boss.Boss(1, defaults, args, {}, None)
+    tm = boss.active_tab_manager
+    with boss.deferred_relayouts():
+        for i in range(num_tabs):
+            tab = tm.active_tab if i == 0 else tm.new_tab()
+            tab.set_title('tab {}'.format(i))
+            while len(tab) < num_windows:
+                tab.new_window()
+    for tab in tm:
+        tab.relayout()
+    return boss
+
+
 class BaseTest(TestCase):
 
     ae = TestCase.assertEqual
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2019, Kovid Goyal <kovid at kovidgoyal.net>
+
+# Benchmark the operations done by the Boss on large sessions, without any
+# OS windows, OpenGL or child processes, see headless(). Run as:
+# python3 test.py --bench or python3 -m kitty_tests.bench_boss
+
+import json
+import sys
+
+from kitty.cmds import ls
+
+from . import create_boss, headless, timed
+
+SIZES = ((1, 10), (10, 10), (10, 100), (100, 10))
+
+
+def benchmark(num_tabs, num_windows, repeat=20):
+    boss = create_boss(num_tabs, num_windows)
+    tm = boss.active_tab_manager
+    tab = tm.active_tab
+    windows = list(boss.all_windows)
+    last = windows[-1]
+    ans = {}
+    new_windows = []
+    ans['new_window'] = timed(lambda: new_windows.append(tab.new_window()), repeat)
+    ans['close_window'] = timed(lambda: boss.close_window(new_windows.pop()), repeat)
+
+    def relayout():
+        tab.current_layout.last_layout = None
+        tab.relayout()
+
+    ans['relayout'] = timed(relayout, repeat)
+    ans['tab_bar_data'] = timed(lambda: tm.tab_bar_data, repeat)
+    ans['match_windows_title'] = timed(lambda: list(boss.match_windows('title:nomatch')), repeat)
+    ans['match_windows_id'] = timed(lambda: list(boss.match_windows('id:{}'.format(last.id))), repeat)
+    ans['match_windows_pid'] = timed(lambda: list(boss.match_windows('pid:{}'.format(last.child.pid))), repeat)
+    ans['match_tabs'] = timed(lambda: list(boss.match_tabs('title:nomatch')), repeat)
+    ans['ls'] = timed(lambda: ls(boss, None), repeat)
+    return ans
+
+
+def run_benchmarks(names=(), sizes=SIZES, repeat=20):
+    results = []
+    with headless():
+        for num_tabs, num_windows in sizes:
+            timings = benchmark(num_tabs, num_windows, repeat)
+            for name, t in timings.items():
+                if not names or name in names:
+                    results.append({'operation': name, 'tabs': num_tabs, 'windows_per_tab': num_windows, 'ms': round(t * 1000, 4)})
+    return {'python': sys.version.split()[0], 'repeat': repeat, 'results': results}
+
+
+def main(names=()):
+    json.dump(run_benchmarks(names), sys.stdout, indent=2)
+    print()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
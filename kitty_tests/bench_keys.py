@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2019, Kovid Goyal <kovid at kovidgoyal.net>
+
+# Benchmark the work done for every key press: encoding the key for the
+# program running in the window, which is done in C with the tables from
+# kitty/keys.h, and looking up the shortcuts of special keys, which is done
+# in python. Run as: python3 -m kitty_tests.bench_keys
+
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+import kitty.fast_data_types as defines
+from kitty.config import defaults
+from kitty.keys import get_shortcut
+
+from . import timed
+
+KEYS = {
+    'a': (defines.GLFW_KEY_A, 0),
+    'ctrl+c': (defines.GLFW_KEY_C, defines.GLFW_MOD_CONTROL),
+    'alt+x': (defines.GLFW_KEY_X, defines.GLFW_MOD_ALT),
+    'up': (defines.GLFW_KEY_UP, 0),
+    'ctrl+shift+left': (defines.GLFW_KEY_LEFT, defines.GLFW_MOD_CONTROL | defines.GLFW_MOD_SHIFT),
+    'f5': (defines.GLFW_KEY_F5, 0),
+    'enter': (defines.GLFW_KEY_ENTER, 0),
+}
+MODES = {'normal': (False, False), 'application': (True, False), 'extended': (False, True)}
+
+
+def import_time(module):
+    # Measured in a new process, after fast_data_types is imported
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = 'import time, kitty.fast_data_types; s = time.monotonic(); import {}; print(time.monotonic() - s)'.format(module)
+    timings = sorted(float(subprocess.check_output([sys.executable, '-c', script], cwd=base)) for i in range(11))
+    return timings[len(timings) // 2] * 1000
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark the latency of handling key presses')
+    parser.add_argument('--count', default=200000, type=int, help='Number of key presses for each measurement')
+    args = parser.parse_args()
+    key_to_bytes = defines.key_to_bytes
+    print('{:>20} {:>12} {:>12}'.format('key', 'mode', 'encode (us)'))
+    for name, (key, mods) in KEYS.items():
+        for mode, (smkx, extended) in MODES.items():
+            us = timed(lambda: key_to_bytes(key, smkx, extended, mods, defines.GLFW_PRESS), args.count) * 1e6
+            print('{:>20} {:>12} {:>12.3f}'.format(name, mode, us))
+
+    print()
+    keymap, sequence_map = defaults.keymap, defaults.sequence_map
+    ctrl_shift = defines.GLFW_MOD_CONTROL | defines.GLFW_MOD_SHIFT
+    print('{:>20} {:>12}'.format('shortcut lookup', 'time (us)'))
+    for name, (m, mods, key) in {
+        'shortcut': (keymap, ctrl_shift, defines.GLFW_KEY_C),
+        'not a shortcut': (keymap, ctrl_shift, defines.GLFW_KEY_X),
+        'sequence': (sequence_map, ctrl_shift, defines.GLFW_KEY_P),
+    }.items():
+        print('{:>20} {:>12.3f}'.format(name, timed(lambda: get_shortcut(m, mods, key, 0), args.count) * 1e6))
+
+    print()
+    print('{:>20} {:>12.2f}'.format('import kitty.keys (ms)', import_time('kitty.keys')))
+
+
+if __name__ == '__main__':
+    main()
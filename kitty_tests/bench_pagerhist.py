@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2018, Kovid Goyal <kovid at kovidgoyal.net>
+
+# Benchmark the memory used by the pager history and the speed of getting
+# its contents as text. Run as: python3 -m kitty_tests.bench_pagerhist
+
+import tempfile
+import tracemalloc
+from argparse import ArgumentParser
+from random import Random
+from string import ascii_letters, digits, punctuation
+from time import monotonic
+
+from kitty.fast_data_types import (
+    Cursor, HistoryBuf, LineBuf, set_pagerhist_storage_dir
+)
+
+KINDS = {
+    'ascii': ascii_letters + digits + punctuation + ' ' * 10,
+    'unicode': ascii_letters + ' ' * 10 + 'äöüßéèàçñ' + '日本語中文' + '☃★♥',
+}
+
+
+def generate_lines(kind, count, width, seed):
+    rng = Random(seed)
+    chars = KINDS['unicode' if kind == 'unicode' else 'ascii']
+    for i in range(count):
+        yield ''.join(rng.choices(chars, k=rng.randint(width // 4, width - 1)))
+
+
+def fill(hb, kind, count, seed):
+    lb = LineBuf(1, hb.xnum)
+    c = Cursor()
+    for i, text in enumerate(generate_lines(kind, count, hb.xnum, seed)):
+        if kind == 'color':
+            c.fg = ((i % 8) << 8) | 1
+            c.bold = bool(i & 1)
+        lb.line(0).set_text(text, 0, len(text), c)
+        hb.push(lb.line(0))
+
+
+def as_text(hb):
+    h = []
+    hb.pagerhist_as_text(h.append)
+    return ''.join(h)
+
+
+def run(kind, args, storage_dir=None):
+    tracemalloc.start()
+    # count only the memory used by the pager history, not the history buffer itself
+    empty = HistoryBuf(args.lines, args.columns)
+    before = tracemalloc.get_traced_memory()[0]
+    del empty
+    set_pagerhist_storage_dir(storage_dir)
+    try:
+        hb = HistoryBuf(args.lines, args.columns, int(args.size * 1024 * 1024))
+    finally:
+        set_pagerhist_storage_dir(None)
+    fill(hb, kind, args.count, args.seed)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    start = monotonic()
+    for i in range(args.repeat):
+        text = as_text(hb)
+    elapsed = (monotonic() - start) / args.repeat
+    mode = 'on disk' if storage_dir else 'in memory'
+    print('{:>8} {:>10}: {:>8.2f} MB used, {:>5.2f} bytes/char (UCS-4: 4), {:>8} lines kept, as_text: {:>7.1f} MB/s'.format(
+        kind, mode, used / 1024 / 1024, used / max(1, len(text)), text.count('\n'), len(text) / 1024 / 1024 / max(elapsed, 1e-9)))
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark the pager history')
+    parser.add_argument('--size', default=10, type=float, help='Size of the pager history in MB')
+    parser.add_argument('--count', default=100000, type=int, help='Number of lines to push into the history')
+    parser.add_argument('--columns', default=120, type=int, help='Width of the history buffer')
+    parser.add_argument('--lines', default=100, type=int, help='Number of lines in the history buffer')
+    parser.add_argument('--repeat', default=3, type=int, help='Number of times to get the history as text')
+    parser.add_argument('--seed', default='pagerhist', help='Seed for the generated text')
+    parser.add_argument('--on-disk', action='store_true', help='Also benchmark storing the pager history on disk')
+    args = parser.parse_args()
+    for kind in ('ascii', 'color', 'unicode'):
+        run(kind, args)
+        if args.on_disk:
+            with tempfile.TemporaryDirectory() as tdir:
+                run(kind, args, tdir)
+
+
+if __name__ == '__main__':
+    main()
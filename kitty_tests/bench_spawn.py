@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2019, Kovid Goyal <kovid at kovidgoyal.net>
+
+# Benchmark the latency of creating the child process of a new window, with
+# and without the spawn helper, as the memory used by kitty grows.
+# Run as: python3 -m kitty_tests.bench_spawn
+
+import os
+from argparse import ArgumentParser
+from time import monotonic
+
+from kitty.child import Child
+from kitty.config import defaults
+from kitty.spawn_helper import (
+    spawn_helper, start_spawn_helper, stop_spawn_helper
+)
+
+from .child import read_output
+
+
+def measure(args):
+    spawned, output = [], []
+    for i in range(args.count):
+        child = Child(['echo', 'ready'], '/', defaults)
+        start = monotonic()
+        child.fork()
+        spawned.append(monotonic() - start)
+        child.mark_terminal_ready()
+        read_output(child)
+        output.append(monotonic() - start)
+        os.close(child.child_fd)
+        try:
+            os.waitpid(child.pid, 0)
+        except ChildProcessError:
+            pass  # reaped by the spawn helper
+    spawned.sort(), output.sort()
+    return spawned[len(spawned) // 2] * 1000, output[len(output) // 2] * 1000
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark the latency of creating new windows')
+    parser.add_argument('--count', default=100, type=int, help='Number of children to create for each measurement')
+    parser.add_argument('--memory', default='0,256,1024', help='Comma separated list of amounts of memory (in MB) for kitty to use')
+    args = parser.parse_args()
+    # The helper is started while kitty is small, as it is at startup
+    helper = start_spawn_helper(os.environ.copy())
+    ballast = []
+    try:
+        print('{:>10} {:>10} {:>16} {:>18}'.format('memory (MB)', 'helper', 'fork() (ms)', 'first output (ms)'))
+        for mb in map(int, args.memory.split(',')):
+            # Touch every page, so that it has to be mapped in the forked child
+            while len(ballast) < mb:
+                ballast.append(bytearray(b'x' * (1024 * 1024)))
+            for use_helper in (False, True):
+                if use_helper:
+                    spawn_helper.ans = helper
+                else:
+                    spawn_helper.__dict__.pop('ans', None)
+                spawned, output = measure(args)
+                print('{:>10} {:>10} {:>16.2f} {:>18.2f}'.format(mb, 'yes' if use_helper else 'no', spawned, output))
+    finally:
+        spawn_helper.ans = helper
+        stop_spawn_helper()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2019, Kovid Goyal <kovid at kovidgoyal.net>
+
+# Benchmark the time taken to load the default options and the config
+# file, with an empty and a populated options cache, and the cold start time
+# of the command line clients.
+# Run as: python3 -m kitty_tests.bench_startup
+
+import os
+import subprocess
+import sys
+import tempfile
+from argparse import ArgumentParser
+from time import monotonic
+
+from . import timed
+
+LOAD = '''
+import sys
+from time import monotonic
+start = monotonic()
+from kitty.config import load_config
+imported = monotonic()
+load_config(sys.argv[-1])
+print(imported - start, monotonic() - imported)
+'''
+
+
+def write_config(path, num_lines):
+    from kitty.conf.definition import as_conf_file
+    from kitty.config_data import all_options
+    # The settings from the default config file, as many users start from it
+    lines = [x for x in as_conf_file(all_options.values()) if x and not x.startswith('#')]
+    lines = lines[:num_lines] if num_lines > 0 else lines
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines))
+    return len(lines)
+
+
+def run(config, cache_dir, python):
+    env = dict(os.environ, KITTY_CACHE_DIRECTORY=cache_dir)
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    start = monotonic()
+    out = subprocess.check_output([python, '-c', LOAD, config], env=env, cwd=base)
+    total = monotonic() - start
+    return [total] + list(map(float, out.split()))
+
+
+def run_client(args, python):
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    start = monotonic()
+    subprocess.run([python, os.path.join(base, '__main__.py')] + args, input=b'kitty\n', stdout=subprocess.DEVNULL, check=True)
+    return monotonic() - start
+
+
+def median(vals):
+    vals = sorted(vals)
+    return vals[len(vals) // 2] * 1000
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark loading the options, with and without the options cache')
+    parser.add_argument('--repeat', default=20, type=int, help='Number of times to start the python interpreter')
+    parser.add_argument('--lines', default=0, type=int, help='Number of lines in the config file, all the settings from the default config if zero')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tdir:
+        config = os.path.join(tdir, 'kitty.conf')
+        num_lines = write_config(config, args.lines)
+        print('Config file with {} lines, median of {} runs'.format(num_lines, args.repeat))
+        print('{:>12} {:>14} {:>20} {:>18}'.format('cache', 'process (ms)', 'import config (ms)', 'load_config (ms)'))
+        for mode in ('empty', 'populated'):
+            timings = []
+            for i in range(args.repeat):
+                cache_dir = os.path.join(tdir, 'cache-{}-{}'.format(mode, i if mode == 'empty' else 0))
+                os.makedirs(cache_dir, exist_ok=True)
+                if mode == 'populated' and i == 0:
+                    run(config, cache_dir, sys.executable)
+                timings.append(run(config, cache_dir, sys.executable))
+            print('{:>12} {:>14.2f} {:>20.2f} {:>18.2f}'.format(mode, *(median(x) for x in zip(*timings))))
+
+        # Compare parsing with reading the cache, without the cost of
+        # writing the cache, in this process
+        os.environ['KITTY_CACHE_DIRECTORY'] = os.path.join(tdir, 'cache-populated-0')
+        import kitty.config as c
+        from kitty.conf.definition import config_lines
+        from kitty.config_data import all_options
+        print()
+        print('{:>12} {:>14} {:>14}'.format('', 'parse (ms)', 'cached (ms)'))
+        print('{:>12} {:>14.2f} {:>14.2f}'.format(
+            'defaults', timed(lambda: c.parse_defaults(config_lines(all_options)), args.repeat) * 1000, timed(c.load_defaults, args.repeat) * 1000))
+
+    print()
+    print('{:>24} {:>14}'.format('client', 'process (ms)'))
+    for client in (['@', 'ls', '--help'], ['+complete', 'bash'], ['+kitten', 'icat', '--help']):
+        print('{:>24} {:>14.2f}'.format(' '.join(client), median([run_client(client, sys.executable) for i in range(args.repeat)])))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2019, Kovid Goyal <kovid at kovidgoyal.net>
+
+import os
+import select
+from time import monotonic
+
+from . import BaseTest
+from kitty.child import Child
+from kitty.config import defaults
+from kitty.spawn_helper import (
+    spawn_helper, start_spawn_helper, stop_spawn_helper
+)
+
+
+def read_output(child, timeout=10):
+    ans = b''
+    end = monotonic() + timeout
+    while monotonic() < end:
+        if select.select([child.child_fd], [], [], 0.1)[0]:
+            try:
+                data = os.read(child.child_fd, 4096)
+            except OSError:
+                break  # EIO when the child has exited
+            if not data:
+                break
+            ans += data
+    return ans.decode('utf-8').replace('\r\n', '\n')
+
+
+def run_child(cmd, cwd, stdin=None):
+    child = Child(['sh', '-c', cmd], cwd, defaults, stdin=stdin, env={'KITTY_TEST_VAR': 'from kitty'})
+    child.fork()
+    child.mark_terminal_ready()
+    try:
+        return child, read_output(child)
+    finally:
+        os.close(child.child_fd)
+
+
+class TestChild(BaseTest):
+
+    def test_spawn_helper(self):
+        cwd = os.path.realpath('/')
+        cmd = 'echo "$PWD $KITTY_TEST_VAR $TERM"; read x; echo "got $x"'
+        expected = '{} from kitty {}\ngot input\n'.format(cwd, defaults.term)
+        child, direct = run_child(cmd, cwd, stdin=b'input\n')
+        os.waitpid(child.pid, 0)
+        self.ae(direct, expected)
+        start_spawn_helper(dict(os.environ, KITTY_TEST_VAR='overridden'))
+        try:
+            helper = spawn_helper()
+            child, output = run_child(cmd, cwd, stdin=b'input\n')
+            self.ae(output, expected)
+            # the child was forked by the helper, which reaps it
+            self.assertRaises(ChildProcessError, os.waitpid, child.pid, 0)
+            self.assertIsNot(spawn_helper(), None)
+        finally:
+            stop_spawn_helper()
+        self.assertIs(spawn_helper(), None)
+        self.assertRaises(ChildProcessError, os.waitpid, helper.pid, os.WNOHANG)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2019, Kovid Goyal <kovid at kovidgoyal.net>
+
+import json
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from kitty.cmds import batch, cmd_batch, parse_subcommand_cli
+
+from . import BaseTest, create_boss, headless
+
+
+def run_batch(boss, *commands):
+    opts, args = parse_subcommand_cli(cmd_batch, ['batch'] + list(commands))
+    payload = cmd_batch(SimpleNamespace(no_command_response=None), opts, args)
+    return json.loads(batch(boss, None, payload))
+
+
+class TestCmds(BaseTest):
+
+    def test_batch(self):
+        with headless():
+            boss = create_boss(1, 1)
+            tab = boss.active_tab
+            tab.borders = Mock(wraps=tab.borders)
+            results = run_batch(
+                boss, 'set-tab-title One', 'resize-window --increment 2',
+                'new-window --title two', 'new-window --title three')
+            self.ae(results, [
+                {'ok': True},
+                # the fat layout cannot resize a single window
+                {'ok': False, 'error': 'Could not resize'},
+                {'ok': True, 'data': str(tab.windows[1].id)},
+                {'ok': True, 'data': str(tab.windows[2].id)},
+            ])
+            self.ae(tab.name, 'One')
+            self.ae([w.title for w in tab][1:], ['two', 'three'])
+            # the borders are drawn only once, after all the commands
+            self.ae(tab.borders.call_count, 1)
+            self.assertIsNone(boss.pending_border_relayouts)
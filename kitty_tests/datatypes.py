@@ -5,10 +5,12 @@
 import os
 import tempfile
 
+from kitty.child import parse_environ_block
 from kitty.config import build_ansi_color_table, defaults
 from kitty.fast_data_types import (
     REVERSE, ColorProfile, Cursor as C, HistoryBuf, LineBuf,
-    parse_input_from_terminal, truncate_point_for_length, wcswidth, wcwidth
+    parse_input_from_terminal, set_pagerhist_storage_dir,
+    truncate_point_for_length, wcswidth, wcwidth
 )
 from kitty.rgb import to_color
 from kitty.utils import is_path_in_temp_dir, sanitize_title
@@ -43,6 +45,11 @@ class TestDataTypes(BaseTest):
         c('rgb:23/45/67', 0x23, 0x45, 0x67)
         c('rgb:abc/abc/def', 0xab, 0xab, 0xde)
         c('red', 0xff)
+        c(' Alice Blue ', 0xf0, 0xf8, 0xff)
+        c('aliceblue', 0xf0, 0xf8, 0xff)
+        c('yellowgreen', 0x9a, 0xcd, 0x32)
+        for x in ('alice', 'alice blue:f0f8ff', 'tan:d2b48c\ntomato'):
+            self.assertIsNone(to_color(x))
 
     def test_linebuf(self):
         old = filled_line_buf(2, 3, filled_cursor())
@@ -393,6 +400,10 @@ class TestDataTypes(BaseTest):
         for path in ('/home/xy/d.png', '/tmp/../home/x.jpg'):
             self.assertFalse(is_path_in_temp_dir(os.path.join(path)))
 
+    def test_parse_environ_block(self):
+        self.ae(parse_environ_block('a=1\0b=x=y\0c\0=d\0e=\0\0f=2\0'), {'a': '1', 'b': 'x=y', 'e': ''})
+        self.ae(parse_environ_block('a=1\0b=2'), {'a': '1'})
+
     def test_color_profile(self):
         c = ColorProfile()
         c.update_ansi_color_table(build_ansi_color_table())
@@ -402,6 +413,14 @@ class TestDataTypes(BaseTest):
         self.ae(c.as_color(255 << 8 | 1), (0xee, 0xee, 0xee))
 
     def test_historybuf(self):
+        import tracemalloc
+        tracemalloc.start()
+        hb = HistoryBuf(10000, 100)
+        # No memory is used for lines until some are added
+        self.assertLess(tracemalloc.get_traced_memory()[0], 100 * 1024)
+        tracemalloc.stop()
+        self.ae(hb.count, 0)
+        self.ae(str(hb), '')
         lb = filled_line_buf()
         hb = HistoryBuf(5, 5)
         hb.push(lb.line(1))
@@ -424,6 +443,12 @@ class TestDataTypes(BaseTest):
             hb.push(line)
         for i in range(3000):
             self.ae(str(hb.line(i)).rstrip(), str(3000 - 1 - i))
+        self.ae(hb.lines_added, 3000)
+        hb.push(lb.line(1))
+        self.ae((hb.count, hb.lines_added), (3000, 3001))
+        h = []
+        hb.as_text(h.append, False, False, 2997, 10)
+        self.ae(''.join(h).split(), ['2998', '2999', '2999'])
 
         # rewrap
         hb = filled_history_buf(5, 5)
@@ -440,12 +465,14 @@ class TestDataTypes(BaseTest):
                 hb2.line(i)
         hb2 = HistoryBuf(3, 5)
         hb.rewrap(hb2)
+        self.ae(hb2.lines_added, hb.lines_added)
         for i in range(hb2.ynum):
             self.ae(hb2.line(i), hb.line(i))
         self.ae(hb2.dirty_lines(), list(range(hb2.ynum)))
         hb = filled_history_buf(5, 5)
         hb2 = HistoryBuf(hb.ynum, hb.xnum * 2)
         hb.rewrap(hb2)
+        self.ae(hb2.lines_added, hb.lines_added)
         hb3 = HistoryBuf(hb.ynum, hb.xnum)
         hb2.rewrap(hb3)
         for i in range(hb.ynum):
@@ -456,6 +483,88 @@ class TestDataTypes(BaseTest):
         hb2 = HistoryBuf(large_hb.ynum, large_hb.xnum)
         large_hb.rewrap(hb2)
 
+    def test_pagerhist_storage(self):
+
+        def fill(hb):
+            lb = LineBuf(1, hb.xnum)
+            c = C()
+            for i in range(60000):
+                t = 'l{}é'.format(i)
+                lb.line(0).set_text(t, 0, len(t), c)
+                hb.push(lb.line(0))
+            h = []
+            hb.pagerhist_as_text(h.append)
+            return ''.join(h)
+
+        in_memory = fill(HistoryBuf(2, 10, 1024 * 1024))
+        with tempfile.TemporaryDirectory() as tdir:
+            set_pagerhist_storage_dir(tdir)
+            try:
+                hb = HistoryBuf(2, 10, 1024 * 1024)
+            finally:
+                set_pagerhist_storage_dir(None)
+            self.assertFalse(os.listdir(tdir))
+        self.ae(fill(hb), in_memory)
+        self.assertIn('l0é', in_memory)
+        h, offset = [], 0
+        while True:
+            num = hb.pagerhist_as_text(h.append, offset, 1000)
+            if not num:
+                break
+            offset += num
+        self.ae(''.join(h), in_memory)
+
+    def test_historybuf_search(self):
+        hb = HistoryBuf(500, 10)
+        lb = LineBuf(1, hb.xnum)
+        c = C()
+
+        def push(t, continued=False):
+            lb.line(0).set_text(t, 0, len(t), c)
+            lb.set_continued(0, continued)
+            hb.push(lb.line(0))
+
+        def brute(query, ignore_case=False):
+            first = hb.lines_added - hb.count
+            texts = [str(hb.line(hb.count - 1 - i)) for i in range(hb.count)]
+            ans = []
+            for i, t in enumerate(texts):
+                if i + 1 < hb.count and hb.line(hb.count - 2 - i).is_continued():
+                    t += texts[i + 1]
+                pos = (t.lower() if ignore_case else t).find(query, 0, len(texts[i]) + len(query) - 1)
+                if pos > -1:
+                    ans.append((first + i, pos))
+            return ans
+
+        def matches(query, ignore_case=False, limit=0):
+            return [x[:2] for x in hb.search(query, ignore_case, limit)]
+
+        for i in range(300):
+            push('line {}'.format(i))
+        self.ae(hb.search('line 299'), [(299, 0, 'line 299')])
+        for q in ('line 12', 'ne 29', 'ne', '9', 'LINE 1', 'nothing'):
+            self.ae(matches(q), brute(q))
+        self.ae(matches('LINE 1', True), brute('line 1', True))
+        self.ae(matches('line 1', limit=3), brute('line 1')[-3:])
+        # Lines that wrap are indexed as they are added and matches can span them
+        push('abcdefghij')
+        push('klmnopqrst', True)
+        self.ae(hb.search('hijklm'), [(300, 7, 'abcdefghijklmnopqrst')])
+        self.ae(matches('jkl'), brute('jkl'))
+        # Lines are numbered and indexed correctly after the buffer wraps
+        for i in range(1000):
+            push('x{}'.format(i))
+        self.ae(hb.lines_added, 1302)
+        for q in ('x1', 'x50', 'x999', 'line', 'x5', 'x12'):
+            self.ae(matches(q), brute(q))
+        hb2 = HistoryBuf(300, 7)
+        hb.rewrap(hb2)
+        hb = hb2
+        for q in ('x1', 'x999', 'x5'):
+            self.ae(matches(q), brute(q))
+        push('ix999')
+        self.ae(matches('x999'), brute('x999'))
+
     def test_ansi_repr(self):
         lb = filled_line_buf()
         l0 = lb.line(0)
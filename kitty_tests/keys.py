@@ -5,9 +5,7 @@
 from functools import partial
 
 import kitty.fast_data_types as defines
-from kitty.keys import (
-    interpret_key_event, modify_complex_key, modify_key_bytes, smkx_key_map
-)
+from kitty.keys import interpret_key_event, modify_complex_key
 
 from . import BaseTest
 
@@ -64,20 +62,19 @@ class TestParser(BaseTest):
             k('[' + str(num) + '~', 'F{}'.format(key))
 
         # test modifiers
-        SPECIAL_KEYS = 'UP DOWN RIGHT LEFT HOME END INSERT DELETE PAGE_UP PAGE_DOWN '
+        SPECIAL_KEYS = dict(zip(
+            'UP DOWN RIGHT LEFT HOME END INSERT DELETE PAGE_UP PAGE_DOWN'.split(),
+            'kcuu1 kcud1 kcuf1 kcub1 khome kend kich1 kdch1 kpp knp'.split()))
         for i in range(1, 13):
-            SPECIAL_KEYS += 'F{} '.format(i)
-        SPECIAL_KEYS = SPECIAL_KEYS.strip().split()
+            SPECIAL_KEYS['F{}'.format(i)] = 'kf{}'.format(i)
         for mods, num in zip(('CONTROL', 'ALT', 'SHIFT+ALT'), '534'):
             fmods = 0
             num = int(num)
             for m in mods.split('+'):
                 fmods |= getattr(defines, 'GLFW_MOD_' + m)
             km = partial(k, mods=fmods)
-            for key in SPECIAL_KEYS:
-                keycode = getattr(defines, 'GLFW_KEY_' + key)
-                base_key = smkx_key_map[keycode]
-                km(modify_key_bytes(base_key, num).decode('ascii')[1:], key)
+            for key, terminfo_name in SPECIAL_KEYS.items():
+                km(modify_complex_key(terminfo_name, num).decode('ascii')[1:], key)
 
     def test_encode_mouse_event(self):
         PRESS, RELEASE, DRAG, MOVE = range(4)
@@ -2,9 +2,10 @@
 # vim:fileencoding=utf-8
 # License: GPL v3 Copyright: 2018, Kovid Goyal <kovid at kovidgoyal.net>
 
-from . import BaseTest
+from . import BaseTest, timed
 from kitty.config import defaults
-from kitty.layout import Stack, Horizontal, idx_for_id
+from kitty.constants import WindowGeometry
+from kitty.layout import Grid, Stack, Horizontal, idx_for_id
 from kitty.fast_data_types import pt_to_px
 
 
@@ -15,6 +16,8 @@ class Window:
         self.overlay_for = overlay_for
         self.overlay_window_id = overlay_window_id
         self.is_visible_in_layout = True
+        self.geometry = None
+        self.needs_layout = False
 
     def set_visible_in_layout(self, idx, val):
         self.is_visible_in_layout = bool(val)
@@ -180,3 +183,121 @@ class TestLayout(BaseTest):
         for layout_class in Stack, Horizontal:
             q = create_layout(layout_class)
             self.do_overlay_test(q)
+
+    def test_grid_topology(self):
+        q = create_layout(Grid)
+        windows = create_windows(120)
+        q(windows, 0)
+        # ten columns of ten windows and a last column of twenty windows
+        self.ae(q.calc_grid_size(len(windows)), (11, 10, 20, 10))
+        for i, w in enumerate(windows):
+            n = q.neighbors_for_window(w, windows)
+            for other in n['bottom']:
+                self.ae(q.neighbors_for_window(other, windows)['top'], [w])
+            if i < 90:
+                for other in n['right']:
+                    self.ae(q.neighbors_for_window(other, windows)['left'], [w])
+        self.ae([w.id for w in q.neighbors_for_window(windows[0], windows)['right']], [11])
+        self.ae([w.id for w in q.neighbors_for_window(windows[11], windows)['top']], [11])
+        self.ae([w.id for w in q.neighbors_for_window(windows[119], windows)['left']], [100])
+        self.ae(q.neighbors_for_window(windows[119], windows)['bottom'], [])
+        borders = list(q.minimal_borders(windows, windows[0], {w.id: False for w in windows}))
+        self.ae(len(borders), len(windows))
+        self.ae(borders[0], (False, False, True, True))
+        # The topology is not used for a different set of windows
+        del windows[5]
+        self.assertIsNone(q.topology_for(windows))
+        self.ae(len(list(q.minimal_borders(windows, windows[0], {w.id: False for w in windows}))), len(windows))
+
+    def test_layout_cache(self):
+        calls = []
+
+        class W(Window):
+
+            def set_geometry(self, idx, geometry):
+                calls.append(self.id)
+                Window.set_geometry(self, idx, geometry)
+
+        q = create_layout(Horizontal)
+        windows = [W(i + 1) for i in range(3)]
+        q(windows, 0)
+        self.ae(calls, [1, 2, 3])
+        del calls[:]
+        # Nothing changed
+        self.ae(q(windows, 0), 0)
+        self.ae(calls, [])
+        # A different active window, a changed bias, a geometry changed by
+        # something else and a window that needs layout all mean a relayout
+        q(windows, 1)
+        self.ae(calls, [1, 2, 3])
+        del calls[:]
+        q.biased_map = {0: 0.1}
+        q(windows, 1)
+        self.ae(calls, [1, 2, 3])
+        del calls[:]
+        windows[2].geometry = windows[1].geometry
+        q(windows, 1)
+        self.ae(calls, [1, 2, 3])
+        del calls[:]
+        windows[0].needs_layout = True
+        q(windows, 1)
+        self.ae(calls, [1, 2, 3])
+        del calls[:]
+        windows.append(W(4))
+        q(windows, 1)
+        self.ae(calls, [1, 2, 3, 4])
+
+    def test_borders_rects(self):
+        from kitty.borders import Borders, BorderColor
+
+        class W(Window):
+            needs_attention = False
+
+            class screen:
+                class color_profile:
+                    default_bg = 0x123456
+
+        q = create_layout(Horizontal)
+        windows = [W(i + 1) for i in range(3)]
+        q(windows, 0)
+        # the viewport in the tests is too small for real geometries
+        q.blank_rects = []
+        for i, w in enumerate(windows):
+            w.geometry = WindowGeometry(100 * i + 10, 10, 100 * i + 90, 90, 8, 8)
+        b = Borders(1, 1, defaults, 2, 1)
+        r0 = b.rects(windows, windows[0], q, [])
+        self.ae(len(r0) % 5, 0)
+        # four border and four padding rects per window
+        self.ae(len(r0), 3 * 8 * 5)
+        self.assertIn(BorderColor.active, r0[4::5])
+        # A focus change only changes the colors of some border rects
+        r1 = b.rects(windows, windows[1], q, [])
+        self.ae(len(r0), len(r1))
+        self.ae([x for i, x in enumerate(r0) if i % 5 != 4], [x for i, x in enumerate(r1) if i % 5 != 4])
+        changed = [i for i in range(4, len(r0), 5) if r0[i] != r1[i]]
+        self.assertTrue(0 < len(changed) < len(r0) // 5)
+        self.ae(r0, b.rects(windows, windows[0], q, []))
+
+
+def benchmark(num_windows=(10, 100, 200), repeat=100):
+    # Time the operations done on a grid layout for every keypress that changes
+    # the active window. Run as: python3 -m kitty_tests.layout
+    for n in num_windows:
+        q = create_layout(Grid)
+        windows = create_windows(n)
+        needs_borders_map = {w.id: False for w in windows}
+
+        def layout():
+            q.last_layout = None
+            q(windows, 0)
+
+        timings = {
+            'layout': timed(layout, repeat),
+            'borders': timed(lambda: list(q.minimal_borders(windows, windows[0], needs_borders_map)), repeat),
+            'neighbors': timed(lambda: [q.neighbors_for_window(w, windows) for w in windows[:10]], repeat),
+        }
+        print('{:>4} windows: {}'.format(n, ', '.join('{}: {:.3f}ms'.format(k, v * 1000) for k, v in timings.items())))
+
+
+if __name__ == '__main__':
+    benchmark()
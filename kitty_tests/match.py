@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2019, Kovid Goyal <kovid at kovidgoyal.net>
+
+from weakref import WeakValueDictionary
+
+from . import BaseTest
+from kitty.match import Term, compile_match, match_tabs, match_windows
+from kitty.window import Window
+
+
+class Child:
+
+    def __init__(self, pid, cwd, cmdline, env):
+        self.pid, self.cwd, self.current_cwd, self.cmdline, self.environ = pid, cwd, cwd, cmdline, env
+
+
+class FakeWindow:
+
+    destroyed = False
+    override_title = None
+    matches = Window.matches
+
+    def __init__(self, wid, title, cwd='/', cmdline=('sh',), env={}):
+        self.id, self.title = wid, title
+        self.child = Child(wid + 1000, cwd, list(cmdline), dict(env))
+
+
+class FakeTab:
+
+    def __init__(self, tid, title, windows):
+        self.id, self.name, self.title, self.windows = tid, '', title, windows
+
+    def __iter__(self):
+        return iter(self.windows)
+
+    def matches(self, field, pat):
+        return field == 'title' and pat.search(self.title) is not None
+
+    def get_nth_window(self, n):
+        return self.windows[n]
+
+
+class FakeBoss:
+
+    def __init__(self, tabs):
+        self.tabs = tabs
+        self.active_tab = tabs[0]
+        self.window_id_map = WeakValueDictionary()
+        self.window_pid_map = WeakValueDictionary()
+        self.tab_id_map = WeakValueDictionary()
+        for tab in tabs:
+            self.tab_id_map[tab.id] = tab
+            for w in tab:
+                self.window_id_map[w.id] = w
+                self.window_pid_map[w.child.pid] = w
+
+    @property
+    def all_tabs(self):
+        return iter(self.tabs)
+
+    @property
+    def all_windows(self):
+        for tab in self.tabs:
+            yield from tab
+
+    def tab_for_window(self, window):
+        for tab in self.tabs:
+            if window in tab.windows:
+                return tab
+
+
+class TestMatch(BaseTest):
+
+    def test_match_expressions(self):
+        windows = [
+            FakeWindow(1, 'vim file.py', cwd='/src', cmdline=('vim', 'file.py')),
+            FakeWindow(2, 'my shell', env={'DEBUG': '1'}),
+            FakeWindow(3, 'htop', cwd='/tmp'),
+            FakeWindow(4, 'vim notes', cwd='/tmp', env={'DEBUG': '0'}),
+        ]
+        boss = FakeBoss([FakeTab(10, 'editing', windows[:2]), FakeTab(11, 'monitoring', windows[2:])])
+
+        def w(expr):
+            return [x.id for x in match_windows(boss, expr)]
+
+        def t(expr):
+            return [x.id for x in match_tabs(boss, expr)]
+
+        self.ae(w('id:3'), [3])
+        self.ae(w('id:33'), [])
+        self.ae(w('id:x'), [])
+        self.ae(w('pid:1002'), [2])
+        self.ae(w('num:1'), [2])
+        self.ae(w('title:vim'), [1, 4])
+        self.ae(w('cwd:/tmp'), [3, 4])
+        self.ae(w('cmdline:file'), [1])
+        self.ae(w('env:DEBUG'), [2, 4])
+        self.ae(w('env:DEBUG=1'), [2])
+        self.ae(w('title:vim and cwd:/tmp'), [4])
+        self.ae(w('title:vim or env:DEBUG=1'), [1, 2, 4])
+        self.ae(w('not title:vim'), [2, 3])
+        self.ae(w('title:vim and not (cwd:/tmp or id:1)'), [])
+        self.ae(w('(title:vim or id:3) and cwd:/tmp'), [3, 4])
+        self.ae(w('id:1 or id:4 or id:1'), [1, 4])
+        self.ae(w('id:4 and title:shell'), [])
+        self.ae(w('title:"my shell" or id:3'), [2, 3])
+        self.ae(w('title:(vim|htop)'), [1, 3, 4])
+        self.ae(w('(title:(vim|htop)) and cwd:/tmp'), [3, 4])
+        # Specifications from before expressions were supported
+        self.ae(w('title:my shell'), [2])
+        self.ae(w('title:(vim or title:htop)'), [])
+        self.ae(w('title:(vim n|ht)'), [3, 4])
+        self.ae(w('title:vim or'), [])
+        self.ae(w('title'), [])
+        self.ae(w(''), [])
+        # Removed windows are not found through the indices
+        del boss.window_id_map[3]
+        self.ae(w('pid:1003'), [])
+        boss.window_id_map[3] = windows[2]
+
+        self.ae(t('id:11'), [11])
+        self.ae(t('id:2'), [10])
+        self.ae(t('title:edit'), [10])
+        self.ae(t('title:htop'), [11])
+        self.ae(t('cwd:/tmp'), [11])
+        self.ae(t('title:edit or title:mon'), [10, 11])
+        self.ae(t('not id:10'), [11])
+        self.ae(t('env:DEBUG=1 or id:11'), [10, 11])
+
+        # Compiled expressions are cached
+        self.assertIs(compile_match('title:vim and id:1'), compile_match('title:vim and id:1'))
+        self.assertIsInstance(compile_match('title:a b'), Term)
+        self.assertIsNone(compile_match('a b'))
+        # A lone term keeps its quotes
+        self.ae(compile_match('title:"x"').pat.pattern, '"x"')
+        self.ae(compile_match('title:"x" or id:1').children[0].pat.pattern, 'x')
+        self.ae(compile_match('title:(a or title:b)').pat.pattern, '(a or title:b)')
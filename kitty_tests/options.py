@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2019, Kovid Goyal <kovid at kovidgoyal.net>
+
+import marshal
+import shutil
+import tempfile
+
+from kitty.config import (
+    cached_parse, decode_options, defaults, encode_options, load_config
+)
+from kitty.constants import cache_dir
+
+from . import BaseTest
+
+
+class TestOptions(BaseTest):
+
+    def test_options_cache(self):
+
+        def roundtrip(opts):
+            data = opts._asdict()
+            q = decode_options(marshal.loads(marshal.dumps(encode_options(data))))
+            # KeyDefinition does not define equality
+            for x in (data, q):
+                x['key_definitions'] = [vars(k) for k in x['key_definitions']]
+            self.ae(q, data)
+
+        roundtrip(defaults)
+        roundtrip(load_config(overrides=('map ctrl+a>b new_window_with_cwd', 'color1 red', 'env A=1')))
+        data = {'a': [1, (2, 3)], 'b': frozenset({'x'})}
+
+        calls = []
+
+        def parse():
+            calls.append(1)
+            return data
+
+        orig, cache_dir.ans = cache_dir(), tempfile.mkdtemp()
+        try:
+            self.ae(cached_parse('test', 1, parse), data)
+            self.ae(cached_parse('test', 1, parse), data)
+            self.ae(len(calls), 1)
+            self.ae(cached_parse('test', 2, parse), data)
+            self.ae(len(calls), 2)
+        finally:
+            shutil.rmtree(cache_dir.ans)
+            cache_dir.ans = orig
@@ -274,6 +274,61 @@ class TestScreen(BaseTest):
         s.resize(s.lines - 1, s.columns)
         self.ae(x_before, s.cursor.x)
 
+    def test_complete_lines(self):
+        s = self.create_screen(scrollback=10)
+
+        def since(seq):
+            lines = []
+            s.complete_lines_as_text(lines.append, seq)
+            return ''.join(lines), s.lines_completed
+
+        def write(*lines):
+            for line in lines:
+                s.draw(line)
+                s.carriage_return(), s.linefeed()
+
+        write('a', 'bb', 'abcdefg')
+        s.draw('part')
+        self.ae(since(0), ('a\nbb\nabcdefg\n', 3))
+        self.ae(since(1), ('bb\nabcdefg\n', 3))
+        self.ae(since(3), ('', 3))
+        self.ae(s.line_seqs([-1, 0, 1, 2, 3, 4, 5]), [0, 0, 1, 2, 2, 3, 3])
+        s.carriage_return(), s.erase_in_line(2)
+        write(*'123456')
+        self.ae(since(3), ('1\n2\n3\n4\n5\n6\n', 9))
+        self.ae(since(0)[0], 'a\nbb\nabcdefg\n1\n2\n3\n4\n5\n6\n')
+        self.ae(s.line_seqs([-5, -4, -3, 4]), [1, 2, 2, 9])
+
+        # Clearing the screen skips the erased lines but does not reuse their numbers
+        s.cursor_position(1, 1), s.erase_in_display(2)
+        self.ae(since(9), ('', 9))
+        write('x', 'y')
+        self.ae(since(9), ('x\ny\n', 11))
+        self.ae(since(0), ('x\ny\n', 11))
+        s.erase_in_display(3)
+        write('z')
+        self.ae(since(10), ('z\n', 12))
+
+        # Rewrapping keeps the numbers of the lines
+        s.reset()
+        self.ae(since(0), ('', 12))
+        write('r', '12345678', 'abc')
+        for lines, columns in ((5, 10), (3, 3), (4, 2), (5, 5)):
+            s.resize(lines, columns)
+            self.ae(since(12), ('r\n12345678\nabc\n', 15))
+            self.ae(since(14), ('abc\n', 15))
+        write('d')
+        self.ae(since(14), ('abc\nd\n', 16))
+
+        # Only the main screen is numbered
+        s.toggle_alt_screen()
+        write('alt')
+        s.resize(5, 3)
+        self.ae(since(15), ('', 16))
+        s.toggle_alt_screen()
+        write('e')
+        self.ae(since(15), ('e\n', 17))
+
     def test_tab_stops(self):
         # Taken from vttest/main.c
         s = self.create_screen(cols=80, lines=2)
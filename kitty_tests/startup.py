@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2019, Kovid Goyal <kovid at kovidgoyal.net>
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import unittest
+
+from kitty.constants import appname, is_macos
+from kitty.startup_profile import ImportTimer
+
+from . import BaseTest
+
+base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestStartup(BaseTest):
+
+    def test_client_imports(self):
+        # The remote control client, completion and kittens must not import
+        # the modules only needed by the GUI process
+        gui_modules = ('kitty.config', 'kitty.tabs', 'kitty.window', 'kitty.rgb', 'kitty.fast_data_types', 'asyncio')
+        for mod in ('kitty.remote_control', 'kitty.complete', 'kittens.runner'):
+            out = subprocess.check_output([sys.executable, '-c', 'import sys, {}; print(*(m for m in {!r} if m in sys.modules))'.format(
+                mod, gui_modules)], cwd=base).decode('utf-8').strip()
+            self.ae(out, '', '{} imported: {}'.format(mod, out))
+
+    def test_import_timer(self):
+        timer = ImportTimer()
+        sys.modules.pop('colorsys', None)
+        timer.install()
+        try:
+            import colorsys  # noqa
+        finally:
+            timer.uninstall()
+        self.assertIn('colorsys', timer.timings)
+        self_time, cumulative = timer.timings['colorsys']
+        self.assertGreater(self_time, 0)
+        self.assertGreaterEqual(cumulative, self_time)
+
+    @unittest.skipIf(is_macos, 'macOS does not have abstract unix sockets')
+    def test_single_instance_client(self):
+        group = 'test-{}'.format(os.getpid())
+        server = socket.socket(family=socket.AF_UNIX)
+        server.bind('\0{}-ipc-{}-{}'.format(appname, os.geteuid(), group))
+        server.listen()
+        script = 'import sys, runpy; sys.argv = {!r}; runpy.run_path("__main__.py", run_name="__main__"); print("kitty.main" in sys.modules)'
+        p = subprocess.Popen([sys.executable, '-c', script.format(['kitty', '-1', '--instance-group', group, 'sh'])], cwd=base, stdout=subprocess.PIPE)
+        try:
+            conn = server.accept()[0]
+            with conn, conn.makefile('rb') as f:
+                msg = json.loads(f.read().decode('utf-8'))
+        finally:
+            server.close()
+            out = p.communicate()[0]
+        self.ae(msg['cmd'], 'new_instance')
+        self.ae(msg['args'][1:], ['-1', '--instance-group', group, 'sh'])
+        self.ae(msg['cwd'], base)
+        # The command line is sent without importing the modules needed to
+        # run kitty itself
+        self.ae(out.decode('utf-8').strip(), 'False')
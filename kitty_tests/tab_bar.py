@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2018, Kovid Goyal <kovid at kovidgoyal.net>
+
+from random import Random
+
+from . import BaseTest
+from kitty.config import defaults
+from kitty.constants import WindowGeometry
+from kitty.tab_bar import TabBar, TabBarData
+
+
+def create_tab_bar(opts, columns=80):
+    ans = TabBar(0, opts)
+    ans.screen.resize(1, columns)
+    ans.screen_geometry = WindowGeometry(0, 0, 0, 0, columns, 1)
+    ans.laid_out_once = True
+    return ans
+
+
+class TestTabBar(BaseTest):
+
+    def test_incremental_update(self):
+        for style in ('fade', 'separator'):
+            opts = defaults._replace(tab_bar_style=style)
+            tb = create_tab_bar(opts)
+            data = [TabBarData('tab {}'.format(i), i == 0, False) for i in range(5)]
+
+            def check(data):
+                tb.update(data)
+                full = create_tab_bar(opts)
+                full.update(data)
+                self.ae(tb.screen.line(0).as_ansi(), full.screen.line(0).as_ansi())
+                self.ae(tb.cell_ranges, full.cell_ranges)
+
+            check(data)
+            data[1] = data[1]._replace(title='a much longer title')
+            check(data)
+            data[0], data[2] = data[0]._replace(is_active=False), data[2]._replace(is_active=True)
+            check(data)
+            data[3] = data[3]._replace(needs_attention=True)
+            check(data)
+            data[1] = data[1]._replace(title='x')
+            check(data)
+            check(data[:3])
+            check(data[:3] + [TabBarData('new tab', False, False)])
+            check([TabBarData('t' * i, i == 3, False) for i in range(30)])
+            check([TabBarData('t' * i, i == 4, False) for i in range(30)])
+            check(data)
+            rng = Random(style)
+            tabs = list(data)
+            for i in range(100):
+                action = rng.randrange(4)
+                if action == 0 or not tabs:
+                    tabs.insert(rng.randrange(len(tabs) + 1), TabBarData('t' * rng.randrange(25), False, False))
+                elif action == 1 and len(tabs) > 1:
+                    del tabs[rng.randrange(len(tabs))]
+                else:
+                    i = rng.randrange(len(tabs))
+                    tabs[i] = tabs[i]._replace(title='★x' * rng.randrange(8), needs_attention=action == 3)
+                active = rng.randrange(len(tabs))
+                check([t._replace(is_active=i == active) for i, t in enumerate(tabs)])
+            check(data)
+            # Unchanged tabs are not drawn again
+            calls = []
+            draw_func = tb.draw_func
+            tb.draw_func = lambda draw_data, screen, tab, *a: calls.append(tab.title) or draw_func(draw_data, screen, tab, *a)
+            data[4] = data[4]._replace(title='tab 9')
+            check(data)
+            self.ae(calls, ['tab 9'])
@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+# vim:fileencoding=utf-8
+# License: GPL v3 Copyright: 2019, Kovid Goyal <kovid at kovidgoyal.net>
+
+from kitty.config import defaults
+from kitty.session import Session
+from kitty.tabs import Tab
+
+from . import BaseTest, create_boss, headless
+
+
+class TestTabs(BaseTest):
+
+    def test_session_window_ids(self):
+        # All the children of a session tab are started before their windows
+        # are created, each must still get the id of its own window
+        session = Session()
+        session.add_tab(defaults)
+        for i in range(3):
+            session.add_window('sh')
+        with headless():
+            boss = create_boss(1, 1)
+            tab = Tab(boss.active_tab_manager, session_tab=session.tabs[0])
+            self.ae(len(tab), 3)
+            ids = [w.child.environ['KITTY_WINDOW_ID'] for w in tab]
+            self.ae(ids, [str(w.id) for w in tab])
+            self.ae(len(set(ids)), 3)
+            w = tab.new_window()
+            self.ae(w.child.environ['KITTY_WINDOW_ID'], str(w.id))
@@ -72,7 +72,16 @@ def run_tests():
         'name', nargs='*', default=[],
         help='The name of the test to run, for e.g. linebuf corresponds to test_linebuf. Can be specified multiple times')
     parser.add_argument('--verbosity', default=4, type=int, help='Test verbosity')
+    parser.add_argument(
+        '--bench', default=False, action='store_true',
+        help='Run the benchmarks of the operations on large sessions instead of the tests and output the results as JSON.'
+        ' Names, if specified, are the operations to benchmark')
     args = parser.parse_args()
+    if args.bench:
+        init_env()
+        from kitty_tests.bench_boss import main
+        main(args.name)
+        return
     tests = find_tests_in_dir(os.path.join(base, 'kitty_tests'))
     if args.name:
         tests = filter_tests_by_name(tests, *args.name)